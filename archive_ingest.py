@@ -0,0 +1,102 @@
+# archive_ingest.py
+
+import io
+import os
+import tarfile
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+ARCHIVE_EXTENSIONS = (".zip", ".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tbz2", ".tar.xz", ".txz")
+RESUME_EXTENSIONS = (".pdf", ".docx", ".txt", ".png", ".jpg", ".jpeg")
+
+# Separates the archive path from the member name in document IDs
+MEMBER_SEPARATOR = "::"
+
+def is_archive(path):
+    """Return True if `path` names a ZIP or TAR archive."""
+    return os.path.isfile(path) and str(path).lower().endswith(ARCHIVE_EXTENSIONS)
+
+def member_id(archive_path, member_name):
+    return f"{archive_path}{MEMBER_SEPARATOR}{member_name}"
+
+def _wanted(name, extensions, skip, archive_path):
+    base = os.path.basename(name)
+    # Skip macOS resource forks and hidden files that bundles often carry
+    if not base or base.startswith((".", "__MACOSX")) or "__MACOSX/" in name:
+        return False
+    return name.lower().endswith(extensions) and member_id(archive_path, name) not in skip
+
+def iter_archive_members(archive_path, extensions=RESUME_EXTENSIONS, skip=()):
+    """
+    Yield (member name, bytes) for every resume in a ZIP or TAR archive.
+
+    Members are read one at a time straight from the archive; nothing is
+    unpacked to disk. TAR archives (compressed or not) are read as a
+    forward-only stream.
+
+    Args:
+        archive_path (str): Path to the archive
+        extensions (tuple): Member extensions to include
+        skip (set): Member IDs (see member_id) to leave unread
+
+    Yields:
+        tuple: (member name, member contents)
+    """
+    extensions = tuple(ext.lower() for ext in extensions)
+    if zipfile.is_zipfile(archive_path):
+        with zipfile.ZipFile(archive_path) as archive:
+            for info in archive.infolist():
+                if not info.is_dir() and _wanted(info.filename, extensions, skip, archive_path):
+                    yield info.filename, archive.read(info)
+        return
+
+    with tarfile.open(archive_path, mode="r|*") as archive:
+        for member in archive:
+            if member.isfile() and _wanted(member.name, extensions, skip, archive_path):
+                yield member.name, archive.extractfile(member).read()
+
+def _extract_member(name, data):
+    """Worker: extract text from one member, returning (text, error)."""
+    from input_handler import extract_text_from_buffer
+    from resume_ranking_pipeline import extract_text_from_pdf
+
+    try:
+        # PDFs use the pipeline's PDF reader, exactly like PDF files on disk
+        if name.lower().endswith(".pdf"):
+            return extract_text_from_pdf(io.BytesIO(data)), None
+        return extract_text_from_buffer(data, name), None
+    except Exception as e:
+        return None, str(e)
+
+def iter_archive_texts(archive_path, extensions=RESUME_EXTENSIONS, skip=(), workers=None,
+                       max_in_flight=None):
+    """
+    Extract the text of every resume in an archive in parallel.
+
+    Members are handed to a process pool as they are read, with at most
+    `max_in_flight` members held in memory at once. Results come back in
+    archive order.
+
+    Args:
+        archive_path (str): Path to the archive
+        extensions (tuple): Member extensions to include
+        skip (set): Member IDs to leave out (e.g. already checkpointed)
+        workers (int): Worker processes (defaults to the CPU count)
+        max_in_flight (int): Members read ahead of the consumer (defaults to 4 per worker)
+
+    Yields:
+        tuple: (member ID, text or None, error message or None)
+    """
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = max_in_flight or workers * 4
+    pending = deque()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for name, data in iter_archive_members(archive_path, extensions, skip):
+            pending.append((member_id(archive_path, name), executor.submit(_extract_member, name, data)))
+            while len(pending) >= max_in_flight:
+                doc_id, future = pending.popleft()
+                yield (doc_id, *future.result())
+        while pending:
+            doc_id, future = pending.popleft()
+            yield (doc_id, *future.result())
@@ -0,0 +1,531 @@
+# batch_cli.py
+
+import argparse
+import json
+import os
+from itertools import islice
+import pandas as pd
+from tqdm import tqdm
+from archive_ingest import is_archive, iter_archive_members, iter_archive_texts, member_id
+from checkpoint import CheckpointStore
+from document_limits import LIMITS, DocumentRejected, add_limit_arguments, configure_limits
+from near_duplicates import NearDuplicateIndex
+from resume_record import ResumeRecord
+from score_cache import DEFAULT_SCORE_CACHE_SIZE, ScoreCache
+from skill_filter import CandidateBitmapIndex, parse_filter
+from instrumentation import METRICS, peak_rss_mb
+from profiling import PROFILE_MODES, StageProfiler
+from skill_table import write_skill_table
+from staged_pipeline import StagedPipeline, parse_stage_workers, resume_stages
+from worker_pool import PreforkPool
+
+RESUME_EXTENSIONS = [".pdf", ".docx", ".txt", ".png", ".jpg", ".jpeg"]
+
+def _chunks(items, size):
+    """Split any iterable into consecutive chunks of at most `size` items."""
+    items = iter(items)
+    while True:
+        chunk = list(islice(items, size))
+        if not chunk:
+            return
+        yield chunk
+
+def process_resume_text_document(doc_id, text, dedup_index=None):
+    """Parse already-extracted resume text as one instrumented document."""
+    from resume_ranking_pipeline import process_resume_text
+
+    with METRICS.document(doc_id) as stage_timings:
+        resume_data = process_resume_text(text, doc_id, dedup_index)
+    if stage_timings is not None:
+        resume_data.stage_timings = stage_timings
+    return resume_data
+
+def process_resume_file(file_path, dedup_index=None):
+    """Parse one resume file, using the pipeline's PDF reader for PDFs."""
+    # Imported here so each command only loads the models it needs
+    from input_handler import extract_resume_text
+    from resume_ranking_pipeline import process_resume, process_resume_text
+
+    if file_path.lower().endswith(".pdf"):
+        return process_resume(file_path, dedup_index)
+
+    with METRICS.document(file_path) as stage_timings, LIMITS.deadline(file_path):
+        resume_data = process_resume_text(extract_resume_text(file_path), file_path, dedup_index)
+    if stage_timings is not None:
+        resume_data.stage_timings = stage_timings
+    return resume_data
+
+def _iter_file_results(paths, dedup_index=None):
+    """Yield (resume ID, parsed record or exception) for resume files on disk."""
+    for path in paths:
+        try:
+            yield path, process_resume_file(path, dedup_index)
+        except Exception as e:
+            yield path, e
+
+def _iter_archive_results(archive_path, extensions, skip, workers, dedup_index=None):
+    """Yield (member ID, parsed record or exception) for resumes inside an archive."""
+    for doc_id, text, error in iter_archive_texts(archive_path, extensions, skip, workers):
+        if error is not None:
+            yield doc_id, ValueError(error)
+            continue
+        try:
+            yield doc_id, process_resume_text_document(doc_id, text, dedup_index)
+        except Exception as e:
+            yield doc_id, e
+
+def _parse_document(doc_id, text, error):
+    """Worker task: parse a resume file (text None) or already-extracted text."""
+    if error is not None:
+        raise ValueError(error)
+    if text is None:
+        return process_resume_file(doc_id)
+    return process_resume_text_document(doc_id, text)
+
+def _iter_pool_results(pool, tasks, dedup_index=None):
+    """
+    Yield (resume ID, parsed record or exception), parsing in prefork workers.
+
+    Near-duplicates are resolved here, in input order, because the index
+    lives in this process; workers always parse the full document.
+
+    Args:
+        pool (PreforkPool): Started worker pool
+        tasks (iterable): (resume ID, text or None, extraction error or None)
+        dedup_index (NearDuplicateIndex): Optional near-duplicate index
+    """
+    for (doc_id, _, _), record in pool.imap(_parse_document, tasks):
+        if not isinstance(record, Exception):
+            # Worker stage timings travel with the record; fold them into this process's metrics
+            if record.stage_timings is not None and METRICS.enabled:
+                METRICS.count("documents_total")
+                for stage_name, ms in record.stage_timings.items():
+                    if stage_name != "total":
+                        METRICS.observe(stage_name, ms / 1000)
+                for listener in METRICS.listeners:
+                    listener.document_finished(doc_id, record.stage_timings)
+            record = _resolve_duplicate(doc_id, record, dedup_index)
+        yield doc_id, record
+
+def _resolve_duplicate(doc_id, record, dedup_index):
+    """Replace a fully parsed record by a duplicate stub if it near-duplicates an earlier one."""
+    if dedup_index is None:
+        return record
+    canonical = dedup_index.add(doc_id, record.full_text or "")
+    if canonical is None:
+        return record
+    METRICS.count("near_duplicates_total")
+    return ResumeRecord(duplicate_of=canonical, stage_timings=record.stage_timings)
+
+def _iter_staged_results(pipeline, items, dedup_index=None):
+    """
+    Yield (resume ID, parsed record or exception) from a StagedPipeline.
+
+    Items are resume paths, or (member ID, bytes) pairs for archives.
+    """
+    for item, record in pipeline.run(items):
+        doc_id = item[0] if isinstance(item, tuple) else item
+        if not isinstance(record, Exception):
+            METRICS.count("documents_total")
+            record = _resolve_duplicate(doc_id, record, dedup_index)
+        yield doc_id, record
+
+# ------------ RANK COMMAND ----------------
+def run_rank(args):
+    """Parse a directory or archive of resumes in checkpointed chunks and rank them."""
+    from resume_ranking_pipeline import (
+        build_job_profile, compact_resume, rank_resumes, generate_html_report, write_summary_csv
+    )
+
+    if args.filter:
+        # Fail on a malformed filter before any resume is parsed
+        parse_filter(args.filter)
+    if args.profile and (args.parse_workers or args.staged):
+        # Stage profiles only cover the main thread, which parses nothing in these modes
+        raise ValueError("--profile cannot be combined with --parse-workers or --staged")
+    # Before any worker is forked, so every worker inherits the limits
+    configure_limits(args)
+
+    with open(args.job, "r") as f:
+        job_description_text = f.read()
+    # Streaming runs keep only compact, job-specific features instead of the full text
+    job_profile = build_job_profile(job_description_text) if args.streaming else None
+
+    # Near-duplicates found in this run reuse the record and scores of their first copy
+    dedup_index = NearDuplicateIndex() if args.dedupe else None
+
+    # Repeat runs only score resume/job pairs the cache has not seen
+    score_cache = None
+    if args.score_cache or args.staged or args.score_cache_size is not None:
+        # --score-cache-size alone gives a memory-only cache for this run
+        cache_size = DEFAULT_SCORE_CACHE_SIZE if args.score_cache_size is None else args.score_cache_size
+        score_cache = ScoreCache(cache_size, args.score_cache)
+
+    pool, pipeline = None, None
+    if args.staged:
+        if args.parse_workers:
+            raise ValueError("--staged and --parse-workers cannot be combined")
+        # The score stage fills score_cache, so ranking at the end only sorts
+        stages = resume_stages(
+            job_profile or build_job_profile(job_description_text), score_cache,
+            parse_stage_workers(args.stage_workers), from_bytes=is_archive(args.resumes)
+        )
+        process_workers = sum(stage.workers for stage in stages if stage.processes)
+        if process_workers:
+            pool = PreforkPool(process_workers)
+    elif args.parse_workers:
+        pool = PreforkPool(args.parse_workers)
+    if pool is not None:
+        # Started before anything else spawns threads, since the workers are forked
+        pool.start()
+        pool.print_report()
+    if args.staged:
+        pipeline = StagedPipeline(stages, args.queue_size, pool)
+
+    extensions = tuple(ext.lower() for ext in args.extensions)
+    config = {"command": "rank", "resumes": os.path.abspath(args.resumes)}
+    if args.streaming:
+        config["streaming_job_hash"] = job_profile["hash"]
+
+    if is_archive(args.resumes):
+        # Members are streamed from the archive and extracted in parallel, never unpacked
+        store = CheckpointStore(args.checkpoint_dir, config, restart=args.restart)
+        done = store.completed_ids()
+        total, initial = None, len(done)
+        if pipeline is not None:
+            members = (
+                (member_id(args.resumes, name), data)
+                for name, data in iter_archive_members(args.resumes, extensions, done)
+            )
+            results = _iter_staged_results(pipeline, members, dedup_index)
+        elif pool is not None:
+            texts = iter_archive_texts(args.resumes, extensions, done, args.workers)
+            results = _iter_pool_results(pool, texts, dedup_index)
+        else:
+            results = _iter_archive_results(args.resumes, extensions, done, args.workers, dedup_index)
+    else:
+        resume_paths = sorted(
+            os.path.join(args.resumes, name) for name in os.listdir(args.resumes)
+            if name.lower().endswith(extensions)
+        )
+        if not resume_paths:
+            print(f"No resumes found in {args.resumes}")
+            if pool is not None:
+                pool.shutdown()
+            return
+        store = CheckpointStore(args.checkpoint_dir, config, restart=args.restart)
+        done = store.completed_ids()
+        todo = [path for path in resume_paths if path not in done]
+        total, initial = len(resume_paths), len(resume_paths) - len(todo)
+        if pipeline is not None:
+            results = _iter_staged_results(pipeline, todo, dedup_index)
+        elif pool is not None:
+            results = _iter_pool_results(pool, ((path, None, None) for path in todo), dedup_index)
+        else:
+            results = _iter_file_results(todo, dedup_index)
+    if done:
+        print(f"Resuming: {len(done)} resumes already processed")
+
+    failures = 0
+    with tqdm(total=total, initial=initial, unit="resume") as progress:
+        for chunk in _chunks(results, args.chunk_size):
+            ids, records = [], []
+            for resume_path, record in chunk:
+                if isinstance(record, Exception):
+                    error = record
+                    record = {"error": str(error), "resume_path": resume_path}
+                    if isinstance(error, DocumentRejected):
+                        # Over a per-document limit: "timeout" or "bytes"
+                        record["reason"] = error.reason
+                    failures += 1
+                else:
+                    if job_profile is not None:
+                        record = compact_resume(record, job_profile)
+                    record.resume_path = resume_path
+                    # Records become plain dicts only when written to the checkpoint
+                    record = record.to_dict()
+                ids.append(resume_path)
+                records.append(record)
+                if pipeline is not None:
+                    # Queue depth per stage shows where the pipeline is waiting
+                    progress.set_postfix(pipeline.depths(), refresh=False)
+                progress.update(1)
+            store.save_records(store.next_index, ids, records)
+    if pipeline is not None:
+        pipeline.print_report()
+    if pool is not None:
+        pool.shutdown()
+
+    if failures:
+        print(f"Warning: {failures} resumes could not be processed")
+
+    resumes_data = {
+        record["resume_path"]: ResumeRecord.from_dict(record)
+        for record in store.iter_records() if "error" not in record
+    }
+    ranked_resumes = rank_resumes(
+        resumes_data, job_description_text, job_profile=job_profile, score_cache=score_cache,
+        candidate_filter=args.filter
+    )
+    if score_cache is not None:
+        score_cache.close()
+
+    with open(args.output, "w") as f:
+        json.dump(ranked_resumes, f, indent=4)
+    print(f"✅ Ranked resumes saved to {args.output}")
+
+    if args.html:
+        generate_html_report(ranked_resumes, args.html)
+    if args.summary:
+        write_summary_csv(ranked_resumes, args.summary)
+
+    peak = peak_rss_mb()
+    METRICS.gauge("peak_rss_mb", peak)
+    print(f"Peak memory: {peak} MB")
+
+# ------------ EXTRACT-SKILLS COMMAND ----------------
+def run_extract_skills(args):
+    """Extract skills from a CSV text column in checkpointed chunks."""
+    from job_skills_extractor import extract_skills_bulk
+
+    store = CheckpointStore(
+        args.checkpoint_dir,
+        {
+            "command": "extract-skills",
+            "input": os.path.abspath(args.input),
+            "text_column": args.text_column,
+            "id_column": args.id_column,
+            "chunk_size": args.chunk_size
+        },
+        restart=args.restart
+    )
+    done_chunks = store.completed_chunks()
+
+    with tqdm(unit="row") as progress:
+        for index, chunk in enumerate(pd.read_csv(args.input, chunksize=args.chunk_size)):
+            if index in done_chunks:
+                progress.update(len(chunk))
+                continue
+
+            text = chunk[args.text_column].fillna("")
+            mask = text.astype(str) != ""
+            skills_df = pd.DataFrame({
+                args.id_column: chunk[args.id_column][mask].tolist(),
+                "Skills": extract_skills_bulk(text[mask])
+            })
+            store.save_frame(index, chunk[args.id_column].tolist(), skills_df)
+            progress.update(len(chunk))
+
+    frames = list(store.iter_frames())
+    result_df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(
+        columns=[args.id_column, "Skills"]
+    )
+    write_skill_table(result_df, args.output)
+    print(f"✅ Skills for {len(result_df)} rows saved to {args.output}")
+
+# ------------ MATCH COMMAND ----------------
+def run_match(args):
+    """Rank candidates for every job, checkpointing after each chunk of jobs."""
+    from resume_job_matcher import load_data, rank_candidates
+
+    if args.filter:
+        parse_filter(args.filter)
+    if args.prune and (not args.top_k or args.store or args.workers > 1):
+        raise ValueError("--prune needs --top-k and cannot be combined with --store or --workers")
+
+    shared_scorer = None
+    if args.store:
+        # Candidates are streamed shard by shard from the on-disk store instead of loaded
+        from feature_store import FeatureStore, rank_candidates_from_store
+        from skill_table import read_skill_table
+
+        feature_store = FeatureStore(args.store)
+        job_df = read_skill_table(args.job_skills)
+        top_k = args.top_k or 100
+        row_mask = feature_store.bitmap_index().evaluate(args.filter) if args.filter else None
+
+        def rank(job_chunk):
+            return rank_candidates_from_store(feature_store, job_chunk, top_k, row_mask)
+    else:
+        resume_df, job_df = load_data(args.resume_skills, args.job_skills)
+        if args.filter:
+            # Candidates failing the filter are dropped before any scoring
+            index = CandidateBitmapIndex.from_skill_lists(resume_df["Skills"])
+            resume_df = resume_df[index.evaluate(args.filter)].reset_index(drop=True)
+
+        if args.prune:
+            # Built once and queried for every chunk of jobs
+            from top_k_pruning import PrunedTopKIndex, rank_candidates_pruned
+            from skill_table import build_skill_profile
+
+            pruned_index = PrunedTopKIndex([build_skill_profile(skills) for skills in resume_df["Skills"]])
+
+            def rank(job_chunk):
+                return rank_candidates_pruned(resume_df, job_chunk, args.top_k, pruned_index)
+        elif args.workers > 1:
+            # Matrix in shared memory and worker pool set up once for every chunk of jobs
+            from shared_scoring import SharedScorer
+
+            shared_scorer = SharedScorer(resume_df, args.workers)
+
+            def rank(job_chunk):
+                return shared_scorer.rank(job_chunk, args.top_k)
+        else:
+            def rank(job_chunk):
+                return rank_candidates(resume_df, job_chunk, top_k=args.top_k)
+
+    store = CheckpointStore(
+        args.checkpoint_dir,
+        {
+            "command": "match",
+            "resume_skills": os.path.abspath(args.store or args.resume_skills),
+            "job_skills": os.path.abspath(args.job_skills),
+            "chunk_size": args.chunk_size,
+            "top_k": args.top_k,
+            "filter": args.filter
+        },
+        restart=args.restart
+    )
+    done_chunks = store.completed_chunks()
+
+    try:
+        with tqdm(total=len(job_df), unit="job") as progress:
+            for index, start in enumerate(range(0, len(job_df), args.chunk_size)):
+                job_chunk = job_df.iloc[start:start + args.chunk_size]
+                if index not in done_chunks:
+                    rankings_df = rank(job_chunk)
+                    store.save_frame(index, job_chunk["Job_ID"].tolist(), rankings_df)
+                progress.update(len(job_chunk))
+    finally:
+        if shared_scorer is not None:
+            shared_scorer.close()
+
+    frames = list(store.iter_frames(list_columns=("Matching_Skills", "Missing_Skills")))
+    rankings_df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    write_skill_table(rankings_df, args.output)
+    print(f"✅ Candidate rankings saved to {args.output}")
+
+# ------------ STORE-APPEND COMMAND ----------------
+def run_store_append(args):
+    """Append a resume skill table to an on-disk feature store, one shard per batch."""
+    from feature_store import FeatureStore
+    from skill_table import iter_skill_table
+
+    feature_store = FeatureStore(args.store)
+    with tqdm(unit="resume") as progress:
+        for batch in iter_skill_table(args.resume_skills, args.shard_size):
+            feature_store.append(batch)
+            progress.update(len(batch))
+    print(f"✅ Feature store in {args.store} now holds {len(feature_store)} resumes")
+
+def build_parser():
+    """Build the argument parser for the batch CLI."""
+    parser = argparse.ArgumentParser(
+        description="Resumable batch processing for resume parsing, skill extraction and matching"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    def add_common(sub, default_checkpoint, default_chunk_size):
+        sub.add_argument("--checkpoint-dir", default=default_checkpoint,
+                         help="Directory holding completed chunks (default: %(default)s)")
+        sub.add_argument("--chunk-size", type=int, default=default_chunk_size,
+                         help="Documents per checkpointed chunk (default: %(default)s)")
+        sub.add_argument("--restart", action="store_true",
+                         help="Discard an existing checkpoint and start over")
+        sub.add_argument("--metrics", default=None,
+                         help="Enable stage timing and export metrics here (.prom for Prometheus text, else JSON)")
+        sub.add_argument("--profile", default=None, metavar="DIR",
+                         help="Write per-stage .pstats, collapsed stacks and slowest documents to DIR")
+        sub.add_argument("--profile-mode", choices=PROFILE_MODES, default="both")
+        sub.add_argument("--profile-top", type=int, default=10,
+                         help="Number of slowest documents to report (default: %(default)s)")
+
+    rank = subparsers.add_parser("rank", help="Parse a directory of resumes and rank them against a job")
+    rank.add_argument("--resumes", default="data/resumes",
+                      help="Directory of resume files, or a ZIP/TAR archive of them")
+    rank.add_argument("--job", default="data/job_description.txt", help="Job description text file")
+    rank.add_argument("--output", default="ranked_resumes.json", help="Ranked resumes JSON")
+    rank.add_argument("--html", default=None, help="Optional HTML report path")
+    rank.add_argument("--summary", default=None, help="Optional CSV summary path")
+    rank.add_argument("--extensions", nargs="+", default=RESUME_EXTENSIONS,
+                      help="Resume file extensions to include")
+    rank.add_argument("--streaming", action="store_true",
+                      help="Drop each resume's text right after extraction, keeping only compact features")
+    rank.add_argument("--dedupe", action="store_true",
+                      help="Parse and score near-duplicate resumes only once (within one run)")
+    rank.add_argument("--workers", type=int, default=None,
+                      help="Processes extracting archive members (default: CPU count)")
+    rank.add_argument("--filter", default=None,
+                      help='Only rank candidates matching a boolean filter, e.g. "python AND (aws OR gcp) AND NOT edu:mca"')
+    rank.add_argument("--parse-workers", type=int, default=0,
+                      help="Parse resumes in N workers forked after loading the models once (default: in-process)")
+    rank.add_argument("--staged", action="store_true",
+                      help="Run read/extract/segment/entities/score as separate stages with bounded queues")
+    rank.add_argument("--stage-workers", nargs="+", default=None, metavar="STAGE=N[:process]",
+                      help="Workers per stage, e.g. read=4 extract=8:process (default: extract uses "
+                           "one process per CPU, other stages one thread)")
+    rank.add_argument("--queue-size", type=int, default=32,
+                      help="Capacity of each stage's input queue (default: %(default)s)")
+    rank.add_argument("--score-cache", default=None, metavar="DB",
+                      help="SQLite file caching scores of resume/job pairs across runs")
+    rank.add_argument("--score-cache-size", type=int, default=None,
+                      help=f"Pairs kept in memory by the score cache; without --score-cache the cache is "
+                           f"memory-only (default: {DEFAULT_SCORE_CACHE_SIZE})")
+    add_common(rank, ".checkpoints/rank", 500)
+    add_limit_arguments(rank)
+    rank.set_defaults(func=run_rank)
+
+    extract = subparsers.add_parser("extract-skills", help="Extract skills from a CSV text column")
+    extract.add_argument("--input", default="resume_data.csv", help="Input CSV")
+    extract.add_argument("--output", default="extracted_resume_skills.parquet",
+                         help="Output table (.parquet or .csv)")
+    extract.add_argument("--text-column", default="Resume_Text")
+    extract.add_argument("--id-column", default="Candidate_ID")
+    add_common(extract, ".checkpoints/extract-skills", 5000)
+    extract.set_defaults(func=run_extract_skills)
+
+    match = subparsers.add_parser("match", help="Rank candidates for each job from skill tables")
+    match.add_argument("--resume-skills", default="extracted_resume_skills.parquet")
+    match.add_argument("--job-skills", default="extracted_job_skills.parquet")
+    match.add_argument("--output", default="candidate_rankings.parquet",
+                       help="Output table (.parquet or .csv)")
+    match.add_argument("--store", default=None,
+                       help="Feature store built with store-append, used instead of --resume-skills")
+    match.add_argument("--filter", default=None,
+                       help="Only rank candidates whose skills match a boolean filter")
+    match.add_argument("--workers", type=int, default=1,
+                       help="Processes scoring shards of a shared-memory feature matrix (default: %(default)s)")
+    match.add_argument("--top-k", type=int, default=None,
+                       help="Keep only the best K candidates per job (default: all; 100 with --store)")
+    match.add_argument("--prune", action="store_true",
+                       help="Only score candidates whose score bound can still reach the top K (needs --top-k)")
+    add_common(match, ".checkpoints/match", 50)
+    match.set_defaults(func=run_match)
+
+    store_append = subparsers.add_parser(
+        "store-append", help="Append a resume skill table to an on-disk feature store"
+    )
+    store_append.add_argument("--resume-skills", default="extracted_resume_skills.parquet")
+    store_append.add_argument("--store", default="resume_features", help="Feature store directory")
+    store_append.add_argument("--shard-size", type=int, default=1000000,
+                              help="Resumes per shard (default: %(default)s)")
+    store_append.set_defaults(func=run_store_append, metrics=None, profile=None)
+
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.metrics:
+        METRICS.enable()
+    if args.profile:
+        profiler = StageProfiler(args.profile, args.profile_mode, top_n=args.profile_top)
+        with profiler:
+            args.func(args)
+        profiler.print_report()
+    else:
+        args.func(args)
+    if args.metrics:
+        METRICS.export(args.metrics)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+# benchmark_suite.py
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from synthetic_corpus import FORMATS, generate_corpus, iter_resume_files
+
+STAGES = ["extraction", "segmentation", "entity_extraction", "skill_extraction",
+          "experience_analysis", "ranking"]
+
+def summarize_latencies(samples):
+    """
+    Summarize a list of per-item latencies (seconds).
+
+    Returns:
+        dict: Count, total, throughput and latency percentiles in milliseconds
+    """
+    if not samples:
+        return {"count": 0}
+    ordered = sorted(samples)
+    total = sum(ordered)
+
+    def pct(p):
+        index = max(0, int(round(p / 100 * len(ordered))) - 1)
+        return round(ordered[min(index, len(ordered) - 1)] * 1000, 3)
+
+    return {
+        "count": len(ordered),
+        "total_s": round(total, 4),
+        "throughput_per_s": round(len(ordered) / total, 2) if total else None,
+        "mean_ms": round(total / len(ordered) * 1000, 3),
+        "p50_ms": pct(50),
+        "p95_ms": pct(95),
+        "p99_ms": pct(99),
+        "max_ms": round(ordered[-1] * 1000, 3)
+    }
+
+def time_each(fn, items):
+    """Call fn on every item and return (results, per-item latencies)."""
+    results, latencies = [], []
+    for item in items:
+        started = time.perf_counter()
+        results.append(fn(item))
+        latencies.append(time.perf_counter() - started)
+    return results, latencies
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_benchmarks(corpus_dir, stages=STAGES, sample=None, jobs=None):
+    """
+    Time each pipeline stage on a generated corpus.
+
+    Args:
+        corpus_dir (str): Corpus written by synthetic_corpus.generate_corpus
+        stages (list): Stages to run
+        sample (int): Maximum documents for the per-document NLP and ranking stages
+        jobs (list): Job description texts for the ranking stage
+
+    Returns:
+        dict: Results per stage
+    """
+    results = {}
+    files = list(iter_resume_files(corpus_dir))
+
+    # Text extraction always runs, since later stages need the texts
+    from input_handler import extract_resume_text
+    texts, latencies = time_each(extract_resume_text, files)
+    if "extraction" in stages:
+        by_format = {}
+        for path, latency in zip(files, latencies):
+            by_format.setdefault(os.path.splitext(path)[1].lstrip("."), []).append(latency)
+        results["extraction"] = summarize_latencies(latencies)
+        results["extraction"]["by_format"] = {
+            fmt: summarize_latencies(samples) for fmt, samples in sorted(by_format.items())
+        }
+
+    nlp_texts = texts[:sample] if sample else texts
+
+    if "segmentation" in stages:
+        from section_segmenter import SectionSegmenter
+        segmenter = SectionSegmenter()
+        _, latencies = time_each(segmenter.extract_sections, nlp_texts)
+        results["segmentation"] = summarize_latencies(latencies)
+
+    if "entity_extraction" in stages:
+        from entity_extractor import scan_entities
+        _, latencies = time_each(scan_entities, nlp_texts)
+        results["entity_extraction"] = summarize_latencies(latencies)
+
+    if "skill_extraction" in stages:
+        from skill_extractor import SkillExtractor
+        extractor = SkillExtractor()
+        _, latencies = time_each(extractor.extract_skills, nlp_texts)
+        results["skill_extraction"] = summarize_latencies(latencies)
+
+    if "experience_analysis" in stages:
+        from experience_extractor import ExperienceExtractor
+        extractor = ExperienceExtractor()
+        _, latencies = time_each(extractor.analyze_experience, nlp_texts)
+        results["experience_analysis"] = summarize_latencies(latencies)
+
+    if "ranking" in stages and jobs:
+        from resume_ranking_pipeline import process_resume_text, rank_resumes
+        resumes_data = {path: process_resume_text(text) for path, text in zip(files, nlp_texts)}
+        _, latencies = time_each(lambda job: rank_resumes(resumes_data, job), jobs)
+        results["ranking"] = summarize_latencies(latencies)
+        results["ranking"]["candidates_per_query"] = len(resumes_data)
+        total = results["ranking"]["total_s"]
+        results["ranking"]["candidates_scored_per_s"] = (
+            round(len(resumes_data) * len(jobs) / total, 2) if total else None
+        )
+
+    return results
+
+def compare_results(current, baseline, threshold=0.10):
+    """
+    Print per-stage throughput changes against a baseline result file.
+
+    Returns:
+        list: Stages whose throughput dropped by more than `threshold`
+    """
+    regressions = []
+    print(f"\n{'Stage':<22}{'Baseline/s':>12}{'Current/s':>12}{'Change':>10}")
+    for stage, stats in current["stages"].items():
+        old = baseline.get("stages", {}).get(stage, {}).get("throughput_per_s")
+        new = stats.get("throughput_per_s")
+        if not old or not new:
+            continue
+        change = (new - old) / old
+        flag = "  REGRESSION" if change < -threshold else ""
+        print(f"{stage:<22}{old:>12.2f}{new:>12.2f}{change:>+10.1%}{flag}")
+        if flag:
+            regressions.append(stage)
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark each resume pipeline stage")
+    parser.add_argument("--corpus-dir", default=None,
+                        help="Existing corpus directory (generated into a temp dir if omitted)")
+    parser.add_argument("--count", type=int, default=100, help="Resumes to generate (10 to 1,000,000)")
+    parser.add_argument("--formats", nargs="+", choices=FORMATS, default=list(FORMATS))
+    parser.add_argument("--jobs", type=int, default=5, help="Job descriptions used for ranking")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--sample", type=int, default=None,
+                        help="Limit documents for segmentation/entity/skill/experience/ranking stages")
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=STAGES)
+    parser.add_argument("--output", default="benchmark_results.json", help="Results JSON")
+    parser.add_argument("--compare", default=None, help="Baseline results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Throughput drop treated as a regression (default: 10%%)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        corpus_dir = args.corpus_dir
+        if corpus_dir is None or not os.path.exists(os.path.join(corpus_dir, "manifest.json")):
+            corpus_dir = corpus_dir or tmp_dir
+            print(f"Generating {args.count} synthetic resumes in {corpus_dir}...")
+            generate_corpus(corpus_dir, args.count, tuple(args.formats), args.jobs, args.seed)
+
+        with open(os.path.join(corpus_dir, "manifest.json")) as f:
+            manifest = json.load(f)
+        jobs = []
+        for job_path in manifest["jobs"][:args.jobs]:
+            with open(job_path) as f:
+                jobs.append(f.read())
+
+        print(f"Running stages: {', '.join(args.stages)}")
+        stages = run_benchmarks(corpus_dir, args.stages, args.sample, jobs)
+
+    results = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "git_commit": _git_commit(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "corpus_size": manifest["count"],
+            "formats": manifest["formats"],
+            "seed": manifest["seed"],
+            "sample": args.sample
+        },
+        "stages": stages
+    }
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"✅ Benchmark results saved to {args.output}")
+
+    for stage, stats in stages.items():
+        if stats.get("count"):
+            print(f"{stage:<22}{stats['throughput_per_s'] or 0:>10.1f}/s  "
+                  f"p50 {stats['p50_ms']:.2f} ms  p99 {stats['p99_ms']:.2f} ms")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare_results(results, baseline, args.threshold):
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
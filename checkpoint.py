@@ -0,0 +1,135 @@
+# checkpoint.py
+
+import json
+import os
+import shutil
+from pathlib import Path
+from skill_table import read_skill_table, write_skill_table
+
+MANIFEST_NAME = "manifest.json"
+
+def _atomic_write_text(path, text):
+    """Write a text file so readers never see a partial file."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+class CheckpointStore:
+    def __init__(self, directory, config, restart=False):
+        """
+        Directory of completed chunks for a resumable batch run.
+
+        Each completed chunk is written to its own file (plus a small file
+        with the IDs of the documents it covers) and only then recorded in
+        manifest.json. An interrupted run therefore loses at most the chunk
+        in progress.
+
+        Args:
+            directory (str): Checkpoint directory
+            config (dict): Settings of the run; a checkpoint created with
+                different settings is not reused
+            restart (bool): Discard any existing checkpoint
+        """
+        self.directory = Path(directory)
+        self.manifest_path = self.directory / MANIFEST_NAME
+
+        if restart and self.directory.exists():
+            shutil.rmtree(self.directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        if self.manifest_path.exists():
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                self.manifest = json.load(f)
+            if self.manifest.get("config") != config:
+                raise ValueError(
+                    f"Checkpoint in {self.directory} was created with different settings; "
+                    "use --restart to discard it"
+                )
+        else:
+            self.manifest = {"config": config, "chunks": {}}
+            self._save_manifest()
+
+    def _save_manifest(self):
+        _atomic_write_text(self.manifest_path, json.dumps(self.manifest, indent=2))
+
+    def _chunk_key(self, index):
+        return f"{index:06d}"
+
+    @property
+    def next_index(self):
+        """Index to use for the next new chunk."""
+        return len(self.manifest["chunks"])
+
+    def completed_chunks(self):
+        """Return the indices of completed chunks."""
+        return {int(key) for key in self.manifest["chunks"]}
+
+    def completed_ids(self):
+        """Return the IDs of all documents in completed chunks."""
+        done = set()
+        for chunk in self.manifest["chunks"].values():
+            with open(self.directory / chunk["ids_file"], "r", encoding="utf-8") as f:
+                done.update(json.load(f))
+        return done
+
+    def _record_chunk(self, index, ids, filename):
+        ids = list(ids)
+        ids_file = f"chunk-{self._chunk_key(index)}.ids.json"
+        _atomic_write_text(self.directory / ids_file, json.dumps(ids))
+        self.manifest["chunks"][self._chunk_key(index)] = {
+            "file": filename,
+            "ids_file": ids_file,
+            "count": len(ids)
+        }
+        self._save_manifest()
+
+    def save_records(self, index, ids, records):
+        """
+        Store a completed chunk of JSON-serializable records.
+
+        Args:
+            index (int): Chunk index
+            ids (list): Document IDs covered by the chunk
+            records (list): Records produced for the chunk
+        """
+        filename = f"chunk-{self._chunk_key(index)}.jsonl"
+        _atomic_write_text(
+            self.directory / filename,
+            "".join(json.dumps(record) + "\n" for record in records)
+        )
+        self._record_chunk(index, ids, filename)
+
+    def save_frame(self, index, ids, df):
+        """
+        Store a completed chunk as a Parquet table.
+
+        Args:
+            index (int): Chunk index
+            ids (list): Document IDs covered by the chunk
+            df (pd.DataFrame): Table produced for the chunk
+        """
+        filename = f"chunk-{self._chunk_key(index)}.parquet"
+        tmp_path = self.directory / f"{filename}.tmp.parquet"
+        write_skill_table(df, tmp_path)
+        os.replace(tmp_path, self.directory / filename)
+        self._record_chunk(index, ids, filename)
+
+    def _chunk_files(self):
+        for key in sorted(self.manifest["chunks"]):
+            yield self.directory / self.manifest["chunks"][key]["file"]
+
+    def iter_records(self):
+        """Yield records from all completed JSONL chunks, in chunk order."""
+        for path in self._chunk_files():
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+
+    def iter_frames(self, list_columns=("Skills",)):
+        """Yield tables from all completed Parquet chunks, in chunk order."""
+        for path in self._chunk_files():
+            yield read_skill_table(path, list_columns=list_columns)
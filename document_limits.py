@@ -0,0 +1,189 @@
+# document_limits.py
+
+import os
+import signal
+import threading
+import time
+from contextlib import contextmanager
+from instrumentation import METRICS
+
+DEFAULT_MAX_SECONDS = 30.0
+DEFAULT_MAX_PAGES = 50
+DEFAULT_MAX_BYTES = 20 * 1024 * 1024
+DEFAULT_MAX_CHARS = 200000
+
+class DocumentRejected(ValueError):
+    def __init__(self, reason, message):
+        """
+        A document exceeded one of the DocumentLimits and was not processed.
+
+        Args:
+            reason (str): "timeout" or "bytes"
+            message (str): Human-readable detail
+        """
+        super().__init__(f"Rejected ({reason}): {message}")
+        self.reason = reason
+        self.message = message
+
+    def __reduce__(self):
+        # Raised in worker processes and re-raised in the parent
+        return DocumentRejected, (self.reason, self.message)
+
+class _DeadlineExceeded(BaseException):
+    """
+    Raised by the SIGALRM handler. Like KeyboardInterrupt it is not an
+    Exception, so parsers that swallow every Exception (PyPDF2 does, page by
+    page) cannot keep running past the deadline. deadline() turns it into
+    DocumentRejected.
+    """
+
+class DocumentLimits:
+    def __init__(self, max_seconds=DEFAULT_MAX_SECONDS, max_pages=DEFAULT_MAX_PAGES,
+                 max_bytes=DEFAULT_MAX_BYTES, max_chars=DEFAULT_MAX_CHARS):
+        """
+        Per-document bounds on extraction work, so one hostile or broken file
+        cannot stall a batch.
+
+        Documents larger than `max_bytes` or running longer than
+        `max_seconds` are rejected with DocumentRejected. Longer documents
+        are truncated instead: only the first `max_pages` pages are read and
+        text past `max_chars` characters is dropped. A limit of 0 or None
+        disables it.
+
+        The wall-time limit interrupts extraction with SIGALRM when it runs in
+        a process's main thread (the sequential pipeline and every worker
+        process). In other threads it is only checked between pages and once
+        extraction returns. OCR is additionally given the remaining time as
+        its subprocess timeout.
+
+        Args:
+            max_seconds (float): Wall time per document
+            max_pages (int): PDF pages read per document
+            max_bytes (int): Input size per document
+            max_chars (int): Extracted characters kept per document
+        """
+        self.max_seconds = max_seconds
+        self.max_pages = max_pages
+        self.max_bytes = max_bytes
+        self.max_chars = max_chars
+        self._local = threading.local()
+
+    def configure(self, max_seconds=None, max_pages=None, max_bytes=None, max_chars=None):
+        """Change the limits that are not None (e.g. from command-line options)."""
+        for name, value in (("max_seconds", max_seconds), ("max_pages", max_pages),
+                            ("max_bytes", max_bytes), ("max_chars", max_chars)):
+            if value is not None:
+                setattr(self, name, value)
+
+    def _reject(self, reason, message):
+        METRICS.count(f"documents_rejected_{reason}_total")
+        return DocumentRejected(reason, message)
+
+    # ------------ WALL TIME ----------------
+    @contextmanager
+    def deadline(self, doc_id=None):
+        """
+        Bound the wall time of the enclosed block.
+
+        Nested blocks share the outermost deadline, so a document is timed
+        once however many extraction layers it passes through.
+
+        Raises:
+            DocumentRejected: If the block runs past max_seconds
+        """
+        if not self.max_seconds or getattr(self._local, "deadline", None) is not None:
+            yield
+            return
+
+        self._local.deadline = time.monotonic() + self.max_seconds
+        use_alarm = hasattr(signal, "setitimer") and threading.current_thread() is threading.main_thread()
+        previous_handler = None
+        if use_alarm:
+            def on_alarm(signum, frame):
+                raise _DeadlineExceeded()
+
+            previous_handler = signal.signal(signal.SIGALRM, on_alarm)
+            signal.setitimer(signal.ITIMER_REAL, self.max_seconds)
+        try:
+            yield
+            # Extractors that swallow exceptions can hide an interrupted run
+            self.check_time(doc_id)
+        except _DeadlineExceeded:
+            raise self._reject("timeout", f"{doc_id or 'document'} took over {self.max_seconds}s") from None
+        finally:
+            if use_alarm:
+                signal.setitimer(signal.ITIMER_REAL, 0)
+                signal.signal(signal.SIGALRM, previous_handler)
+            self._local.deadline = None
+
+    def remaining_seconds(self):
+        """Seconds left before the current deadline, or None outside deadline()."""
+        deadline = getattr(self._local, "deadline", None)
+        if deadline is None:
+            return None
+        return max(deadline - time.monotonic(), 0.0)
+
+    def check_time(self, doc_id=None):
+        """Raise DocumentRejected if the current deadline has passed."""
+        if self.remaining_seconds() == 0.0:
+            raise self._reject("timeout", f"{doc_id or 'document'} took over {self.max_seconds}s")
+
+    # ------------ SIZE ----------------
+    def check_bytes(self, source, doc_id=None):
+        """
+        Reject a document larger than max_bytes.
+
+        Args:
+            source: File path or seekable binary file object (left at its start)
+        """
+        if not self.max_bytes:
+            return
+        if hasattr(source, "seek"):
+            size = source.seek(0, os.SEEK_END)
+            source.seek(0)
+        else:
+            size = os.path.getsize(source)
+        if size > self.max_bytes:
+            raise self._reject("bytes", f"{doc_id or 'document'} is {size} bytes (limit {self.max_bytes})")
+
+    def page_limit(self, page_count=None):
+        """
+        Number of PDF pages to read.
+
+        Args:
+            page_count (int): Pages in the document, if known (counted as
+                truncated when over the limit)
+        """
+        if not self.max_pages:
+            return page_count
+        if page_count is not None and page_count > self.max_pages:
+            METRICS.count("documents_truncated_pages_total")
+        return self.max_pages if page_count is None else min(page_count, self.max_pages)
+
+    def truncate(self, text):
+        """Cut extracted text to max_chars characters."""
+        if self.max_chars and text and len(text) > self.max_chars:
+            METRICS.count("documents_truncated_chars_total")
+            return text[:self.max_chars]
+        return text
+
+# Process-wide limits; forked workers inherit whatever the parent configured
+LIMITS = DocumentLimits()
+
+def add_limit_arguments(parser):
+    """Add the per-document limit options to an argparse parser."""
+    parser.add_argument("--max-seconds", type=float, default=None,
+                        help=f"Wall time per document before it is rejected "
+                             f"(default: {DEFAULT_MAX_SECONDS}, 0 disables)")
+    parser.add_argument("--max-pages", type=int, default=None,
+                        help=f"PDF pages read per document (default: {DEFAULT_MAX_PAGES}, 0 disables)")
+    parser.add_argument("--max-bytes", type=int, default=None,
+                        help=f"Largest document accepted, in bytes "
+                             f"(default: {DEFAULT_MAX_BYTES}, 0 disables)")
+    parser.add_argument("--max-chars", type=int, default=None,
+                        help=f"Extracted characters kept per document "
+                             f"(default: {DEFAULT_MAX_CHARS}, 0 disables)")
+
+def configure_limits(args):
+    """Apply the options added by add_limit_arguments to LIMITS."""
+    LIMITS.configure(args.max_seconds, args.max_pages, args.max_bytes, args.max_chars)
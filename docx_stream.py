@@ -0,0 +1,92 @@
+# docx_stream.py
+
+import re
+import zipfile
+from xml.etree.ElementTree import iterparse
+from document_limits import LIMITS
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+_HEADER_FOOTER = re.compile(r"word/(header|footer)(\d*)\.xml$")
+
+def _docx_parts(archive):
+    """Text parts of a DOCX in reading order: headers, the body, then footers."""
+    found = {"header": [], "footer": []}
+    for name in archive.namelist():
+        match = _HEADER_FOOTER.match(name)
+        if match:
+            found[match.group(1)].append((int(match.group(2) or 0), name))
+    return [name for _, name in sorted(found["header"])] + ["word/document.xml"] \
+        + [name for _, name in sorted(found["footer"])]
+
+def _iter_docx_paragraphs(stream):
+    """
+    Yield the text of every paragraph of one WordprocessingML part.
+
+    The XML is parsed incrementally and finished elements are dropped from
+    the tree, so memory stays flat however long the part is. Paragraphs
+    inside tables, content controls and text boxes are yielded like body
+    paragraphs; a text box nested in a paragraph comes out before the
+    paragraph holding it. mc:Fallback content (the legacy VML copy of each
+    text box) is skipped so text boxes are not read twice.
+    """
+    elements = []
+    paragraphs = []
+    fallback_depth = 0
+    for event, element in iterparse(stream, events=("start", "end")):
+        tag = element.tag
+        if event == "start":
+            elements.append(element)
+            if tag == _FALLBACK:
+                fallback_depth += 1
+            elif tag == f"{_W}p" and not fallback_depth:
+                paragraphs.append([])
+            continue
+
+        elements.pop()
+        if tag == _FALLBACK:
+            fallback_depth -= 1
+        elif not fallback_depth and paragraphs:
+            if tag == f"{_W}t":
+                paragraphs[-1].append(element.text or "")
+            elif tag == f"{_W}tab":
+                paragraphs[-1].append("\t")
+            elif tag in (f"{_W}br", f"{_W}cr"):
+                paragraphs[-1].append("\n")
+            elif tag == f"{_W}noBreakHyphen":
+                paragraphs[-1].append("-")
+            elif tag == f"{_W}p":
+                yield "".join(paragraphs.pop())
+        # Nothing reads the tree, so finished elements are discarded with their siblings
+        element.clear()
+        if elements:
+            del elements[-1][:]
+
+def extract_text_from_docx(file_path):
+    """
+    Extract DOCX text straight from the package's XML parts.
+
+    Headers, the body and footers are streamed from the zip, including
+    tables, text boxes and hyperlinks, which the python-docx paragraph list
+    leaves out. Reading stops once LIMITS.max_chars characters are
+    collected, and the deadline is checked as paragraphs are parsed.
+
+    Args:
+        file_path: Path or seekable binary file object
+
+    Returns:
+        str: One line per paragraph
+    """
+    lines = []
+    chars = 0
+    with zipfile.ZipFile(file_path) as archive:
+        for name in _docx_parts(archive):
+            with archive.open(name) as part:
+                for paragraph in _iter_docx_paragraphs(part):
+                    lines.append(paragraph)
+                    chars += len(paragraph) + 1
+                    if LIMITS.max_chars and chars > LIMITS.max_chars:
+                        return "\n".join(lines)
+                    if len(lines) % 256 == 0:
+                        LIMITS.check_time()
+    return "\n".join(lines)
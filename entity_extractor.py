@@ -1,93 +1,150 @@
 import re
 import spacy
+from fuzzy_skills import fuzzy_index_for
 
 # Load spaCy model
 nlp = spacy.load("en_core_web_sm")
 
-# ------------ NAME EXTRACTION ----------------
-def extract_name(text):
-    lines = text.strip().split("\n")[:5]
-    for line in lines:
-        match = re.match(r"(?i)^name[:\-]?\s*([A-Z][a-z]+(?:\s[A-Z][a-z]+)?)", line)
+# ------------ PRECOMPILED PATTERNS ----------------
+NAME_LINE_PATTERN = re.compile(r"(?i)^name[:\-]?\s*([A-Z][a-z]+(?:\s[A-Z][a-z]+)?)")
+NAME_PATTERN = re.compile(r"\b([A-Z][a-z]+)\s+([A-Z][a-z]+)\b")
+NAME_CAPS_PATTERN = re.compile(r"\b([A-Z]{2,})\s+([A-Z]{2,})\b")
+EMAIL_PATTERN = re.compile(r"[a-zA-Z0-9._%+-]+@[\s]*[a-zA-Z0-9.-]+[\s]*\.[a-zA-Z]{2,}")
+PHONE_PATTERN = re.compile(r"(?:\+91[\-\s]?)?[6-9]\d{9}")
+
+SKILLS_KEYWORDS = [
+    'c++', 'java', 'python', 'html', 'css', 'javascript', 'sql',
+    'react', 'reactjs', 'nodejs', 'expressjs', 'mongodb', 'git',
+    'github', 'bootstrap', 'tailwind css',
+    'object-oriented programming', 'data structures', 'algorithms'
+]
+
+# Common course name keywords
+COURSE_KEYWORDS = [
+    r"b\.?tech", "bachelor of technology", r"b\.?e", "bachelor of engineering",
+    "bsc", r"b\.?sc", "bachelor of science",
+    "bca", r"b\.?c\.?a",
+    r"m\.?tech", "master of technology", r"m\.?e", "master of engineering",
+    "msc", r"m\.?sc", "master of science",
+    "mca", r"m\.?c\.?a",
+    r"ph\.?d", "high school", "secondary school", "senior secondary"
+]
+
+# All course keywords in one zero-width scan. The lookahead does not consume
+# text, so overlapping mentions ("senior secondary school") are all found,
+# exactly as with one findall per keyword.
+EDUCATION_PATTERN = re.compile(r"(?=\b(" + "|".join(COURSE_KEYWORDS) + r")\b)")
+
+# GitHub and LinkedIn URLs in one zero-width scan over the space-free view
+LINK_PATTERN = re.compile(
+    r"(?=(?P<github>(https?://)?(www\.)?github\.com/[a-zA-Z0-9_-]+))"
+    r"|(?=(?P<linkedin>(https?://)?(www\.)?linkedin\.com/in/[a-zA-Z0-9_-]+))"
+)
+
+# ------------ COMBINED SCANNER ----------------
+def _find_name(text):
+    for line in text.strip().split("\n", 5)[:5]:
+        match = NAME_LINE_PATTERN.match(line)
         if match:
             return match.group(1)
 
-    match = re.search(r"\b([A-Z][a-z]+)\s+([A-Z][a-z]+)\b", text)
+    match = NAME_PATTERN.search(text)
     if match:
         return f"{match.group(1)} {match.group(2)}"
 
-    match = re.search(r"\b([A-Z]{2,})\s+([A-Z]{2,})\b", text)
+    match = NAME_CAPS_PATTERN.search(text)
     if match:
         return f"{match.group(1).title()} {match.group(2).title()}"
     
     return None
 
+def _find_email(text):
+    match = EMAIL_PATTERN.search(text)
+    return match.group(0).replace(" ", "").strip() if match else None
+
+def _find_phone(text):
+    match = PHONE_PATTERN.search(text)
+    return match.group(0) if match else None
+
+def _find_skills(lower_text, fuzzy=True):
+    if fuzzy:
+        # Misspelled skill words ("pyhton", "javscript") are rewritten to their dictionary spelling first
+        lower_text = fuzzy_index_for(tuple(SKILLS_KEYWORDS)).normalize(lower_text)
+    return list({skill for skill in SKILLS_KEYWORDS if skill in lower_text})
+
+def _find_links(nospace_text):
+    links = {"github": None, "linkedin": None}
+    for match in LINK_PATTERN.finditer(nospace_text):
+        field = match.lastgroup
+        if links[field] is None:
+            links[field] = match.group(field)
+            if links["github"] and links["linkedin"]:
+                break
+    return links
+
+def _find_education(lower_text):
+    found_courses = {
+        match.replace(".", "").strip().upper()
+        for match in EDUCATION_PATTERN.findall(lower_text)
+    }
+    return list(found_courses) if found_courses else None
+
+def scan_entities(text):
+    """
+    Extract every contact, link, skill and education field in one call.
+
+    All patterns are compiled once at import. The lowercased and space-free
+    views of the text are built once and shared: skills and education are
+    scanned together on the lowercased view (education in a single combined
+    pass, skills after fuzzy_skills corrects misspelled skill words), both
+    profile links in a single pass over the space-free view, and
+    email, phone and name stop at their first match.
+
+    Args:
+        text (str): Resume text
+
+    Returns:
+        dict: name, email, phone, skills, github, linkedin and education
+    """
+    lower_text = text.lower()
+    links = _find_links(text.replace(" ", ""))
+    return {
+        "name": _find_name(text),
+        "email": _find_email(text),
+        "phone": _find_phone(text),
+        "skills": _find_skills(lower_text),
+        "github": links["github"],
+        "linkedin": links["linkedin"],
+        "education": _find_education(lower_text)
+    }
+
+# ------------ NAME EXTRACTION ----------------
+def extract_name(text):
+    return _find_name(text)
+
 # ------------ EMAIL EXTRACTION ----------------
 def extract_email(text):
-    pattern = r"[a-zA-Z0-9._%+-]+@[\s]*[a-zA-Z0-9.-]+[\s]*\.[a-zA-Z]{2,}"
-    matches = re.findall(pattern, text)
-    if matches:
-        return matches[0].replace(" ", "").strip()
-    return None
+    return _find_email(text)
 
 # ------------ PHONE EXTRACTION ----------------
 def extract_phone(text):
-    pattern = r"(?:\+91[\-\s]?)?[6-9]\d{9}"
-    matches = re.findall(pattern, text)
-    return matches[0] if matches else None
+    return _find_phone(text)
 
 # ------------ SKILL EXTRACTION ----------------
 def extract_skills(text):
-    skills_keywords = [
-        'c++', 'java', 'python', 'html', 'css', 'javascript', 'sql',
-        'react', 'reactjs', 'nodejs', 'expressjs', 'mongodb', 'git',
-        'github', 'bootstrap', 'tailwind css',
-        'object-oriented programming', 'data structures', 'algorithms'
-    ]
-
-    text = text.lower()
-    found_skills = set()
-    for skill in skills_keywords:
-        if skill.lower() in text:
-            found_skills.add(skill)
-
-    return list(found_skills)
+    return _find_skills(text.lower())
 
 # ------------ GITHUB EXTRACTION ----------------
 def extract_github_url(text):
-    pattern = r"(https?://)?(www\.)?github\.com/[a-zA-Z0-9_-]+"
-    match = re.search(pattern, text.replace(" ", ""))
-    return match.group(0) if match else None
+    return _find_links(text.replace(" ", ""))["github"]
 
 # ------------ LINKEDIN EXTRACTION ----------------
 def extract_linkedin_url(text):
-    pattern = r"(https?://)?(www\.)?linkedin\.com/in/[a-zA-Z0-9_-]+"
-    match = re.search(pattern, text.replace(" ", ""))
-    return match.group(0) if match else None
+    return _find_links(text.replace(" ", ""))["linkedin"]
 
 # ------------ EDUCATION EXTRACTION ----------------
 def extract_education(text):
-    # Common course name keywords
-    course_keywords = [
-        "b\.?tech", "bachelor of technology", "b\.?e", "bachelor of engineering",
-        "bsc", "b\.?sc", "bachelor of science",
-        "bca", "b\.?c\.?a",
-        "m\.?tech", "master of technology", "m\.?e", "master of engineering",
-        "msc", "m\.?sc", "master of science",
-        "mca", "m\.?c\.?a",
-        "ph\.?d", "high school", "secondary school", "senior secondary"
-    ]
-
-    text = text.lower()
-    found_courses = set()
-
-    for keyword in course_keywords:
-        matches = re.findall(rf"\b{keyword}\b", text)
-        for match in matches:
-            clean = match.replace(".", "").strip()
-            found_courses.add(clean.upper())
-
-    return list(found_courses) if found_courses else None
+    return _find_education(text.lower())
 
 
 # ------------ PROJECTS EXTRACTION ----------------
@@ -2,49 +2,183 @@ import re
 import spacy
 from datetime import datetime
 from section_segmenter import SectionSegmenter
+from instrumentation import timed
+
+# ------------ DATE PARSING ----------------
+# Month names and abbreviations -> month number, looked up in lowercase
+MONTHS = {}
+for number, month in enumerate(
+    ["january", "february", "march", "april", "may", "june", "july",
+     "august", "september", "october", "november", "december"], 1
+):
+    MONTHS[month] = MONTHS[month[:3]] = number
+MONTHS["sept"] = 9
+
+# One pass over the text finds every date token. Alternatives are tried in
+# order, so the year inside "Jan 2020" or "01/2020" is not matched again.
+DATE_TOKEN_PATTERN = re.compile(
+    r"\b(?:"
+    r"(?P<month>" + "|".join(sorted(MONTHS, key=len, reverse=True)) + r")\.?,?\s+(?P<month_year>(?:19|20)\d{2})"
+    r"|(?P<numeric_month>0?[1-9]|1[0-2])/(?P<numeric_year>(?:19|20)\d{2})"
+    r"|(?P<present>present|current|now|date|ongoing)"
+    r"|(?P<year>(?:19|20)\d{2})"
+    r")\b",
+    re.IGNORECASE
+)
+RANGE_SEPARATOR_PATTERN = re.compile(r"\s*(?:-|–|—|to|till|until)\s*$", re.IGNORECASE)
+
+def scan_dates(text):
+    """
+    Find every date token in the text in a single pass.
+
+    Months are kept as an index (year * 12 + month - 1) so durations are plain
+    subtraction.
+
+    Returns:
+        list: (start, end, month index or None for "Present", year-only flag)
+            tuples in text order
+    """
+    tokens = []
+    for match in DATE_TOKEN_PATTERN.finditer(text):
+        groups = match.groupdict()
+        if groups["month"]:
+            index = int(groups["month_year"]) * 12 + MONTHS[groups["month"].lower()] - 1
+            year_only = False
+        elif groups["numeric_month"]:
+            index = int(groups["numeric_year"]) * 12 + int(groups["numeric_month"]) - 1
+            year_only = False
+        elif groups["present"]:
+            index, year_only = None, False
+        else:
+            index, year_only = int(groups["year"]) * 12, True
+        tokens.append((match.start(), match.end(), index, year_only))
+    return tokens
+
+def _month_index(date):
+    return date.year * 12 + date.month - 1
+
+def _role_range(text, tokens):
+    """Pick a role's start and end date tokens; end is None for a single date."""
+    for first, second in zip(tokens, tokens[1:]):
+        if first[2] is not None and RANGE_SEPARATOR_PATTERN.match(text, first[1], second[0]):
+            return first, second
+    dated = [token for token in tokens if token[2] is not None]
+    if not dated:
+        return None
+    return dated[0], dated[-1] if len(dated) > 1 else None
+
+def role_duration(text, today=None, tokens=None):
+    """
+    Work out the period covered by one role.
+
+    Uses the first explicit range ("Jan 2020 - Present", "2018 to 2020").
+    Without one, the role runs from its first to its last date. A single
+    date gives no duration, since a lone year is as often a graduation or an
+    award as a start date. A year-only end date counts the whole year. Both
+    ends are inclusive, so "Jan 2020 - Dec 2020" is 12 months.
+
+    Args:
+        text (str): Text of one role
+        today (datetime): Date used for "Present" (defaults to now)
+        tokens (list): Output of scan_dates, if already computed
+
+    Returns:
+        tuple: (start index, end index, months), or None if the role has no dates
+    """
+    if tokens is None:
+        tokens = scan_dates(text)
+    role_range = _role_range(text, tokens)
+    if role_range is None:
+        return None
+    start_token, end_token = role_range
+    if end_token is None:
+        return None
+
+    start = start_token[2]
+    if end_token[2] is None:
+        end = _month_index(today or datetime.now())
+    else:
+        end = end_token[2] + (11 if end_token[3] else 0)
+    if end < start:
+        return None
+    return start, end, end - start + 1
+
+def total_experience_months(periods):
+    """Total months covered by (start, end) periods, counting overlaps once."""
+    total, last_end = 0, None
+    for start, end in sorted(periods):
+        if last_end is not None and start <= last_end:
+            if end > last_end:
+                total += end - last_end
+                last_end = end
+            continue
+        total += end - start + 1
+        last_end = end
+    return total
+
+def split_roles(text, segmenter):
+    """
+    Split resume or experience-section text into one text per role.
+
+    Args:
+        text (str): Full resume text or experience section text
+        segmenter (SectionSegmenter): Segmenter used to find the experience section
+
+    Returns:
+        list: Non-empty role texts
+    """
+    # If full resume text provided, extract experience section
+    if text.count('\n') >= 10:  # Arbitrary threshold
+        text = segmenter.get_section(text, 'experience') or text
+    
+    # Split into different roles (assuming double newline separation)
+    return [role for role in re.split(r'\n\s*\n', text) if role.strip()]
+
+_segmenter = None
+
+def experience_months(text, today=None, segmenter=None):
+    """
+    Total months of experience in a resume, without running the NLP model.
+
+    Overlapping roles are counted once.
+
+    Args:
+        text (str): Full resume text or experience section text
+        today (datetime): Date used for "Present" (defaults to now)
+        segmenter (SectionSegmenter): Segmenter to reuse (a shared one by default)
+
+    Returns:
+        int: Months of experience across all roles
+    """
+    global _segmenter
+    if segmenter is None:
+        segmenter = _segmenter = _segmenter or SectionSegmenter()
+    periods = []
+    for role in split_roles(text, segmenter):
+        duration = role_duration(role, today)
+        if duration:
+            periods.append(duration[:2])
+    return total_experience_months(periods)
 
 class ExperienceExtractor:
     def __init__(self):
         """Initialize the experience extractor with NLP model."""
         self.nlp = spacy.load("en_core_web_sm")
         self.segmenter = SectionSegmenter()
-        
-        # Patterns for date extraction
-        self.date_patterns = [
-            r'((?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|'
-            r'Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|'
-            r'Dec(?:ember)?)[,]?\s+\d{4})',  # Month Year
-            r'(\d{1,2}/\d{4})',  # MM/YYYY
-            r'(\d{4})',  # YYYY
-        ]
-        
-        # Compile patterns
-        self.date_patterns = [re.compile(pattern) for pattern in self.date_patterns]
 
+    @timed("experience_extractor.extract_dates")
     def extract_dates(self, text):
-        """Extract dates from text using various patterns."""
-        dates = []
-        for pattern in self.date_patterns:
-            matches = pattern.finditer(text)
-            for match in matches:
-                date_str = match.group(1)
-                try:
-                    # Try to parse the date
-                    if '/' in date_str:
-                        date = datetime.strptime(date_str, '%m/%Y')
-                    elif len(date_str) == 4:  # Year only
-                        date = datetime.strptime(date_str, '%Y')
-                    else:  # Month Year
-                        date = datetime.strptime(date_str, '%B %Y')
-                    dates.append({
-                        'date': date,
-                        'original': date_str,
-                        'position': match.span()
-                    })
-                except ValueError:
-                    continue
-        return sorted(dates, key=lambda x: x['position'][0])
+        """Extract dates from text using the date lookup table."""
+        return [
+            {
+                'date': datetime(index // 12, index % 12 + 1, 1),
+                'original': text[start:end],
+                'position': (start, end)
+            }
+            for start, end, index, _ in scan_dates(text) if index is not None
+        ]
 
+    @timed("experience_extractor.extract_company_names")
     def extract_company_names(self, text):
         """Extract company names using NLP."""
         doc = self.nlp(text)
@@ -107,38 +241,36 @@ class ExperienceExtractor:
         
         return responsibilities
 
-    def analyze_experience(self, text):
+    @timed("experience_extractor.analyze_experience")
+    def analyze_experience(self, text, today=None):
         """
         Analyze the complete work experience section.
         
         Args:
             text (str): Full resume text or experience section text
+            today (datetime): Date used for "Present" (defaults to now)
             
         Returns:
             list: List of dictionaries containing structured experience data
         """
-        # If full resume text provided, extract experience section
-        if len(text.split('\n')) > 10:  # Arbitrary threshold
-            text = self.segmenter.get_section(text, 'experience') or text
-        
-        # Split into different roles (assuming double newline separation)
-        roles = re.split(r'\n\s*\n', text)
         experiences = []
         
-        for role in roles:
-            if not role.strip():
-                continue
-                
+        for role in split_roles(text, self.segmenter):
             experience = {}
             
-            # Extract dates
-            dates = self.extract_dates(role)
-            if dates:
-                experience['start_date'] = dates[0]['original']
-                if len(dates) > 1:
-                    experience['end_date'] = dates[-1]['original']
-                else:
+            # Extract dates and the role's duration from one scan
+            tokens = scan_dates(role)
+            role_range = _role_range(role, tokens)
+            if role_range:
+                start_token, end_token = role_range
+                experience['start_date'] = role[start_token[0]:start_token[1]]
+                if end_token is None or end_token[2] is None:
                     experience['end_date'] = 'Present'
+                else:
+                    experience['end_date'] = role[end_token[0]:end_token[1]]
+                duration = role_duration(role, today, tokens)
+                if duration:
+                    experience['months'] = duration[2]
             
             # Extract company names
             companies = self.extract_company_names(role)
@@ -0,0 +1,298 @@
+# feature_store.py
+
+import json
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from checkpoint import _atomic_write_text
+from shared_scoring import MATCH_WEIGHT, SIMILARITY_WEIGHT, top_k_indices
+from skill_filter import CandidateBitmapIndex
+from skill_table import build_skill_profile
+
+MANIFEST_NAME = "manifest.json"
+SKILL_VOCABULARY_NAME = "skills.json"
+TERM_VOCABULARY_NAME = "terms.json"
+SHARD_ARRAYS = (
+    "ids", "skill_indptr", "skill_indices", "term_indptr", "term_indices", "term_data", "norms"
+)
+
+class Shard:
+    def __init__(self, directory, offset):
+        """
+        One immutable shard of the store, with every array memory-mapped.
+
+        Args:
+            directory (Path): Shard directory
+            offset (int): Global row number of the shard's first row
+        """
+        self.name = directory.name
+        self.offset = offset
+        for array_name in SHARD_ARRAYS:
+            setattr(self, array_name, np.load(directory / f"{array_name}.npy", mmap_mode="r"))
+
+    def __len__(self):
+        return len(self.norms)
+
+    def row_skills(self, row):
+        """Skill IDs of one row."""
+        return self.skill_indices[self.skill_indptr[row]:self.skill_indptr[row + 1]]
+
+class FeatureStore:
+    def __init__(self, directory):
+        """
+        On-disk, sharded sparse matrix of resume skill and term vectors.
+
+        Each shard is a directory of CSR arrays saved as .npy files (candidate
+        IDs, skill indptr/indices, term indptr/indices/counts, vector norms),
+        which are memory-mapped when read, so scoring touches one shard's
+        pages at a time. Skill and term IDs come from vocabularies shared by
+        all shards that only ever grow, so appending a shard never rewrites
+        existing ones. A shard becomes visible only once it is listed in
+        manifest.json.
+
+        Args:
+            directory (str): Store directory (created if missing)
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.manifest_path = self.directory / MANIFEST_NAME
+        if self.manifest_path.exists():
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                self.manifest = json.load(f)
+        else:
+            self.manifest = {"shards": []}
+        self.skill_vocabulary = self._load_vocabulary(SKILL_VOCABULARY_NAME)
+        self.term_vocabulary = self._load_vocabulary(TERM_VOCABULARY_NAME)
+
+    def _load_vocabulary(self, filename):
+        path = self.directory / filename
+        if not path.exists():
+            return {}
+        with open(path, "r", encoding="utf-8") as f:
+            return {feature: index for index, feature in enumerate(json.load(f))}
+
+    def _save_vocabulary(self, filename, vocabulary):
+        _atomic_write_text(self.directory / filename, json.dumps(list(vocabulary)))
+
+    def __len__(self):
+        return sum(shard["rows"] for shard in self.manifest["shards"])
+
+    @staticmethod
+    def _csr(rows, with_counts):
+        """Build CSR arrays from per-row {feature ID: count} mappings."""
+        indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+        indptr[1:] = np.cumsum([len(row) for row in rows])
+        indices = np.fromiter(
+            (feature for row in rows for feature in sorted(row)), dtype=np.int32, count=indptr[-1]
+        )
+        if not with_counts:
+            return indptr, indices, None
+        data = np.fromiter(
+            (row[feature] for row in rows for feature in sorted(row)), dtype=np.int32, count=indptr[-1]
+        )
+        return indptr, indices, data
+
+    def append(self, resume_df):
+        """
+        Add a skill table as a new shard.
+
+        Args:
+            resume_df (pd.DataFrame): Table with 'Candidate_ID' and 'Skills' columns
+
+        Returns:
+            str: Name of the new shard
+        """
+        skill_rows, term_rows, norms = [], [], []
+        for skills in resume_df['Skills']:
+            profile = build_skill_profile(skills)
+            skill_rows.append({
+                self.skill_vocabulary.setdefault(skill, len(self.skill_vocabulary)): 1
+                for skill in profile['skills']
+            })
+            term_rows.append({
+                self.term_vocabulary.setdefault(term, len(self.term_vocabulary)): count
+                for term, count in profile['terms'].items()
+            })
+            norms.append(profile['norm'])
+
+        ids = np.asarray(resume_df['Candidate_ID'].tolist())
+        if ids.dtype == object:
+            # Object arrays cannot be memory-mapped
+            ids = ids.astype(str)
+        skill_indptr, skill_indices, _ = self._csr(skill_rows, with_counts=False)
+        term_indptr, term_indices, term_data = self._csr(term_rows, with_counts=True)
+        arrays = {
+            "ids": ids,
+            "skill_indptr": skill_indptr, "skill_indices": skill_indices,
+            "term_indptr": term_indptr, "term_indices": term_indices, "term_data": term_data,
+            "norms": np.array(norms, dtype=np.float64)
+        }
+
+        name = f"shard-{len(self.manifest['shards']):06d}"
+        shard_directory = self.directory / name
+        shard_directory.mkdir(exist_ok=True)
+        for array_name, array in arrays.items():
+            np.save(shard_directory / f"{array_name}.npy", array)
+
+        # Vocabularies first: a shard listed in the manifest must find all of its IDs
+        self._save_vocabulary(SKILL_VOCABULARY_NAME, self.skill_vocabulary)
+        self._save_vocabulary(TERM_VOCABULARY_NAME, self.term_vocabulary)
+        self.manifest["shards"].append({"name": name, "rows": len(ids)})
+        _atomic_write_text(self.manifest_path, json.dumps(self.manifest, indent=2))
+        return name
+
+    def shards(self):
+        """Yield the shards in order, each memory-mapped only while it is in use."""
+        offset = 0
+        for shard in self.manifest["shards"]:
+            yield Shard(self.directory / shard["name"], offset)
+            offset += shard["rows"]
+
+    def locate(self, candidate_id):
+        """
+        Find a candidate in the store.
+
+        Returns:
+            tuple: (shard name, row within the shard), or None
+        """
+        for shard in self.shards():
+            rows = np.flatnonzero(shard.ids == candidate_id)
+            if len(rows):
+                return shard.name, int(rows[0])
+        return None
+
+    def bitmap_index(self):
+        """Skill bitmap index over every stored candidate, in store row order (see skill_filter)."""
+        index = CandidateBitmapIndex()
+        skill_names = list(self.skill_vocabulary)
+        for shard in self.shards():
+            # Group the shard's entries by skill to get each skill's rows
+            order = np.argsort(shard.skill_indices, kind="stable")
+            skill_ids = shard.skill_indices[order]
+            rows = _entry_rows(shard.skill_indptr)[order] + shard.offset
+            bounds = np.flatnonzero(np.diff(skill_ids)) + 1
+            for ids, skill_rows in zip(np.split(skill_ids, bounds), np.split(rows, bounds)):
+                if len(ids):
+                    index.add_postings("skill", skill_names[ids[0]], skill_rows, shard.offset + len(shard))
+            index.resize(shard.offset + len(shard))
+        return index
+
+    def encode_job(self, job_skills):
+        """
+        Encode a job's skills as dense lookup vectors over the store vocabularies.
+
+        Features no stored resume has cannot match and are left out of the
+        vectors, but still count towards the number of job skills.
+
+        Returns:
+            dict: 'profile', 'skill_mask' (bool per skill ID), 'term_weights'
+                (count per term ID)
+        """
+        profile = build_skill_profile(job_skills)
+        skill_mask = np.zeros(len(self.skill_vocabulary), dtype=bool)
+        skill_mask[[
+            self.skill_vocabulary[s] for s in profile['skills'] if s in self.skill_vocabulary
+        ]] = True
+        term_weights = np.zeros(len(self.term_vocabulary), dtype=np.float64)
+        for term, count in profile['terms'].items():
+            if term in self.term_vocabulary:
+                term_weights[self.term_vocabulary[term]] = count
+        return {"profile": profile, "skill_mask": skill_mask, "term_weights": term_weights}
+
+def _entry_rows(indptr):
+    """Row number of every stored entry of a CSR matrix."""
+    return np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+
+def _score_shard(shard, job, skill_rows, term_rows):
+    """Match, similarity and final scores of one job against every row of a shard."""
+    n = len(shard)
+    profile = job["profile"]
+    overlap = np.bincount(skill_rows[job["skill_mask"][shard.skill_indices]], minlength=n)
+    if profile['skills']:
+        match = overlap / len(profile['skills'])
+    else:
+        match = np.zeros(n)
+
+    dot = np.bincount(
+        term_rows, weights=shard.term_data * job["term_weights"][shard.term_indices], minlength=n
+    )
+    similarity = np.zeros(n)
+    if profile['norm']:
+        np.divide(dot, shard.norms * profile['norm'], out=similarity, where=shard.norms > 0)
+
+    return match, similarity, MATCH_WEIGHT * match + SIMILARITY_WEIGHT * similarity
+
+def rank_candidates_from_store(store, job_df, top_k=100, row_mask=None):
+    """
+    Rank the candidates of a FeatureStore for each job, one shard at a time.
+
+    Only the current shard and each job's best top_k candidates so far are
+    held in memory, so RAM stays bounded however large the store is.
+    Scores and order are the same as resume_job_matcher.rank_candidates on
+    the table the store was built from.
+
+    Args:
+        store (FeatureStore): Resume feature store
+        job_df (pd.DataFrame): DataFrame with job skills
+        top_k (int): Candidates kept per job (None keeps all, which is not bounded)
+        row_mask (np.ndarray): Optional boolean mask over store rows; only
+            candidates it selects are ranked (see FeatureStore.bitmap_index)
+
+    Returns:
+        pd.DataFrame: Rankings with the same columns as rank_candidates
+    """
+    jobs = [store.encode_job(skills) for skills in job_df['Skills']]
+    # Per job: (global rows, match, similarity, final) of the best candidates so far
+    best = [None] * len(jobs)
+    skill_names = list(store.skill_vocabulary)
+    kept = {}  # global row -> (candidate ID, skill set), only for rows still in some top_k
+
+    for shard in store.shards():
+        allowed = None
+        if row_mask is not None:
+            allowed = np.flatnonzero(row_mask[shard.offset:shard.offset + len(shard)])
+            if not len(allowed):
+                continue
+        skill_rows, term_rows = _entry_rows(shard.skill_indptr), _entry_rows(shard.term_indptr)
+        for j, job in enumerate(jobs):
+            match, similarity, final = _score_shard(shard, job, skill_rows, term_rows)
+            if allowed is None:
+                top = top_k_indices(final, top_k)
+            else:
+                top = allowed[top_k_indices(final[allowed], top_k)]
+            candidate = (top + shard.offset, match[top], similarity[top], final[top])
+            if best[j] is not None:
+                merged = [np.concatenate(pair) for pair in zip(best[j], candidate)]
+                order = np.lexsort((merged[0], -merged[3]))[:top_k]
+                candidate = tuple(column[order] for column in merged)
+            best[j] = candidate
+
+        # Remember the IDs and skills of this shard's rows that made some job's top_k
+        wanted = {int(row) for job_best in best for row in job_best[0] if row >= shard.offset}
+        for row in wanted:
+            local = row - shard.offset
+            kept[row] = (
+                shard.ids[local].item(),
+                frozenset(skill_names[i] for i in shard.row_skills(local))
+            )
+        live = {int(row) for job_best in best for row in job_best[0]}
+        kept = {row: value for row, value in kept.items() if row in live}
+
+    results = []
+    for job_id, job, job_best in zip(job_df['Job_ID'], jobs, best):
+        if job_best is None:
+            continue
+        job_skills = job["profile"]['skills']
+        for rank, (row, match, similarity, final) in enumerate(zip(*job_best), 1):
+            candidate_id, resume_skill_set = kept[int(row)]
+            results.append({
+                'Job_ID': job_id,
+                'Candidate_ID': candidate_id,
+                'Match_Score': float(match),
+                'Similarity_Score': float(similarity),
+                'Final_Score': float(final),
+                'Matching_Skills': [s for s in job_skills if s in resume_skill_set],
+                'Missing_Skills': [s for s in job_skills if s not in resume_skill_set],
+                'Rank': rank
+            })
+    return pd.DataFrame(results)
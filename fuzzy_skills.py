@@ -0,0 +1,160 @@
+# fuzzy_skills.py
+
+import re
+from functools import lru_cache
+from itertools import combinations
+
+# (minimum word length, edits allowed): shorter words only match exactly, so
+# "react", "scala" or "spark" are never read into "reach", "scale" or "spare"
+DEFAULT_MAX_DISTANCES = ((6, 1), (12, 2))
+
+# Common words one or two edits from a skill word ("jquery", "spring",
+# "transformers", "docker"); they are never corrected
+NEVER_CORRECTED = frozenset({
+    "query", "queries", "string", "strings", "sprint", "sprints", "transformed",
+    "transforms", "docket", "locker", "panda", "annular", "resign", "texting",
+    "resting", "nesting", "nodes", "reacts"
+})
+
+WORD_PATTERN = re.compile(r"[A-Za-z]+")
+
+class FuzzySkillIndex:
+    def __init__(self, skills, max_distances=DEFAULT_MAX_DISTANCES, exclude=NEVER_CORRECTED,
+                 cache_size=100000):
+        """
+        Typo-tolerant lookup of the words that make up a skills dictionary.
+
+        SymSpell-style: every dictionary word is stored once per string
+        obtained by deleting up to its allowed number of characters. A token
+        is looked up by generating its own deletions, so finding the words
+        within edit distance 2 is a bounded number of dictionary lookups,
+        not a scan of the dictionary. Candidates are confirmed with the
+        optimal string alignment distance (an adjacent transposition such as
+        "pyhton" counts as one edit).
+
+        normalize() rewrites misspelled words in a text to their dictionary
+        spelling, so exact skill matchers (including multi-word skills such
+        as "machine learning") then find them.
+
+        Args:
+            skills (iterable): Dictionary skills, e.g. the lines of skills.txt
+            max_distances (tuple): (minimum word length, edits allowed) pairs;
+                words and tokens shorter than the first length only match exactly
+            exclude (iterable): Words that are never corrected
+            cache_size (int): Tokens whose correction is remembered
+        """
+        self.max_distances = tuple(sorted(max_distances))
+        self.exclude = frozenset(word.lower() for word in exclude)
+        self.words = {word for skill in skills for word in WORD_PATTERN.findall(skill.lower())}
+        self.deletions = {}
+        for word in self.words:
+            for deletion in _deletions(word, self.max_distance(len(word))):
+                self.deletions.setdefault(deletion, set()).add(word)
+        fuzzy_words = [word for word in self.words if self.max_distance(len(word))]
+        # Shorter or longer tokens cannot be within reach of any word that allows edits;
+        # the edits allowed also depend on the token's own length (see correct)
+        self.min_token_length = max(
+            min((len(word) - self.max_distance(len(word)) for word in fuzzy_words), default=1),
+            min((length for length, distance in self.max_distances if distance), default=1)
+        )
+        self.max_token_length = max((len(word) + self.max_distance(len(word)) for word in fuzzy_words), default=0)
+        self.cache_size = cache_size
+        self._cache = {}
+
+    def max_distance(self, length):
+        """Edits allowed for a dictionary word of the given length."""
+        allowed = 0
+        for min_length, distance in self.max_distances:
+            if length >= min_length:
+                allowed = distance
+        return allowed
+
+    def correct(self, token):
+        """
+        Dictionary spelling of a token.
+
+        Returns:
+            str: The token itself if it is a dictionary word, the one word
+                closest to it within the allowed distance, or None (no word
+                in reach, several equally close, or an excluded token). The
+                distance allowed is that of the shorter of token and word,
+                so a short token is never corrected into a longer skill.
+        """
+        token = token.lower()
+        if token in self.words:
+            return token
+        if token in self._cache:
+            return self._cache[token]
+
+        match = None
+        if self.min_token_length <= len(token) <= self.max_token_length and token not in self.exclude:
+            # No word allows more edits than the token's own length does
+            depth = self.max_distance(len(token))
+            candidates = set()
+            for deletion in _deletions(token, depth):
+                candidates.update(self.deletions.get(deletion, ()))
+            best = None
+            for word in candidates:
+                distance = osa_distance(token, word, self.max_distance(min(len(token), len(word))))
+                if distance is None:
+                    continue
+                if best is None or distance < best:
+                    best, match = distance, word
+                elif distance == best:
+                    # Equally close to two words: too ambiguous to correct
+                    match = None
+
+        if len(self._cache) >= self.cache_size:
+            self._cache.clear()
+        self._cache[token] = match
+        return match
+
+    def normalize(self, text):
+        """Replace misspelled dictionary words in a text; everything else is kept as is."""
+        def replace(found):
+            token = found.group(0)
+            corrected = self.correct(token)
+            return token if corrected is None or corrected == token.lower() else corrected
+
+        return WORD_PATTERN.sub(replace, text)
+
+def _deletions(word, depth):
+    """The word and every string obtained by deleting up to `depth` of its characters."""
+    found = {word}
+    for count in range(1, min(depth, len(word) - 1) + 1):
+        for positions in combinations(range(len(word)), count):
+            found.add("".join(char for i, char in enumerate(word) if i not in positions))
+    return found
+
+def osa_distance(a, b, limit):
+    """
+    Optimal string alignment distance between two strings.
+
+    Returns:
+        int: The distance, or None if it is above `limit`
+    """
+    if abs(len(a) - len(b)) > limit:
+        return None
+    previous_row = None
+    row = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        before, previous_row, row = previous_row, row, [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            row[j] = min(previous_row[j] + 1, row[j - 1] + 1, previous_row[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                row[j] = min(row[j], before[j - 2] + 1)
+        if min(row) > limit:
+            return None
+    return row[-1] if row[-1] <= limit else None
+
+@lru_cache(maxsize=8)
+def fuzzy_index_for(skills, max_distances=DEFAULT_MAX_DISTANCES):
+    """
+    Shared FuzzySkillIndex for a skills dictionary, built on first use.
+
+    Args:
+        skills (tuple): Dictionary skills
+        max_distances (tuple): See FuzzySkillIndex
+    """
+    return FuzzySkillIndex(skills, max_distances)
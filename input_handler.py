@@ -1,33 +1,193 @@
+import io
+import mmap
 import os
+import zipfile
 from pdfminer.high_level import extract_text as extract_pdf_text
-from docx import Document
 from PIL import Image
 import pytesseract
+from document_limits import LIMITS
+from docx_stream import extract_text_from_docx
+from instrumentation import timed
 
 def extract_text_from_pdf(file_path):
-    return extract_pdf_text(file_path)
-
-def extract_text_from_docx(file_path):
-    doc = Document(file_path)
-    return "\n".join([para.text for para in doc.paragraphs])
+    # pdfminer reads pages lazily, so pages past the limit are never parsed
+    return extract_pdf_text(file_path, maxpages=LIMITS.page_limit() or 0)
 
 def extract_text_from_txt(file_path):
+    # In-memory buffers (archive members, uploads) are decoded directly
+    if hasattr(file_path, 'read'):
+        return file_path.read().decode('utf-8', errors='ignore')
     with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
         return f.read()
 
 def extract_text_from_image(file_path):
     image = Image.open(file_path)
-    return pytesseract.image_to_string(image)
+    # Tesseract runs as a subprocess; give it whatever is left of the document's time
+    LIMITS.check_time()
+    remaining = LIMITS.remaining_seconds()
+    try:
+        return pytesseract.image_to_string(image, timeout=remaining or 0)
+    except RuntimeError as e:
+        if remaining is not None and "timeout" in str(e).lower():
+            LIMITS.check_time()
+        raise
 
-def extract_resume_text(file_path):
-    ext = os.path.splitext(file_path)[1].lower()
-    if ext == ".pdf":
-        return extract_text_from_pdf(file_path)
-    elif ext == ".docx":
-        return extract_text_from_docx(file_path)
-    elif ext == ".txt":
-        return extract_text_from_txt(file_path)
-    elif ext in [".png", ".jpg", ".jpeg"]:
-        return extract_text_from_image(file_path)
-    else:
+# Every extractor accepts a path or a binary file object
+EXTRACTORS = {
+    ".pdf": extract_text_from_pdf,
+    ".docx": extract_text_from_docx,
+    ".txt": extract_text_from_txt,
+    ".png": extract_text_from_image,
+    ".jpg": extract_text_from_image,
+    ".jpeg": extract_text_from_image,
+}
+
+def _extractor_for(file_name):
+    ext = os.path.splitext(file_name)[1].lower()
+    extractor = EXTRACTORS.get(ext)
+    if extractor is None:
         raise ValueError(f"Unsupported file type: {ext}")
+    return extractor
+
+@timed("text_extraction")
+def extract_resume_text(file_path):
+    LIMITS.check_bytes(file_path, file_path)
+    with LIMITS.deadline(file_path):
+        return LIMITS.truncate(_extractor_for(file_path)(file_path))
+
+# ------------ IN-MEMORY INPUT ----------------
+class MemoryReader(io.RawIOBase):
+    """Seekable, read-only binary file object over a bytes-like buffer, without copying it."""
+
+    def __init__(self, buffer):
+        self._view = memoryview(buffer).cast("B")
+        self._position = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._position
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+        if offset < 0:
+            raise ValueError("Negative seek position")
+        self._position = offset
+        return offset
+
+    def read(self, size=-1):
+        end = len(self._view) if size is None or size < 0 else min(self._position + size, len(self._view))
+        data = self._view[self._position:end].tobytes() if end > self._position else b""
+        self._position = max(self._position, end)
+        return data
+
+    def readinto(self, buffer):
+        data = self.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+    def close(self):
+        self._view.release()
+        super().close()
+
+def detect_file_type(stream):
+    """
+    Detect a resume's format from its leading bytes.
+
+    Args:
+        stream: Seekable binary file object, positioned at the start
+
+    Returns:
+        str: Extension of the detected format (".pdf", ".docx", ".png", ".jpg"
+            or ".txt"), or None if the content is not recognised
+    """
+    header = stream.read(1024)
+    stream.seek(0)
+    if header.startswith(b"%PDF-"):
+        return ".pdf"
+    if header.startswith(b"\x89PNG\r\n\x1a\n"):
+        return ".png"
+    if header.startswith(b"\xff\xd8\xff"):
+        return ".jpg"
+    if header.startswith(b"PK\x03\x04"):
+        # DOCX is a ZIP container; tell it apart from other ZIPs by its main part
+        try:
+            with zipfile.ZipFile(stream) as archive:
+                is_docx = "word/document.xml" in archive.namelist()
+        except zipfile.BadZipFile:
+            is_docx = False
+        stream.seek(0)
+        return ".docx" if is_docx else None
+    if b"\x00" not in header:
+        return ".txt"
+    return None
+
+def _open_source(source):
+    """Return (seekable binary file object, resources to close afterwards)."""
+    if isinstance(source, bytes):
+        # BytesIO shares an immutable bytes object instead of copying it
+        stream = io.BytesIO(source)
+        return stream, [stream]
+    if isinstance(source, (bytearray, memoryview, mmap.mmap)):
+        stream = MemoryReader(source)
+        return stream, [stream]
+    if not hasattr(source, "read"):
+        raise TypeError(f"Expected bytes, a buffer or a binary file object, got {type(source).__name__}")
+
+    try:
+        # Real files are memory-mapped so the extractors read pages straight from the page cache
+        mapped = mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ)
+    except (AttributeError, OSError, ValueError, io.UnsupportedOperation):
+        mapped = None
+    if mapped is not None:
+        stream = MemoryReader(mapped)
+        # The view must be released before the map can be closed
+        return stream, [stream, mapped]
+    if source.seekable():
+        source.seek(0)
+        return source, []
+    # Pipes and sockets can only be read once
+    stream = io.BytesIO(source.read())
+    return stream, [stream]
+
+@timed("text_extraction")
+def extract_text_from_buffer(data, file_name=None):
+    """
+    Extract resume text from memory or an open file, without a temporary file.
+
+    The format is detected from the content's magic bytes. `file_name` is only
+    consulted when the content is not recognised. Extraction is bounded by
+    document_limits.LIMITS.
+
+    Args:
+        data: bytes, bytearray, memoryview, mmap or a binary file object
+        file_name (str): Optional original file name
+
+    Returns:
+        str: Extracted text
+
+    Raises:
+        DocumentRejected: If the document is too large or takes too long
+    """
+    stream, resources = _open_source(data)
+    try:
+        LIMITS.check_bytes(stream, file_name)
+        ext = detect_file_type(stream)
+        if ext is None:
+            if not file_name:
+                raise ValueError("Unsupported file type: unrecognised content")
+            extractor = _extractor_for(file_name)
+        else:
+            extractor = EXTRACTORS[ext]
+        with LIMITS.deadline(file_name):
+            return LIMITS.truncate(extractor(stream))
+    finally:
+        for resource in resources:
+            resource.close()
@@ -0,0 +1,249 @@
+# instrumentation.py
+
+import functools
+import json
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+# Histogram bucket upper bounds, in seconds
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+class _NullTimer:
+    """Shared no-op context manager returned while metrics are disabled."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NULL_TIMER = _NullTimer()
+
+class _StageTimer:
+    __slots__ = ("metrics", "name", "started")
+
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        for listener in self.metrics.listeners:
+            listener.stage_started(self.name)
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.started
+        for listener in self.metrics.listeners:
+            listener.stage_finished(self.name)
+        self.metrics.observe(self.name, elapsed)
+        return False
+
+class Histogram:
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        """Cumulative-bucket latency histogram (Prometheus style)."""
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.total += value
+        self.count += 1
+
+    def to_dict(self):
+        cumulative, running = {}, 0
+        for bound, count in zip(self.buckets, self.counts):
+            running += count
+            cumulative[str(bound)] = running
+        cumulative["+Inf"] = self.count
+        return {
+            "count": self.count,
+            "sum_s": round(self.total, 6),
+            "mean_ms": round(self.total / self.count * 1000, 3) if self.count else None,
+            "buckets": cumulative
+        }
+
+class Metrics:
+    def __init__(self, enabled=False, buckets=DEFAULT_BUCKETS):
+        """
+        Registry of stage timers and counters.
+
+        While disabled, stage() returns a shared no-op context manager and
+        count()/observe() return immediately, so instrumented code pays only
+        an attribute check.
+
+        Args:
+            enabled (bool): Start enabled
+            buckets (tuple): Histogram bucket bounds in seconds
+        """
+        self.enabled = enabled
+        self.buckets = buckets
+        self.histograms = {}
+        self.counters = {}
+        self.gauges = {}
+        self.listeners = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def enable(self):
+        self.enabled = True
+
+    def add_listener(self, listener):
+        """
+        Register an object notified of stage and document boundaries.
+
+        Listeners implement stage_started(name), stage_finished(name) and
+        document_finished(doc_id, timings).
+        """
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener):
+        self.listeners.remove(listener)
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        """Drop all collected histograms and counters."""
+        with self._lock:
+            self.histograms = {}
+            self.counters = {}
+            self.gauges = {}
+
+    def stage(self, name):
+        """
+        Time a block of code as one stage.
+
+        Usage:
+            with METRICS.stage("pdf_extraction"):
+                ...
+        """
+        if not self.enabled:
+            return _NULL_TIMER
+        return _StageTimer(self, name)
+
+    def observe(self, name, seconds):
+        """Record a stage duration in its histogram and the current document."""
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram(self.buckets)
+            histogram.observe(seconds)
+        timings = getattr(self._local, "timings", None)
+        if timings is not None:
+            timings[name] = round(timings.get(name, 0.0) + seconds * 1000, 3)
+
+    def count(self, name, value=1):
+        """Increment a counter."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def gauge(self, name, value):
+        """Set a gauge to its latest value."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self.gauges[name] = value
+
+    @contextmanager
+    def document(self, doc_id=None):
+        """
+        Collect per-stage timings (milliseconds) for one document.
+
+        Yields a dict filled in by the stages run inside the block, or None
+        while metrics are disabled.
+
+        Args:
+            doc_id (str): Identifier passed on to listeners
+        """
+        if not self.enabled:
+            yield None
+            return
+        previous = getattr(self._local, "timings", None)
+        timings = self._local.timings = {}
+        started = time.perf_counter()
+        try:
+            yield timings
+        finally:
+            timings["total"] = round((time.perf_counter() - started) * 1000, 3)
+            self._local.timings = previous
+            self.count("documents_total")
+            for listener in self.listeners:
+                listener.document_finished(doc_id, timings)
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                "counters": dict(self.counters),
+                "gauges": dict(self.gauges),
+                "stages": {name: h.to_dict() for name, h in sorted(self.histograms.items())}
+            }
+
+    def to_prometheus(self, prefix="resume_pipeline"):
+        """Render all metrics in the Prometheus text exposition format."""
+        lines = []
+        snapshot = self.to_dict()
+        for name, value in sorted(snapshot["counters"].items()):
+            metric = f"{prefix}_{name}"
+            lines += [f"# TYPE {metric} counter", f"{metric} {value}"]
+        for name, value in sorted(snapshot["gauges"].items()):
+            metric = f"{prefix}_{name}"
+            lines += [f"# TYPE {metric} gauge", f"{metric} {value}"]
+
+        metric = f"{prefix}_stage_seconds"
+        lines.append(f"# TYPE {metric} histogram")
+        for stage, histogram in snapshot["stages"].items():
+            for bound, count in histogram["buckets"].items():
+                lines.append(f'{metric}_bucket{{stage="{stage}",le="{bound}"}} {count}')
+            lines.append(f'{metric}_sum{{stage="{stage}"}} {histogram["sum_s"]}')
+            lines.append(f'{metric}_count{{stage="{stage}"}} {histogram["count"]}')
+        return "\n".join(lines) + "\n"
+
+    def export(self, path):
+        """Write metrics to `path`: Prometheus text for .prom/.txt, JSON otherwise."""
+        if str(path).endswith((".prom", ".txt")):
+            content = self.to_prometheus()
+        else:
+            content = json.dumps(self.to_dict(), indent=2)
+        with open(path, "w") as f:
+            f.write(content)
+        print(f"✅ Metrics saved to {path}")
+
+def peak_rss_mb():
+    """Return the peak resident set size of this process in MB, or None if unknown."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes on Linux
+    return round(peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024, 1)
+
+# Process-wide registry, disabled by default
+METRICS = Metrics()
+
+def timed(name):
+    """Decorator that times every call of a function as stage `name`."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not METRICS.enabled:
+                return fn(*args, **kwargs)
+            with METRICS.stage(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -2,8 +2,11 @@
 
 import re
 import spacy
+import numpy as np
 import pandas as pd
 from collections import Counter
+from skill_table import write_skill_table
+from instrumentation import timed
 
 # Load spaCy model
 nlp = spacy.load("en_core_web_sm")
@@ -18,6 +21,40 @@ COMMON_TECH_SKILLS = [
     "gitlab", "ci/cd", "jenkins", "agile", "scrum", "kanban", "jira"
 ]
 
+# Batch matcher for "does this text contain any common skill" checks
+COMMON_SKILL_MATCHER = re.compile(
+    '|'.join(re.escape(skill) for skill in sorted(COMMON_TECH_SKILLS, key=len, reverse=True))
+)
+
+# Phrases that usually introduce a list of skills
+SKILL_PHRASE_PATTERN = re.compile(
+    r'\b(?:proficient in|experience with|knowledge of|skilled in|expertise in)\s+([^.,:;]+)'
+)
+
+# spaCy components that noun chunking does not need
+UNUSED_PIPES = ("ner", "lemmatizer")
+
+def _noun_chunk_skills(doc):
+    """Return noun chunks that mention a common skill."""
+    return [
+        chunk.text.strip() for chunk in doc.noun_chunks
+        if COMMON_SKILL_MATCHER.search(chunk.text.lower())
+    ]
+
+def _clean_skills(extracted_skills):
+    """Normalize raw skill candidates and return them de-duplicated in order."""
+    cleaned_skills = []
+    for skill in extracted_skills:
+        # Remove extra whitespace and common words
+        skill = re.sub(r'\s+', ' ', skill).strip()
+        skill = re.sub(r'^(and|or|the|a|an|in|with|using)\s+', '', skill)
+        if len(skill) > 2:  # Ignore very short skills
+            cleaned_skills.append(skill)
+    
+    # Count occurrences and get unique skills
+    skill_counter = Counter(cleaned_skills)
+    return list(skill_counter.keys())
+
 # Function to extract skills from job description
 def extract_skills_from_job(job_description):
     """
@@ -35,17 +72,11 @@ def extract_skills_from_job(job_description):
     # Process with spaCy
     doc = nlp(text)
     
-    extracted_skills = []
-    
     # Extract skills using noun chunks and named entities
-    for chunk in doc.noun_chunks:
-        if any(skill in chunk.text.lower() for skill in COMMON_TECH_SKILLS):
-            extracted_skills.append(chunk.text.strip())
+    extracted_skills = _noun_chunk_skills(doc)
     
     # Extract skills using regex patterns
-    skill_pattern = r'\b(?:proficient in|experience with|knowledge of|skilled in|expertise in)\s+([^.,:;]+)'
-    matches = re.findall(skill_pattern, text)
-    for match in matches:
+    for match in SKILL_PHRASE_PATTERN.findall(text):
         extracted_skills.append(match.strip())
     
     # Direct matching of common skills
@@ -53,20 +84,56 @@ def extract_skills_from_job(job_description):
         if skill in text:
             extracted_skills.append(skill)
     
-    # Clean and normalize skills
-    cleaned_skills = []
-    for skill in extracted_skills:
-        # Remove extra whitespace and common words
-        skill = re.sub(r'\s+', ' ', skill).strip()
-        skill = re.sub(r'^(and|or|the|a|an|in|with|using)\s+', '', skill)
-        if len(skill) > 2:  # Ignore very short skills
-            cleaned_skills.append(skill)
+    return _clean_skills(extracted_skills)
+
+@timed("bulk_skill_extraction")
+def extract_skills_bulk(texts, batch_size=256, n_process=1):
+    """
+    Extract skills from a whole column of texts at once.
     
-    # Count occurrences and get unique skills
-    skill_counter = Counter(cleaned_skills)
-    unique_skills = list(skill_counter.keys())
+    Produces the same skills as calling extract_skills_from_job per text, but
+    computes regex phrases and dictionary hits with vectorized string
+    operations and sends only texts with at least one dictionary hit through
+    a single batched spaCy call (texts without hits cannot yield noun-chunk
+    skills).
+    
+    Args:
+        texts (iterable): Texts to process (NaN/None are treated as empty)
+        batch_size (int): spaCy batch size
+        n_process (int): Number of spaCy worker processes
+        
+    Returns:
+        list: One list of extracted skills per input text
+    """
+    lowered = pd.Series(list(texts), dtype=object).fillna('').astype(str).str.lower()
+    lowered.index = range(len(lowered))
     
-    return unique_skills
+    # Dictionary hits: one vectorized substring test per skill
+    hits = np.column_stack([
+        lowered.str.contains(skill, regex=False).to_numpy(dtype=bool)
+        for skill in COMMON_TECH_SKILLS
+    ]) if len(lowered) else np.zeros((0, len(COMMON_TECH_SKILLS)), dtype=bool)
+    
+    # Regex phrases for every row in one pass
+    phrases = lowered.str.findall(SKILL_PHRASE_PATTERN)
+    
+    # Only rows with a dictionary hit can produce noun-chunk skills
+    nlp_rows = np.flatnonzero(hits.any(axis=1))
+    chunk_skills = {}
+    disabled = [name for name in UNUSED_PIPES if name in nlp.pipe_names]
+    with nlp.select_pipes(disable=disabled):
+        docs = nlp.pipe(lowered.iloc[nlp_rows], batch_size=batch_size, n_process=n_process)
+        for row, doc in zip(nlp_rows, docs):
+            chunk_skills[row] = _noun_chunk_skills(doc)
+    
+    results = []
+    for row in range(len(lowered)):
+        extracted_skills = list(chunk_skills.get(row, []))
+        extracted_skills.extend(match.strip() for match in phrases.iat[row])
+        extracted_skills.extend(COMMON_TECH_SKILLS[i] for i in np.flatnonzero(hits[row]))
+        results.append(_clean_skills(extracted_skills))
+    
+    return results
 
 # Function to process multiple job descriptions
 def process_job_descriptions(job_data):
@@ -77,25 +144,21 @@ def process_job_descriptions(job_data):
         job_data (pd.DataFrame): DataFrame with job descriptions
         
     Returns:
-        pd.DataFrame: DataFrame with job IDs and extracted skills
+        pd.DataFrame: DataFrame with job IDs and a list-typed Skills column
     """
-    results = []
+    job_desc = job_data.get('Job_Desc', pd.Series('', index=job_data.index)).fillna('')
+    job_ids = job_data.get('Job_ID', pd.Series(None, index=job_data.index, dtype=object))
     
-    for _, row in job_data.iterrows():
-        job_id = row.get('Job_ID', None)
-        job_desc = row.get('Job_Desc', '')
-        
-        if not job_desc:
-            continue
-            
-        skills = extract_skills_from_job(job_desc)
-        
-        results.append({
-            'Job_ID': job_id,
-            'Skills': ','.join(skills)
-        })
+    # Skip rows without a description
+    mask = job_desc.astype(str) != ''
+    skills = extract_skills_bulk(job_desc[mask])
+    
+    results = pd.DataFrame({
+        'Job_ID': job_ids[mask].tolist(),
+        'Skills': skills
+    })
     
-    return pd.DataFrame(results)
+    return results
 
 # Example usage
 if __name__ == "__main__":
@@ -112,6 +175,6 @@ if __name__ == "__main__":
     result_df = process_job_descriptions(sample_data)
     print(result_df)
     
-    # Save to CSV
-    result_df.to_csv("extracted_job_skills.csv", index=False)
-    print("✅ Job skills data saved to extracted_job_skills.csv")
+    # Save to Parquet (keeps Skills as a native list column)
+    write_skill_table(result_df, "extracted_job_skills.parquet")
+    print("✅ Job skills data saved to extracted_job_skills.parquet")
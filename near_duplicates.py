@@ -0,0 +1,124 @@
+# near_duplicates.py
+
+import re
+import zlib
+import numpy as np
+
+WORD_PATTERN = re.compile(r"\w+")
+
+# Shingles are hashed to 32 bits and permuted with (a * x + b) mod p, which
+# stays within uint64 for 32-bit a, b and x
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+
+def shingle_hashes(text, size=5):
+    """
+    Hash the distinct word `size`-grams of a text.
+
+    Args:
+        text (str): Document text
+        size (int): Words per shingle
+
+    Returns:
+        np.ndarray: Unique 32-bit shingle hashes (as uint64)
+    """
+    words = WORD_PATTERN.findall(text.lower())
+    if len(words) < size:
+        grams = [" ".join(words)] if words else []
+    else:
+        grams = (" ".join(words[i:i + size]) for i in range(len(words) - size + 1))
+    return np.fromiter({zlib.crc32(gram.encode("utf-8")) for gram in grams}, dtype=np.uint64)
+
+def estimated_similarity(signature_a, signature_b):
+    """Estimate the Jaccard similarity of two documents from their MinHash signatures."""
+    return float(np.count_nonzero(signature_a == signature_b)) / len(signature_a)
+
+class NearDuplicateIndex:
+    def __init__(self, threshold=0.7, num_perm=128, bands=32, shingle_size=5, seed=1):
+        """
+        Streaming near-duplicate detector using MinHash and LSH banding.
+
+        Each document's signature is split into `bands` bands; documents that
+        agree on a whole band land in the same bucket and become candidates,
+        which are then checked against `threshold`. Every add is a constant
+        number of bucket lookups, so a corpus is deduplicated in roughly
+        linear time. With the defaults (32 bands of 4 rows) a pair at the 0.7
+        threshold becomes a candidate with probability above 99.9%.
+
+        Args:
+            threshold (float): Minimum estimated Jaccard similarity of shingles
+            num_perm (int): MinHash permutations per signature
+            bands (int): LSH bands; must divide num_perm
+            shingle_size (int): Words per shingle
+            seed (int): Seed for the permutations
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, MAX_HASH, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, MAX_HASH, size=num_perm, dtype=np.uint64)
+        self.threshold = threshold
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.buckets = [{} for _ in range(bands)]
+        self.signatures = {}  # canonical document -> signature
+        self.duplicates = {}  # duplicate document -> canonical document
+
+    def signature(self, text):
+        """Return the MinHash signature of a text, or None if it has no words."""
+        hashes = shingle_hashes(text, self.shingle_size)
+        if not len(hashes):
+            return None
+        permuted = (np.outer(hashes, self._a) + self._b) % MERSENNE_PRIME & MAX_HASH
+        return permuted.min(axis=0).astype(np.uint32)
+
+    def _band_keys(self, signature):
+        for band in range(len(self.buckets)):
+            yield band, signature[band * self.rows:(band + 1) * self.rows].tobytes()
+
+    def query(self, signature):
+        """
+        Find the indexed document most similar to a signature.
+
+        Returns:
+            tuple: (document ID, estimated similarity), or (None, 0.0) if no
+                indexed document reaches the threshold
+        """
+        best, best_similarity = None, 0.0
+        seen = set()
+        for band, key in self._band_keys(signature):
+            for candidate in self.buckets[band].get(key, ()):
+                if candidate in seen:
+                    continue
+                seen.add(candidate)
+                similarity = estimated_similarity(self.signatures[candidate], signature)
+                if similarity >= self.threshold and similarity > best_similarity:
+                    best, best_similarity = candidate, similarity
+        return best, best_similarity
+
+    def add(self, doc_id, text):
+        """
+        Index a document, unless it near-duplicates one already indexed.
+
+        Only canonical documents are indexed, so chains of small edits all
+        resolve to the first copy seen.
+
+        Args:
+            doc_id (str): Document identifier
+            text (str): Document text
+
+        Returns:
+            str: ID of the canonical document this one duplicates, or None
+        """
+        signature = self.signature(text)
+        if signature is None:
+            return None
+        canonical, _ = self.query(signature)
+        if canonical is not None:
+            self.duplicates[doc_id] = canonical
+            return canonical
+
+        self.signatures[doc_id] = signature
+        for band, key in self._band_keys(signature):
+            self.buckets[band].setdefault(key, []).append(doc_id)
+        return None
@@ -0,0 +1,178 @@
+# profiling.py
+
+import cProfile
+import heapq
+import json
+import os
+import pstats
+import re
+import signal
+import threading
+from collections import Counter
+from pathlib import Path
+from instrumentation import METRICS
+
+PROFILE_MODES = ("cprofile", "sampling", "both")
+
+def _safe_name(stage):
+    """Turn a stage name into a file name."""
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", stage)
+
+def _frame_label(code):
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+class StageProfiler:
+    def __init__(self, output_dir, mode="both", interval=0.005, top_n=10):
+        """
+        Per-stage profiler driven by the METRICS stage boundaries.
+
+        - cprofile: one deterministic cProfile per stage. A nested stage
+          pauses its parent, so each profile holds only the stage's own work.
+        - sampling: a SIGPROF timer samples the main thread's stack every
+          `interval` seconds of CPU time and tags it with the active stage,
+          giving collapsed stacks for flame-graph tools. Unix only.
+
+        Profiling is main-thread only. A cProfile.Profile cannot be enabled
+        from several threads at once (Python 3.12+ refuses a second active
+        profiler), so stage and document events from other threads are
+        ignored, and start() must be called from the main thread.
+
+        Args:
+            output_dir (str): Directory for .pstats, .collapsed and report files
+            mode (str): "cprofile", "sampling" or "both"
+            interval (float): Sampling interval in seconds
+            top_n (int): Number of slowest documents to keep
+        """
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode: {mode}")
+        self.output_dir = Path(output_dir)
+        self.deterministic = mode in ("cprofile", "both")
+        self.sampling = mode in ("sampling", "both") and hasattr(signal, "setitimer")
+        self.interval = interval
+        self.top_n = top_n
+        self.profiles = {}
+        self.samples = Counter()
+        self.slowest = []  # min-heap of (total_ms, sequence, doc_id, timings)
+        self._sequence = 0
+        self._main_stack = []
+        self._main_thread = threading.main_thread()
+
+    def _in_main_thread(self):
+        return threading.current_thread() is self._main_thread
+
+    # ------------ METRICS LISTENER ----------------
+    def stage_started(self, name):
+        if not self._in_main_thread():
+            return
+        stack = self._main_stack
+        if self.deterministic:
+            if stack:
+                self.profiles[stack[-1]].disable()
+            profile = self.profiles.get(name)
+            if profile is None:
+                profile = self.profiles[name] = cProfile.Profile()
+            profile.enable()
+        stack.append(name)
+
+    def stage_finished(self, name):
+        if not self._in_main_thread():
+            return
+        stack = self._main_stack
+        if not stack or stack[-1] != name:
+            return
+        stack.pop()
+        if self.deterministic:
+            self.profiles[name].disable()
+            if stack:
+                self.profiles[stack[-1]].enable()
+
+    def document_finished(self, doc_id, timings):
+        if not self._in_main_thread():
+            return
+        self._sequence += 1
+        entry = (timings.get("total", 0.0), self._sequence, doc_id, dict(timings))
+        if len(self.slowest) < self.top_n:
+            heapq.heappush(self.slowest, entry)
+        else:
+            heapq.heappushpop(self.slowest, entry)
+
+    # ------------ SAMPLING ----------------
+    def _on_sample(self, signum, frame):
+        labels = []
+        while frame is not None:
+            labels.append(_frame_label(frame.f_code))
+            frame = frame.f_back
+        labels.reverse()
+        stage = ";".join(self._main_stack) or "(no stage)"
+        self.samples[(stage, *labels)] += 1
+
+    def start(self):
+        """Enable metrics and begin profiling."""
+        if not self._in_main_thread():
+            raise RuntimeError("StageProfiler must be started from the main thread")
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        METRICS.enable()
+        METRICS.add_listener(self)
+        if self.sampling:
+            self._previous_handler = signal.signal(signal.SIGPROF, self._on_sample)
+            signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+
+    def stop(self):
+        """Stop profiling and write all output files."""
+        if self.sampling:
+            signal.setitimer(signal.ITIMER_PROF, 0, 0)
+            signal.signal(signal.SIGPROF, self._previous_handler)
+        METRICS.remove_listener(self)
+        for profile in self.profiles.values():
+            profile.disable()
+        self.write()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+    # ------------ OUTPUT ----------------
+    def slowest_documents(self):
+        """Return the slowest documents, slowest first, with stage breakdowns."""
+        return [
+            {"document": doc_id, "total_ms": total, "stages": timings}
+            for total, _, doc_id, timings in sorted(self.slowest, reverse=True)
+        ]
+
+    def write(self):
+        """Write .pstats per stage, collapsed stacks and the slowest-documents report."""
+        for stage, profile in self.profiles.items():
+            profile.dump_stats(self.output_dir / f"{_safe_name(stage)}.pstats")
+
+        if self.samples:
+            with open(self.output_dir / "stacks.collapsed", "w") as f:
+                for (stage, *frames), count in self.samples.most_common():
+                    f.write(";".join([stage, *frames]) + f" {count}\n")
+
+        with open(self.output_dir / "slowest_documents.json", "w") as f:
+            json.dump(self.slowest_documents(), f, indent=2)
+
+        print(f"✅ Profiles saved to {self.output_dir}")
+
+    def print_report(self, limit=10):
+        """Print the hottest functions per stage and the slowest documents."""
+        for stage in sorted(self.profiles):
+            path = self.output_dir / f"{_safe_name(stage)}.pstats"
+            if not path.exists():
+                continue
+            print(f"\n=== {stage} ===")
+            pstats.Stats(str(path)).sort_stats("cumulative").print_stats(limit)
+
+        print("\nSlowest documents:")
+        for doc in self.slowest_documents():
+            stages = ", ".join(
+                f"{name} {ms:.1f}ms" for name, ms in sorted(
+                    doc["stages"].items(), key=lambda item: item[1], reverse=True
+                ) if name != "total"
+            )
+            print(f"  {doc['total_ms']:.1f}ms  {doc['document']}")
+            print(f"    {stages}")
@@ -1,118 +1,131 @@
 # resume_job_matcher.py
 
 import pandas as pd
-import numpy as np
-from sklearn.feature_extraction.text import CountVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from skill_table import build_skill_profile, read_skill_table, write_skill_table
+from text_features import cosine_from_counts
+from instrumentation import timed
 
 def load_data(resume_skills_path, job_skills_path):
     """
     Load resume skills and job skills data.
     
     Args:
-        resume_skills_path (str): Path to resume skills CSV
-        job_skills_path (str): Path to job skills CSV
+        resume_skills_path (str): Path to resume skills table (.parquet or .csv)
+        job_skills_path (str): Path to job skills table (.parquet or .csv)
         
     Returns:
         tuple: (resume_df, job_df)
     """
-    resume_df = pd.read_csv(resume_skills_path)
-    job_df = pd.read_csv(job_skills_path)
+    resume_df = read_skill_table(resume_skills_path)
+    job_df = read_skill_table(job_skills_path)
     return resume_df, job_df
 
+def _as_profile(skills):
+    """Return a skill profile, building one if a raw value was given."""
+    if isinstance(skills, dict) and 'skill_set' in skills:
+        return skills
+    return build_skill_profile(skills)
+
 def calculate_skill_match(resume_skills, job_skills):
     """
     Calculate skill match score between resume and job.
     
     Args:
-        resume_skills (str): Comma-separated skills from resume
-        job_skills (str): Comma-separated skills from job
+        resume_skills: Resume skills (list, skill profile or comma-separated string)
+        job_skills: Job skills (list, skill profile or comma-separated string)
         
     Returns:
         float: Match score (0-1)
     """
-    if not resume_skills or not job_skills:
+    resume_profile = _as_profile(resume_skills)
+    job_profile = _as_profile(job_skills)
+    if not resume_profile['skills'] or not job_profile['skills']:
         return 0.0
     
-    # Convert comma-separated strings to lists
-    resume_skill_list = [skill.strip().lower() for skill in resume_skills.split(',')]
-    job_skill_list = [skill.strip().lower() for skill in job_skills.split(',')]
-    
     # Count matching skills
-    matching_skills = set(resume_skill_list).intersection(set(job_skill_list))
+    matching_skills = resume_profile['skill_set'] & job_profile['skill_set']
     
     # Calculate match percentage based on job requirements
-    match_score = len(matching_skills) / len(job_skill_list) if job_skill_list else 0
-    
-    return match_score
+    return len(matching_skills) / len(job_profile['skills'])
 
 def calculate_similarity_score(resume_skills, job_skills):
     """
     Calculate similarity score using cosine similarity.
     
     Args:
-        resume_skills (str): Comma-separated skills from resume
-        job_skills (str): Comma-separated skills from job
+        resume_skills: Resume skills (list, skill profile or comma-separated string)
+        job_skills: Job skills (list, skill profile or comma-separated string)
         
     Returns:
         float: Similarity score (0-1)
     """
-    if not resume_skills or not job_skills:
-        return 0.0
-    
-    # Create a vectorizer
-    vectorizer = CountVectorizer()
-    
-    # Combine skills into documents
-    documents = [resume_skills, job_skills]
-    
-    # Create the document-term matrix
-    try:
-        count_matrix = vectorizer.fit_transform(documents)
-        
-        # Calculate cosine similarity
-        similarity = cosine_similarity(count_matrix)[0][1]
-        return similarity
-    except:
-        return 0.0
+    resume_profile = _as_profile(resume_skills)
+    job_profile = _as_profile(job_skills)
+    
+    # Token counts are precomputed per profile, so no vectorizer is fitted per pair
+    return cosine_from_counts(
+        resume_profile['terms'], resume_profile['norm'],
+        job_profile['terms'], job_profile['norm']
+    )
 
-def rank_candidates(resume_df, job_df):
+@timed("matching.rank_candidates")
+def rank_candidates(resume_df, job_df, workers=1, top_k=None, prune=False):
     """
     Rank candidates for each job based on skill matching.
     
     Args:
         resume_df (pd.DataFrame): DataFrame with resume skills
         job_df (pd.DataFrame): DataFrame with job skills
+        workers (int): Worker processes; above 1, scoring is sharded over a
+            shared-memory feature matrix (see shared_scoring)
+        top_k (int): Candidates kept per job (all if None)
+        prune (bool): Skip candidates whose score upper bound cannot reach
+            the top_k (see top_k_pruning); same results, requires top_k
         
     Returns:
         pd.DataFrame: DataFrame with rankings
     """
+    if prune:
+        if not top_k:
+            raise ValueError("Pruned ranking needs top_k")
+        if workers > 1:
+            raise ValueError("Pruned ranking runs in one process; use workers=1")
+        from top_k_pruning import rank_candidates_pruned
+        return rank_candidates_pruned(resume_df, job_df, top_k)
+    
+    if workers > 1:
+        from shared_scoring import rank_candidates_shared
+        return rank_candidates_shared(resume_df, job_df, workers=workers, top_k=top_k)
+    
     results = []
     
-    for _, job_row in job_df.iterrows():
-        job_id = job_row['Job_ID']
-        job_skills = job_row['Skills']
-        
+    # Parse each side's skills once, up front
+    resume_profiles = [
+        (candidate_id, build_skill_profile(skills))
+        for candidate_id, skills in zip(resume_df['Candidate_ID'], resume_df['Skills'])
+    ]
+    job_profiles = [
+        (job_id, build_skill_profile(skills))
+        for job_id, skills in zip(job_df['Job_ID'], job_df['Skills'])
+    ]
+    
+    for job_id, job_profile in job_profiles:
         job_rankings = []
         
-        for _, resume_row in resume_df.iterrows():
-            candidate_id = resume_row['Candidate_ID']
-            resume_skills = resume_row['Skills']
-            
+        for candidate_id, resume_profile in resume_profiles:
             # Calculate match score
-            match_score = calculate_skill_match(resume_skills, job_skills)
+            match_score = calculate_skill_match(resume_profile, job_profile)
             
             # Calculate similarity score
-            similarity_score = calculate_similarity_score(resume_skills, job_skills)
+            similarity_score = calculate_similarity_score(resume_profile, job_profile)
             
             # Calculate weighted final score (can adjust weights as needed)
             final_score = 0.7 * match_score + 0.3 * similarity_score
             
             # Get matching skills
-            resume_skill_list = [skill.strip().lower() for skill in resume_skills.split(',')]
-            job_skill_list = [skill.strip().lower() for skill in job_skills.split(',')]
-            matching_skills = set(resume_skill_list).intersection(set(job_skill_list))
-            missing_skills = set(job_skill_list) - set(resume_skill_list)
+            resume_skill_set = resume_profile['skill_set']
+            matching_skills = [s for s in job_profile['skills'] if s in resume_skill_set]
+            missing_skills = [s for s in job_profile['skills'] if s not in resume_skill_set]
             
             job_rankings.append({
                 'Job_ID': job_id,
@@ -120,15 +133,15 @@ def rank_candidates(resume_df, job_df):
                 'Match_Score': match_score,
                 'Similarity_Score': similarity_score,
                 'Final_Score': final_score,
-                'Matching_Skills': ','.join(matching_skills),
-                'Missing_Skills': ','.join(missing_skills)
+                'Matching_Skills': matching_skills,
+                'Missing_Skills': missing_skills
             })
         
         # Sort candidates by final score for this job
         job_rankings.sort(key=lambda x: x['Final_Score'], reverse=True)
         
         # Add rank
-        for i, ranking in enumerate(job_rankings):
+        for i, ranking in enumerate(job_rankings[:top_k]):
             ranking['Rank'] = i + 1
             results.append(ranking)
     
@@ -139,9 +152,9 @@ def main(resume_skills_path, job_skills_path, output_path):
     Main function to rank candidates for jobs.
     
     Args:
-        resume_skills_path (str): Path to resume skills CSV
-        job_skills_path (str): Path to job skills CSV
-        output_path (str): Path to save rankings
+        resume_skills_path (str): Path to resume skills table
+        job_skills_path (str): Path to job skills table
+        output_path (str): Path to save rankings (.parquet or .csv)
     """
     # Load data
     resume_df, job_df = load_data(resume_skills_path, job_skills_path)
@@ -150,13 +163,13 @@ def main(resume_skills_path, job_skills_path, output_path):
     rankings_df = rank_candidates(resume_df, job_df)
     
     # Save rankings
-    rankings_df.to_csv(output_path, index=False)
+    write_skill_table(rankings_df, output_path)
     print(f"✅ Candidate rankings saved to {output_path}")
 
 if __name__ == "__main__":
     # Example usage
-    resume_skills_path = "extracted_resume_skills.csv"
-    job_skills_path = "extracted_job_skills.csv"
-    output_path = "candidate_rankings.csv"
+    resume_skills_path = "extracted_resume_skills.parquet"
+    job_skills_path = "extracted_job_skills.parquet"
+    output_path = "candidate_rankings.parquet"
     
     main(resume_skills_path, job_skills_path, output_path)
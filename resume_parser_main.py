@@ -1,9 +1,5 @@
 import json
-from entity_extractor import (
-    extract_name, extract_email, extract_phone,
-    extract_skills, extract_github_url, extract_linkedin_url,
-    extract_education, extract_projects
-)
+from entity_extractor import scan_entities
 
 from PyPDF2 import PdfReader
 
@@ -19,15 +15,7 @@ if __name__ == "__main__":
     path = r"data/kunalResume.pdf"  # Replace with your resume file path
     resume_text = extract_text_from_pdf(path)
 
-    extracted_data = {
-    "name": extract_name(resume_text),
-    "email": extract_email(resume_text),
-    "phone": extract_phone(resume_text),
-    "skills": extract_skills(resume_text),
-    "github": extract_github_url(resume_text),
-    "linkedin": extract_linkedin_url(resume_text),
-    "education": extract_education(resume_text)
-}
+    extracted_data = scan_entities(resume_text)
 
 
     with open("output.txt", "w") as f:
@@ -1,35 +1,69 @@
+import hashlib
 import json
 import os
 import re
+from array import array
+from contextlib import nullcontext
 from pathlib import Path
 import pandas as pd
 import numpy as np
-from sklearn.feature_extraction.text import CountVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+from text_features import term_counts, vector_norm, cosine_from_counts
 
 # Import from your existing entity extractor
-from entity_extractor import (
-    extract_name, extract_email, extract_phone,
-    extract_skills, extract_github_url, extract_linkedin_url,
-    extract_education, extract_projects
-)
+from entity_extractor import scan_entities
+from experience_extractor import experience_months
+from fuzzy_skills import fuzzy_index_for
 
 from PyPDF2 import PdfReader
+from document_limits import LIMITS, DocumentRejected
+from instrumentation import METRICS, timed, peak_rss_mb
+from near_duplicates import NearDuplicateIndex
+from resume_record import ResumeRecord, SKILL_VOCABULARY
+from score_cache import ScoreCache, content_hash, job_score_key
+from skill_filter import CandidateBitmapIndex
+
+# Part of every score cache key; bump it whenever skill extraction or the
+# skill/semantic scoring changes so cached scores are not reused
+SCORER_VERSION = "3"
 
 def extract_text_from_pdf(file_path):
-    """Extract text content from a PDF file."""
-    text = ''
+    """
+    Extract text content from a PDF file (a path or a binary file object).
+    
+    Bounded by document_limits.LIMITS: pages past the page limit are not
+    read, reading stops once the character limit is reached, and a file
+    that is too large or takes too long raises DocumentRejected.
+    """
+    doc_id = None if hasattr(file_path, 'read') else file_path
+    pages_text = []
+    length = 0
     try:
-        with open(file_path, 'rb') as f:
-            reader = PdfReader(f)
-            for page in reader.pages:
-                text += page.extract_text()
+        LIMITS.check_bytes(file_path, doc_id)
+        with LIMITS.deadline(doc_id):
+            with nullcontext(file_path) if hasattr(file_path, 'read') else open(file_path, 'rb') as f:
+                pages = PdfReader(f).pages
+                for index in range(LIMITS.page_limit(len(pages))):
+                    # Checked between pages for threads, where the alarm cannot interrupt
+                    LIMITS.check_time(doc_id)
+                    page_text = pages[index].extract_text()
+                    pages_text.append(page_text)
+                    length += len(page_text)
+                    if LIMITS.max_chars and length >= LIMITS.max_chars:
+                        break
+    except DocumentRejected:
+        raise
     except Exception as e:
         print(f"Error extracting text from {file_path}: {e}")
-    return text
+    return LIMITS.truncate(''.join(pages_text))
 
-def extract_skills_from_job_description(job_description_text):
-    """Extract skills from job description using similar methods as resume skills extraction."""
+def extract_skills_from_job_description(job_description_text, fuzzy=True):
+    """
+    Extract skills from job description using similar methods as resume skills extraction.
+
+    With `fuzzy`, misspelled skills ("Javscript", "Kubernets") are matched
+    too, through the fuzzy_skills deletion index of the skill list.
+    """
     # This should use the same skill extraction logic as in entity_extractor.py
     # For demonstration, I'll use a simple implementation
     # In production, this should match your extract_skills function
@@ -44,9 +78,12 @@ def extract_skills_from_job_description(job_description_text):
         common_skills = ["python", "java", "javascript", "sql"]
     
     # Extract skills using regex pattern matching
+    text = job_description_text.lower()
+    if fuzzy:
+        text = fuzzy_index_for(tuple(common_skills)).normalize(text)
     skills = []
     for skill in common_skills:
-        if re.search(r'\b' + re.escape(skill) + r'\b', job_description_text.lower()):
+        if re.search(r'\b' + re.escape(skill) + r'\b', text):
             skills.append(skill)
     
     # You can enhance this with more sophisticated extraction methods
@@ -74,88 +111,322 @@ def calculate_semantic_similarity(resume_text, job_description_text):
     if not resume_text or not job_description_text:
         return 0.0
     
-    # Create a vectorizer
-    vectorizer = CountVectorizer(stop_words='english')
+    # Same result as CountVectorizer(stop_words='english') + cosine_similarity,
+    # without fitting a vectorizer for every pair
+    resume_terms = term_counts(resume_text, ENGLISH_STOP_WORDS)
+    job_terms = term_counts(job_description_text, ENGLISH_STOP_WORDS)
+    similarity = cosine_from_counts(
+        resume_terms, vector_norm(resume_terms), job_terms, vector_norm(job_terms)
+    )
+    return similarity * 100  # Return as percentage
+
+def build_job_profile(job_description_text):
+    """Precompute the job skills and term vector used to score every resume."""
+    job_terms = term_counts(job_description_text, ENGLISH_STOP_WORDS)
+    return {
+        "hash": hashlib.sha1(job_description_text.encode("utf-8")).hexdigest(),
+        "skills": extract_skills_from_job_description(job_description_text),
+        "terms": job_terms,
+        "norm": vector_norm(job_terms)
+    }
+
+def compact_resume(resume_data, job_profile):
+    """
+    Replace a parsed resume's full text with compact features for one job.
     
-    try:
-        # Create the document-term matrix
-        count_matrix = vectorizer.fit_transform([resume_text, job_description_text])
+    Keeps only the counts of terms that also occur in the job description
+    plus the norm of the whole resume vector, which is all the cosine
+    similarity needs. The record is modified in place.
+    
+    Args:
+        resume_data (ResumeRecord): Output of process_resume / process_resume_text
+        job_profile (dict): Output of build_job_profile
         
-        # Calculate cosine similarity
-        similarity = cosine_similarity(count_matrix)[0][1]
-        return similarity * 100  # Return as percentage
-    except Exception as e:
-        print(f"Error calculating similarity: {e}")
-        return 0.0
-
-def process_resume(file_path):
-    """Process a single resume and extract relevant information."""
-    resume_text = extract_text_from_pdf(file_path)
-    
-    # Extract data using your existing functions
-    extracted_data = {
-        "name": extract_name(resume_text),
-        "email": extract_email(resume_text),
-        "phone": extract_phone(resume_text),
-        "skills": extract_skills(resume_text),
-        "github": extract_github_url(resume_text),
-        "linkedin": extract_linkedin_url(resume_text),
-        "education": extract_education(resume_text),
-        "full_text": resume_text  # Store full text for semantic similarity
+    Returns:
+        ResumeRecord: The same record, without full text
+    """
+    if resume_data.duplicate_of is not None:
+        # Duplicates hold no features of their own; they reuse the canonical copy's
+        return resume_data
+    resume_terms = term_counts(resume_data.full_text or "", ENGLISH_STOP_WORDS)
+    resume_data.full_text = None
+    job_terms = job_profile["terms"]
+    resume_data.text_features = {
+        "job_hash": job_profile["hash"],
+        "terms": {term: count for term, count in resume_terms.items() if term in job_terms},
+        "norm": vector_norm(resume_terms)
     }
+    return resume_data
+
+def _semantic_score(resume_data, job_profile):
+    """Semantic similarity from either the full text or compact features."""
+    features = resume_data.text_features
+    if features is None:
+        resume_terms = term_counts(resume_data.full_text or "", ENGLISH_STOP_WORDS)
+        features = {"terms": resume_terms, "norm": vector_norm(resume_terms)}
+    elif features["job_hash"] != job_profile["hash"]:
+        raise ValueError("Resume features were computed for a different job description")
+    
+    return cosine_from_counts(
+        features["terms"], features["norm"], job_profile["terms"], job_profile["norm"]
+    ) * 100
+
+def _run_stage(stage_name, fn, *args):
+    """Call fn(*args) timed as one instrumentation stage."""
+    with METRICS.stage(stage_name):
+        return fn(*args)
+
+def process_resume(file_path, dedup_index=None):
+    """
+    Process a single resume and extract relevant information.
     
+    Raises:
+        DocumentRejected: If the resume exceeds a document_limits limit
+    """
+    with METRICS.document(file_path) as stage_timings, LIMITS.deadline(file_path):
+        resume_text = _run_stage("pdf_extraction", extract_text_from_pdf, file_path)
+        extracted_data = process_resume_text(resume_text, file_path, dedup_index)
+    
+    # Per-document stage timings are only collected while metrics are enabled
+    if stage_timings is not None:
+        extracted_data.stage_timings = stage_timings
     return extracted_data
 
-def rank_resumes(resumes_data, job_description_text):
-    """Rank resumes based on their match with the job description."""
-    # Extract skills from job description
-    job_skills = extract_skills_from_job_description(job_description_text)
+def process_resume_text(resume_text, doc_id=None, dedup_index=None):
+    """
+    Extract relevant information from already-extracted resume text.
+    
+    With a NearDuplicateIndex, a near-duplicate of a resume seen earlier is
+    not parsed again: its record only names the canonical copy
+    (duplicate_of), and rank_resumes reuses that copy's record and scores.
+    
+    Returns:
+        ResumeRecord: Parsed resume (use to_dict() for the plain dict form)
+    """
+    if dedup_index is not None and doc_id is not None:
+        canonical = _run_stage("near_duplicates", dedup_index.add, doc_id, resume_text)
+        if canonical is not None:
+            METRICS.count("near_duplicates_total")
+            return ResumeRecord(duplicate_of=canonical)
+    
+    # All entity fields come from one scan that shares the normalized text views
+    entities = _run_stage("entities", scan_entities, resume_text)
+    return ResumeRecord(
+        **entities,
+        # Numeric feature, so ranking never has to re-parse dates from the text
+        experience_months=_run_stage("experience_months", experience_months, resume_text),
+        full_text=resume_text,  # Store full text for semantic similarity
+        # Identity of the resume in the score cache, kept after the text is dropped
+        content_hash=content_hash(resume_text)
+    )
+
+def _skill_match_score(skill_ids, job_skill_ids, job_skill_count):
+    """calculate_skill_match_score on vocabulary IDs."""
+    if not skill_ids or not job_skill_count:
+        return 0.0
+    matching = SKILL_VOCABULARY.lower_set(skill_ids) & job_skill_ids
+    return len(matching) / job_skill_count * 100
+
+def score_cache_key(resume_data, job_key):
+    """Score cache key of a resume for a job (see score_cache.job_score_key), or None without a content hash."""
+    if resume_data.content_hash is None:
+        return None
+    return (resume_data.content_hash, job_key, SCORER_VERSION)
+
+def score_resume(resume_data, job_profile, job_skill_ids=None):
+    """
+    Score one parsed resume against a job profile.
     
-    # Calculate scores for each resume
-    ranked_resumes = []
-    for resume_path, resume_data in resumes_data.items():
-        # Calculate skill match score (50% weight)
-        skill_match = calculate_skill_match_score(resume_data["skills"], job_skills)
+    Args:
+        resume_data (ResumeRecord): Parsed resume (full text or compact features)
+        job_profile (dict): Output of build_job_profile
+        job_skill_ids (set): Lowercased job skill IDs, if already computed
         
-        # Calculate semantic similarity score (50% weight)
-        semantic_score = calculate_semantic_similarity(resume_data["full_text"], job_description_text)
-        
-        # Calculate final score (weighted average)
-        final_score = (skill_match * 0.5) + (semantic_score * 0.5)
-        
-        # Get resume file name without path
-        resume_name = os.path.basename(resume_path)
+    Returns:
+        tuple: (skill match score, semantic score), both 0-100
+    """
+    job_skills = job_profile["skills"]
+    if job_skill_ids is None:
+        job_skill_ids = {SKILL_VOCABULARY.intern(skill.lower()) for skill in job_skills}
+    # Calculate skill match score (50% weight)
+    skill_score = _run_stage(
+        "ranking.skill_match", _skill_match_score, resume_data.skill_ids, job_skill_ids, len(job_skills)
+    )
+    # Calculate semantic similarity score (50% weight)
+    semantic_score = _run_stage(
+        "ranking.semantic_similarity", _semantic_score, resume_data, job_profile
+    )
+    return skill_score, semantic_score
+
+def _filter_candidates(records, paths, scored_paths, candidate_filter):
+    """Keep the candidates (by their scored record) that match a filter query."""
+    index = CandidateBitmapIndex.from_records(records[scored_path] for scored_path in scored_paths)
+    keep = index.filter(candidate_filter)
+    METRICS.count("candidates_filtered_out_total", len(paths) - len(keep))
+    return [paths[i] for i in keep], [scored_paths[i] for i in keep]
+
+@timed("ranking")
+def rank_resumes(resumes_data, job_description_text, job_profile=None, score_cache=None,
+                 candidate_filter=None):
+    """
+    Rank resumes based on their match with the job description.
+    
+    Scores are kept in arrays indexed by candidate; the per-candidate result
+    dicts are only built for the final, sorted output.
+    
+    Args:
+        resumes_data (dict): Resume path -> ResumeRecord (plain dicts are accepted too)
+        job_description_text (str): Job description
+        job_profile (dict): Precomputed build_job_profile output
+        score_cache (ScoreCache): Optional cache; only pairs it does not
+            hold are scored
+        candidate_filter (str): Optional boolean filter on skills, education
+            and experience (see skill_filter.parse_filter); candidates
+            failing it are dropped before scoring
         
+    Returns:
+        list: Ranked result dicts, best first
+    """
+    # Extract skills and terms from job description once
+    if job_profile is None:
+        job_profile = _run_stage("ranking.job_profile", build_job_profile, job_description_text)
+    job_skills = job_profile["skills"]
+    job_skill_ids = {SKILL_VOCABULARY.intern(skill.lower()) for skill in job_skills}
+    
+    records = {
+        path: ResumeRecord.from_dict(data) if isinstance(data, dict) else data
+        for path, data in resumes_data.items()
+    }
+    
+    # Resolve near-duplicates to their canonical copy
+    paths, scored_paths = [], []
+    skipped = 0
+    for resume_path, resume_data in records.items():
+        scored_path = resume_data.duplicate_of or resume_path
+        if scored_path not in records:
+            # The canonical copy failed to parse, so there is nothing to reuse
+            skipped += 1
+            continue
+        paths.append(resume_path)
+        scored_paths.append(scored_path)
+    
+    if candidate_filter:
+        paths, scored_paths = _run_stage(
+            "ranking.filter", _filter_candidates, records, paths, scored_paths, candidate_filter
+        )
+    
+    # Calculate scores once per canonical resume
+    job_key = job_score_key(job_profile) if score_cache is not None else None
+    canonical_index = {}
+    skill_scores = array("d")
+    semantic_scores = array("d")
+    for scored_path in scored_paths:
+        if scored_path in canonical_index:
+            continue
+        canonical_index[scored_path] = len(skill_scores)
+        resume_data = records[scored_path]
+        cache_key = score_cache_key(resume_data, job_key) if score_cache is not None else None
+        scores = None
+        if cache_key is not None:
+            scores = score_cache.get(cache_key)
+            METRICS.count("score_cache_hits_total" if scores is not None else "score_cache_misses_total")
+        if scores is None:
+            scores = score_resume(resume_data, job_profile, job_skill_ids)
+            if cache_key is not None:
+                score_cache.put(cache_key, scores)
+        skill_scores.append(scores[0])
+        semantic_scores.append(scores[1])
+    if score_cache is not None:
+        score_cache.flush()
+    
+    # Calculate final score (weighted average) for every candidate
+    rows = np.fromiter((canonical_index[path] for path in scored_paths), dtype=np.intp, count=len(scored_paths))
+    skill_match = np.frombuffer(skill_scores, dtype=np.float64)[rows] if rows.size else np.zeros(0)
+    semantic = np.frombuffer(semantic_scores, dtype=np.float64)[rows] if rows.size else np.zeros(0)
+    final_scores = (skill_match * 0.5) + (semantic * 0.5)
+    
+    # Sort resumes by final score (descending); ties keep their input order
+    order = np.argsort(-final_scores, kind="stable")
+    
+    job_skill_pairs = [
+        (skill, SKILL_VOCABULARY.intern(skill)) for skill in dict.fromkeys(s.lower() for s in job_skills)
+    ]
+    ranked_resumes = []
+    for rank, i in enumerate(order, 1):
+        resume_path, scored_path = paths[i], scored_paths[i]
+        resume_data = records[scored_path]
+        resume_skill_ids = SKILL_VOCABULARY.lower_set(resume_data.skill_ids)
+        matching = [skill for skill, skill_id in job_skill_pairs if skill_id in resume_skill_ids]
         ranked_resumes.append({
-            "resume_name": resume_name,
-            "candidate_name": resume_data["name"],
-            "skills": resume_data["skills"],
-            "matching_skills": list(set([skill.lower() for skill in resume_data["skills"]]).intersection(
-                               set([skill.lower() for skill in job_skills]))),
-            "missing_skills": list(set([skill.lower() for skill in job_skills]) - 
-                               set([skill.lower() for skill in resume_data["skills"]])),
-            "skill_match_score": skill_match,
-            "semantic_score": semantic_score,
-            "final_score": final_score,
+            # Get resume file name without path
+            "resume_name": os.path.basename(resume_path),
+            "candidate_name": resume_data.name,
+            "skills": resume_data.skills,
+            "matching_skills": matching,
+            "missing_skills": [
+                skill for skill, skill_id in job_skill_pairs if skill_id not in resume_skill_ids
+            ],
+            "skill_match_score": float(skill_match[i]),
+            "semantic_score": float(semantic[i]),
+            "final_score": float(final_scores[i]),
             "resume_path": resume_path,
             "contact": {
-                "email": resume_data["email"],
-                "phone": resume_data["phone"],
-                "github": resume_data["github"],
-                "linkedin": resume_data["linkedin"]
+                "email": resume_data.email,
+                "phone": resume_data.phone,
+                "github": resume_data.github,
+                "linkedin": resume_data.linkedin
             },
-            "education": resume_data["education"]
+            "education": resume_data.education,
+            "experience_months": resume_data.experience_months,
+            "duplicate_of": scored_path if scored_path != resume_path else None
         })
+        stage_timings = records[resume_path].stage_timings
+        if stage_timings is not None:
+            ranked_resumes[-1]["stage_timings"] = stage_timings
+        # Add rank
+        ranked_resumes[-1]["rank"] = rank
     
-    # Sort resumes by final score (descending)
-    ranked_resumes.sort(key=lambda x: x["final_score"], reverse=True)
-    
-    # Add rank
-    for i, resume in enumerate(ranked_resumes):
-        resume["rank"] = i + 1
+    if skipped:
+        print(f"Warning: {skipped} duplicates skipped because their canonical resume is missing")
+    METRICS.count("candidates_ranked_total", len(ranked_resumes))
     
     return ranked_resumes
-def generate_html_report(ranked_resumes):
+
+def rank_resumes_streaming(resume_paths, job_description_text, process_fn=process_resume,
+                           score_cache=None, failures=None):
+    """
+    Rank resumes while holding only compact features in memory.
+    
+    Each resume is reduced to compact features right after extraction, so
+    peak memory no longer grows with the total size of the corpus text.
+    
+    Args:
+        resume_paths (iterable): Resume file paths
+        job_description_text (str): Job description
+        process_fn (callable): Function parsing one path into a resume record
+        score_cache (ScoreCache): Optional score cache passed to rank_resumes
+        failures (dict): Optional dict filled with resume path -> error for
+            resumes rejected by the document limits, which are left out
+        
+    Returns:
+        list: Ranked resumes, as returned by rank_resumes
+    """
+    job_profile = build_job_profile(job_description_text)
+    resumes_data = {}
+    for resume_path in resume_paths:
+        try:
+            resume_data = process_fn(resume_path)
+        except DocumentRejected as e:
+            if failures is None:
+                raise
+            failures[resume_path] = e
+            continue
+        resumes_data[resume_path] = compact_resume(resume_data, job_profile)
+    return rank_resumes(
+        resumes_data, job_description_text, job_profile=job_profile, score_cache=score_cache
+    )
+
+def generate_html_report(ranked_resumes, output_path="resume_ranking_report.html"):
     """Generate an HTML report for the ranked resumes."""
     html = """
     <!DOCTYPE html>
@@ -280,12 +551,34 @@ def generate_html_report(ranked_resumes):
     """
     
     # Save HTML report
-    with open("resume_ranking_report.html", "w") as f:
+    with open(output_path, "w") as f:
         f.write(html)
     
-    print(f"✅ HTML report saved to resume_ranking_report.html")
+    print(f"✅ HTML report saved to {output_path}")
 
-def main():
+def write_summary_csv(ranked_resumes, output_path="resume_ranking_summary.csv"):
+    """Save a one-row-per-candidate summary of the ranking to CSV."""
+    # Create a summary DataFrame for easy viewing
+    summary_df = pd.DataFrame([
+        {
+            "Rank": r["rank"],
+            "Name": r["candidate_name"],
+            "Resume": r["resume_name"],
+            "Score": f"{r['final_score']:.2f}%",
+            "Skill Match": f"{r['skill_match_score']:.2f}%",
+            "Semantic Match": f"{r['semantic_score']:.2f}%",
+            "Experience (months)": r.get("experience_months"),
+            "Matching Skills Count": len(r["matching_skills"]),
+            "Missing Skills Count": len(r["missing_skills"])
+        }
+        for r in ranked_resumes
+    ])
+    
+    # Save summary to CSV
+    summary_df.to_csv(output_path, index=False)
+    print(f"✅ Summary saved to {output_path}")
+
+def main(streaming=False, dedupe=False, score_cache_path=None):
     # Path to job description file
     job_description_path = "data/job_description.txt"
     
@@ -309,14 +602,39 @@ def main():
         return
     
     print(f"Processing {len(resume_files)} resumes...")
+    # Near-duplicate resumes reuse the record and scores of the first copy seen
+    dedup_index = NearDuplicateIndex() if dedupe else None
+    # Scores of unchanged resume/job pairs are reused from earlier runs
+    score_cache = ScoreCache(path=score_cache_path) if score_cache_path else None
+    # Resumes over the per-document limits are skipped and reported with the reason
+    failures = {}
     
-    for resume_file in resume_files:
-        resume_path = os.path.join(resumes_dir, resume_file)
-        print(f"Processing {resume_file}...")
-        resumes_data[resume_path] = process_resume(resume_path)
+    if streaming:
+        # Rank from compact features; resume text is dropped after extraction
+        resume_paths = [os.path.join(resumes_dir, f) for f in resume_files]
+        ranked_resumes = rank_resumes_streaming(
+            resume_paths, job_description_text,
+            process_fn=lambda path: process_resume(path, dedup_index),
+            score_cache=score_cache, failures=failures
+        )
+    else:
+        for resume_file in resume_files:
+            resume_path = os.path.join(resumes_dir, resume_file)
+            print(f"Processing {resume_file}...")
+            try:
+                resumes_data[resume_path] = process_resume(resume_path, dedup_index)
+            except DocumentRejected as e:
+                failures[resume_path] = e
+        
+        # Rank resumes
+        ranked_resumes = rank_resumes(resumes_data, job_description_text, score_cache=score_cache)
+    if score_cache is not None:
+        score_cache.close()
     
-    # Rank resumes
-    ranked_resumes = rank_resumes(resumes_data, job_description_text)
+    if failures:
+        print(f"Warning: {len(failures)} resumes were rejected")
+        for resume_path, error in failures.items():
+            print(f"   {resume_path}: {error}")
     
     # Save results to JSON
     output_path = "ranked_resumes.json"
@@ -335,24 +653,33 @@ def main():
         print(f"   Missing Skills: {', '.join(resume['missing_skills'])}")
         print()
     
-    # Create a summary DataFrame for easy viewing
-    summary_df = pd.DataFrame([
-        {
-            "Rank": r["rank"],
-            "Name": r["candidate_name"],
-            "Resume": r["resume_name"],
-            "Score": f"{r['final_score']:.2f}%",
-            "Skill Match": f"{r['skill_match_score']:.2f}%",
-            "Semantic Match": f"{r['semantic_score']:.2f}%",
-            "Matching Skills Count": len(r["matching_skills"]),
-            "Missing Skills Count": len(r["missing_skills"])
-        }
-        for r in ranked_resumes
-    ])
-    
-    # Save summary to CSV
-    summary_df.to_csv("resume_ranking_summary.csv", index=False)
-    print(f"✅ Summary saved to resume_ranking_summary.csv")
+    write_summary_csv(ranked_resumes)
+    print(f"Peak memory: {peak_rss_mb()} MB")
 
 if __name__ == "__main__":
-    main()
+    import argparse
+    from document_limits import add_limit_arguments, configure_limits
+    from profiling import PROFILE_MODES, StageProfiler
+    
+    parser = argparse.ArgumentParser(description="Rank the resumes in data/resumes")
+    parser.add_argument("--profile", default=None, metavar="DIR",
+                        help="Profile each stage and write .pstats/collapsed stacks to DIR")
+    parser.add_argument("--profile-mode", choices=PROFILE_MODES, default="both")
+    parser.add_argument("--profile-top", type=int, default=10, help="Slowest documents to report")
+    parser.add_argument("--streaming", action="store_true",
+                        help="Rank from compact features instead of keeping every resume's text")
+    parser.add_argument("--dedupe", action="store_true",
+                        help="Parse and score near-duplicate resumes only once")
+    parser.add_argument("--score-cache", default=None, metavar="DB",
+                        help="SQLite file caching scores of resume/job pairs across runs")
+    add_limit_arguments(parser)
+    args = parser.parse_args()
+    configure_limits(args)
+    
+    if args.profile:
+        profiler = StageProfiler(args.profile, args.profile_mode, top_n=args.profile_top)
+        with profiler:
+            main(streaming=args.streaming, dedupe=args.dedupe, score_cache_path=args.score_cache)
+        profiler.print_report()
+    else:
+        main(streaming=args.streaming, dedupe=args.dedupe, score_cache_path=args.score_cache)
@@ -0,0 +1,146 @@
+# resume_record.py
+
+import sys
+import threading
+from array import array
+
+class SkillVocabulary:
+    def __init__(self):
+        """
+        Process-wide table mapping skill strings to small integer IDs.
+
+        Each distinct skill string is stored once (and interned); records hold
+        only an array of IDs. Every ID also maps to the ID of its lowercased
+        form, so case-insensitive matching is a set intersection of integers.
+        Lookups are lock-free; adding a skill takes a lock, so records built
+        in several threads (e.g. thread stages) never share an ID.
+        """
+        self.skills = []
+        self.ids = {}
+        self.lower_ids = array("I")
+        self._lock = threading.RLock()
+
+    def intern(self, skill):
+        """Return the ID of a skill string, adding it if it is new."""
+        skill_id = self.ids.get(skill)
+        if skill_id is not None:
+            return skill_id
+        with self._lock:
+            # Another thread may have added it while this one waited
+            skill_id = self.ids.get(skill)
+            if skill_id is not None:
+                return skill_id
+            lower = skill.lower()
+            lower_id = self.intern(lower) if lower != skill else None
+            skill_id = len(self.skills)
+            skill = sys.intern(skill)
+            self.skills.append(skill)
+            self.lower_ids.append(skill_id if lower_id is None else lower_id)
+            # Published last, so a lock-free lookup never sees an ID before its entries
+            self.ids[skill] = skill_id
+            return skill_id
+
+    def encode(self, skills):
+        """Encode skill strings as an array of IDs."""
+        return array("I", [self.intern(skill) for skill in skills])
+
+    def decode(self, skill_ids):
+        """Decode an array of IDs back to skill strings."""
+        return [self.skills[skill_id] for skill_id in skill_ids]
+
+    def lower_set(self, skill_ids):
+        """Set of lowercased-skill IDs, for case-insensitive matching."""
+        return {self.lower_ids[skill_id] for skill_id in skill_ids}
+
+# IDs are only meaningful inside one process; records are pickled and
+# serialized with their skill strings
+SKILL_VOCABULARY = SkillVocabulary()
+
+class ResumeRecord:
+    """
+    Parsed resume, stored compactly.
+
+    Fields live in slots instead of a per-record dict and skills are an
+    array of vocabulary IDs. Records are converted to plain dicts only at
+    the output boundary (JSON, checkpoints, HTTP responses) with to_dict().
+    A near-duplicate resume is a record with only `duplicate_of` set.
+    """
+    __slots__ = (
+        "name", "email", "phone", "skill_ids", "github", "linkedin", "education",
+        "experience_months", "full_text", "text_features", "duplicate_of",
+        "stage_timings", "resume_path", "content_hash"
+    )
+
+    def __init__(self, name=None, email=None, phone=None, skills=(), github=None, linkedin=None,
+                 education=None, experience_months=None, full_text=None, text_features=None,
+                 duplicate_of=None, stage_timings=None, resume_path=None, content_hash=None):
+        self.name = name
+        self.email = email
+        self.phone = phone
+        self.skill_ids = SKILL_VOCABULARY.encode(skills or ())
+        self.github = github
+        self.linkedin = linkedin
+        self.education = education
+        self.experience_months = experience_months
+        self.full_text = full_text
+        self.text_features = text_features
+        self.duplicate_of = duplicate_of
+        self.stage_timings = stage_timings
+        self.resume_path = resume_path
+        self.content_hash = content_hash
+
+    @property
+    def skills(self):
+        return SKILL_VOCABULARY.decode(self.skill_ids)
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a record from a dict as produced by to_dict (unknown keys are ignored)."""
+        return cls(
+            name=data.get("name"), email=data.get("email"), phone=data.get("phone"),
+            skills=data.get("skills") or (), github=data.get("github"),
+            linkedin=data.get("linkedin"), education=data.get("education"),
+            experience_months=data.get("experience_months"), full_text=data.get("full_text"),
+            text_features=data.get("text_features"), duplicate_of=data.get("duplicate_of"),
+            stage_timings=data.get("stage_timings"), resume_path=data.get("resume_path"),
+            content_hash=data.get("content_hash")
+        )
+
+    def to_dict(self, include_text=True):
+        """
+        Convert to a plain dict with the same keys the pipeline has always produced.
+
+        Args:
+            include_text (bool): Include "full_text" when present
+        """
+        if self.duplicate_of is not None:
+            data = {"duplicate_of": self.duplicate_of}
+        else:
+            data = {
+                "name": self.name,
+                "email": self.email,
+                "phone": self.phone,
+                "skills": self.skills,
+                "github": self.github,
+                "linkedin": self.linkedin,
+                "education": self.education,
+                "experience_months": self.experience_months
+            }
+            if include_text and self.full_text is not None:
+                data["full_text"] = self.full_text
+            if self.text_features is not None:
+                data["text_features"] = self.text_features
+            if self.content_hash is not None:
+                data["content_hash"] = self.content_hash
+        if self.stage_timings is not None:
+            data["stage_timings"] = self.stage_timings
+        if self.resume_path is not None:
+            data["resume_path"] = self.resume_path
+        return data
+
+    def __reduce__(self):
+        # Skill IDs are per-process, so pickles carry the skill strings
+        return (ResumeRecord.from_dict, (self.to_dict(),))
+
+    def __repr__(self):
+        return f"ResumeRecord(name={self.name!r}, skills={self.skills!r})"
@@ -0,0 +1,142 @@
+# score_cache.py
+
+import hashlib
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
+
+DEFAULT_SCORE_CACHE_SIZE = 100000
+
+# Seconds a connection waits for another process's write lock before giving up
+DISK_TIMEOUT = 5.0
+
+def content_hash(text):
+    """Hash of a resume's extracted text, used as its identity in the score cache."""
+    return hashlib.sha1((text or "").encode("utf-8")).hexdigest()
+
+def job_score_key(job_profile):
+    """
+    Hash of the parts of a job profile that scores depend on.
+
+    Only the extracted skills and the stop-word-filtered term counts enter
+    the key, so edits that change neither (whitespace, punctuation, case,
+    stop words, word order) keep hitting the same cache entries.
+
+    Args:
+        job_profile (dict): Output of build_job_profile
+
+    Returns:
+        str: Normalized job hash
+    """
+    normalized = {
+        "skills": sorted(job_profile["skills"]),
+        "terms": sorted(job_profile["terms"].items())
+    }
+    return hashlib.sha1(json.dumps(normalized).encode("utf-8")).hexdigest()
+
+class ScoreCache:
+    def __init__(self, max_entries=DEFAULT_SCORE_CACHE_SIZE, path=None):
+        """
+        LRU cache of (skill match, semantic) scores per resume/job pair.
+
+        Keys are (resume content hash, normalized job hash, scorer version).
+        The in-memory tier holds at most `max_entries` pairs and evicts the
+        least recently used. With `path`, every score is also written to a
+        SQLite file, which serves memory misses and survives restarts.
+        The file is opened in WAL mode so several processes (e.g. the
+        scoring service workers) can share it; a read or write that still
+        fails on a lock is skipped, since the file is only a cache.
+
+        Args:
+            max_entries (int): Pairs kept in memory
+            path (str): Optional SQLite file for the on-disk tier
+        """
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.disk = None
+        self._unsaved = []
+        self._lock = threading.Lock()
+        if path:
+            self.disk = sqlite3.connect(path, timeout=DISK_TIMEOUT, check_same_thread=False)
+            self.disk.execute("PRAGMA journal_mode=WAL")
+            self.disk.execute(
+                "CREATE TABLE IF NOT EXISTS scores "
+                "(key TEXT PRIMARY KEY, skill_match REAL, semantic REAL)"
+            )
+
+    @staticmethod
+    def _disk_key(key):
+        return ":".join(str(part) for part in key)
+
+    def _remember(self, key, scores):
+        self.entries[key] = scores
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def get(self, key):
+        """
+        Look up the scores of a pair.
+
+        Returns:
+            tuple: (skill match score, semantic score), or None on a miss
+        """
+        with self._lock:
+            scores = self.entries.get(key)
+            if scores is not None:
+                self.entries.move_to_end(key)
+            elif self.disk is not None:
+                try:
+                    row = self.disk.execute(
+                        "SELECT skill_match, semantic FROM scores WHERE key = ?", (self._disk_key(key),)
+                    ).fetchone()
+                except sqlite3.OperationalError:
+                    # Locked for longer than DISK_TIMEOUT: treat as a miss
+                    row = None
+                if row is not None:
+                    scores = tuple(row)
+                    self._remember(key, scores)
+
+            if scores is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return scores
+
+    def put(self, key, scores):
+        """Store the (skill match score, semantic score) of a pair."""
+        scores = tuple(scores)
+        with self._lock:
+            self._remember(key, scores)
+            if self.disk is not None:
+                self._unsaved.append((self._disk_key(key), *scores))
+
+    def flush(self):
+        """
+        Write pending scores to the on-disk tier in one transaction.
+
+        If the file stays locked, the scores are kept for the next flush
+        (at most max_entries of them) instead of failing the caller.
+        """
+        with self._lock:
+            if self.disk is None or not self._unsaved:
+                return
+            try:
+                with self.disk:
+                    self.disk.executemany("INSERT OR REPLACE INTO scores VALUES (?, ?, ?)", self._unsaved)
+            except sqlite3.OperationalError:
+                self._unsaved = self._unsaved[-self.max_entries:]
+                return
+            self._unsaved = []
+
+    def close(self):
+        self.flush()
+        if self.disk is not None:
+            self.disk.close()
+            self.disk = None
+
+    def __len__(self):
+        return len(self.entries)
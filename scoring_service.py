@@ -0,0 +1,360 @@
+# scoring_service.py
+
+import argparse
+import asyncio
+import json
+import os
+import time
+import uuid
+from collections import deque
+from http import HTTPStatus
+from urllib.parse import parse_qs, urlsplit
+from document_limits import DocumentRejected, add_limit_arguments, configure_limits
+from score_cache import DEFAULT_SCORE_CACHE_SIZE
+from skill_filter import CandidateBitmapIndex
+from worker_pool import PreforkPool
+
+DEFAULT_MAX_BODY_BYTES = 20 * 1024 * 1024
+
+# ------------ WORKER PROCESS ----------------
+_score_cache = None
+
+def _init_worker(score_cache_size=DEFAULT_SCORE_CACHE_SIZE, score_cache_path=None):
+    """Set up the per-worker score cache (models are already loaded by PreforkPool)."""
+    global _score_cache
+    from score_cache import ScoreCache
+
+    # Each worker keeps its own LRU tier; the optional SQLite tier is shared
+    if score_cache_size > 0:
+        _score_cache = ScoreCache(score_cache_size, score_cache_path)
+
+def _parse_resume_bytes(filename, data):
+    """Extract and parse an uploaded resume inside a worker process."""
+    from input_handler import extract_text_from_buffer
+    from resume_ranking_pipeline import process_resume_text
+
+    # The format is detected from the content; the name is only a fallback hint
+    return process_resume_text(extract_text_from_buffer(data, filename))
+
+def _rank_candidates(resumes_data, job_description_text, top_k):
+    """Rank stored candidates inside a worker process."""
+    from resume_ranking_pipeline import rank_resumes
+
+    ranked = rank_resumes(resumes_data, job_description_text, score_cache=_score_cache)
+    return ranked[:top_k] if top_k else ranked
+
+# ------------ LATENCY TRACKING ----------------
+class LatencyRecorder:
+    def __init__(self, window=10000):
+        """
+        Keep the most recent request latencies per route.
+
+        Args:
+            window (int): Number of samples kept per route
+        """
+        self.window = window
+        self.samples = {}
+        self.counts = {}
+
+    def record(self, route, seconds):
+        """Record one request latency."""
+        if route not in self.samples:
+            self.samples[route] = deque(maxlen=self.window)
+            self.counts[route] = 0
+        self.samples[route].append(seconds)
+        self.counts[route] += 1
+
+    @staticmethod
+    def _percentile(sorted_samples, pct):
+        """Nearest-rank percentile of an already sorted list."""
+        index = max(0, int(round(pct / 100 * len(sorted_samples))) - 1)
+        return sorted_samples[min(index, len(sorted_samples) - 1)]
+
+    def summary(self):
+        """
+        Summarize latencies per route.
+
+        Returns:
+            dict: Route -> count, p50/p99/max in milliseconds
+        """
+        result = {}
+        for route, samples in self.samples.items():
+            ordered = sorted(samples)
+            result[route] = {
+                'count': self.counts[route],
+                'p50_ms': round(self._percentile(ordered, 50) * 1000, 2),
+                'p99_ms': round(self._percentile(ordered, 99) * 1000, 2),
+                'max_ms': round(ordered[-1] * 1000, 2)
+            }
+        return result
+
+# ------------ HTTP SERVICE ----------------
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+class ScoringService:
+    def __init__(self, workers=None, max_pending=None, max_body_bytes=DEFAULT_MAX_BODY_BYTES,
+                 score_cache_size=DEFAULT_SCORE_CACHE_SIZE, score_cache_path=None):
+        """
+        Long-running resume scoring service with warm worker processes.
+
+        Args:
+            workers (int): Number of worker processes (default: CPU count)
+            max_pending (int): CPU tasks allowed in flight before requests
+                are rejected with 503 (default: 2 per worker)
+            max_body_bytes (int): Largest accepted request body
+            score_cache_size (int): Resume/job score pairs cached per worker (0 disables)
+            score_cache_path (str): Optional SQLite file shared by the workers' caches
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending or self.workers * 2
+        self.max_body_bytes = max_body_bytes
+        self.pool = PreforkPool(
+            self.workers, initializer=_init_worker, initargs=(score_cache_size, score_cache_path)
+        )
+        self.executor = None
+        self.pending = 0
+        self.candidates = {}
+        # Filters run here, on bitmaps, so only matching candidates are sent to be scored
+        self.filter_index = CandidateBitmapIndex()
+        self.filter_rows = {}  # candidate ID -> its current row in filter_index
+        self.row_candidates = []  # row -> candidate ID
+        self.latency = LatencyRecorder()
+        self.started_at = time.time()
+        self.routes = {
+            ('GET', '/health'): self.handle_health,
+            ('POST', '/resumes'): self.handle_parse,
+            ('POST', '/rank'): self.handle_rank
+        }
+
+    async def warm_up(self):
+        """Load the models once and fork every worker from it before accepting traffic."""
+        # Blocks the loop on purpose: nothing is served until the workers are up
+        self.pool.start()
+        self.executor = self.pool.executor
+        self.pool.print_report()
+
+    async def run_cpu(self, fn, *args):
+        """
+        Run CPU-bound work in the process pool with bounded concurrency.
+
+        Raises:
+            HTTPError: 503 when the pool already has max_pending tasks
+        """
+        if self.pending >= self.max_pending:
+            raise HTTPError(HTTPStatus.SERVICE_UNAVAILABLE, "Server busy, retry later")
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, fn, *args)
+        finally:
+            self.pending -= 1
+
+    async def handle_health(self, query, headers, body):
+        """Report worker, queue and latency status."""
+        return HTTPStatus.OK, {
+            'status': 'ok',
+            'workers': self.workers,
+            'pending': self.pending,
+            'worker_processes': self.pool.reports,
+            'max_pending': self.max_pending,
+            'candidates': len(self.candidates),
+            'uptime_s': round(time.time() - self.started_at, 1),
+            'latency': self.latency.summary()
+        }
+
+    async def handle_parse(self, query, headers, body):
+        """Parse an uploaded resume and store it as a candidate."""
+        filename = query.get('filename') or headers.get('x-filename')
+        if not body:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Empty upload")
+
+        try:
+            resume_data = await self.run_cpu(_parse_resume_bytes, filename, body)
+        except DocumentRejected as e:
+            # Too large or too slow to extract; the worker was freed at the time limit
+            raise HTTPError(HTTPStatus.UNPROCESSABLE_ENTITY, str(e))
+        except ValueError as e:
+            raise HTTPError(HTTPStatus.UNSUPPORTED_MEDIA_TYPE, str(e))
+
+        candidate_id = query.get('candidate_id') or uuid.uuid4().hex
+        self.candidates[candidate_id] = resume_data
+        self.filter_rows[candidate_id] = self.filter_index.add(
+            resume_data.skills, resume_data.education, resume_data.experience_months
+        )
+        self.row_candidates.append(candidate_id)
+        parsed = resume_data.to_dict(include_text=False)
+        return HTTPStatus.CREATED, {'candidate_id': candidate_id, 'resume': parsed}
+
+    async def handle_rank(self, query, headers, body):
+        """Rank all stored candidates against a job description."""
+        try:
+            request = json.loads(body or b'{}')
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Body must be JSON")
+        if not isinstance(request, dict):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Body must be a JSON object")
+        job_description_text = request.get('job_description')
+        if not job_description_text or not isinstance(job_description_text, str):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "'job_description' is required and must be a string")
+        try:
+            top_k = int(request.get('top_k') or 0)
+        except (TypeError, ValueError):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "'top_k' must be an integer")
+        if top_k < 0:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "'top_k' must not be negative")
+        if request.get('filter') is not None and not isinstance(request['filter'], str):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "'filter' must be a string")
+
+        candidates = self.candidates
+        if request.get('filter'):
+            try:
+                rows = self.filter_index.filter(request['filter'])
+            except ValueError as e:
+                raise HTTPError(HTTPStatus.BAD_REQUEST, str(e))
+            # Rows of re-uploaded candidate IDs are stale and skipped
+            candidates = {
+                self.row_candidates[row]: self.candidates[self.row_candidates[row]] for row in rows
+                if self.filter_rows[self.row_candidates[row]] == row
+            }
+
+        ranked = await self.run_cpu(
+            _rank_candidates, candidates, job_description_text, top_k
+        )
+        return HTTPStatus.OK, {
+            'count': len(candidates),
+            'filtered_out': len(self.candidates) - len(candidates),
+            'results': ranked
+        }
+
+    async def read_request(self, reader):
+        """
+        Read one HTTP/1.1 request.
+
+        Returns:
+            tuple: (method, target, headers, body) or None on EOF
+        """
+        request_line = await reader.readline()
+        if not request_line:
+            return None
+        try:
+            method, target, _ = request_line.decode('latin-1').split()
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Malformed request line")
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        try:
+            length = int(headers.get('content-length') or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Invalid Content-Length")
+        if length > self.max_body_bytes:
+            raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Request body too large")
+        body = await reader.readexactly(length) if length else b''
+        return method.upper(), target, headers, body
+
+    async def write_response(self, writer, status, payload, keep_alive, elapsed):
+        """Write a JSON response."""
+        body = json.dumps(payload).encode('utf-8')
+        head = (
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"X-Response-Time-ms: {elapsed * 1000:.2f}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+        )
+        if status == HTTPStatus.SERVICE_UNAVAILABLE:
+            head += "Retry-After: 1\r\n"
+        writer.write(head.encode('latin-1') + b"\r\n" + body)
+        await writer.drain()
+
+    async def handle_connection(self, reader, writer):
+        """Serve requests on one client connection."""
+        try:
+            while True:
+                started = time.perf_counter()
+                keep_alive = False
+                route = 'invalid'
+                try:
+                    request = await self.read_request(reader)
+                    if request is None:
+                        break
+                    method, target, headers, body = request
+                    keep_alive = headers.get('connection', '').lower() != 'close'
+                    url = urlsplit(target)
+                    handler = self.routes.get((method, url.path))
+                    if handler is None:
+                        # One key for every unknown path, so probes cannot grow the latency table
+                        route = 'not_found'
+                        raise HTTPError(HTTPStatus.NOT_FOUND, f"No route for {method} {url.path}")
+                    route = url.path
+                    query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+                    status, payload = await handler(query, headers, body)
+                except HTTPError as e:
+                    status, payload = e.status, {'error': e.message}
+                except Exception as e:
+                    status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {'error': str(e)}
+
+                elapsed = time.perf_counter() - started
+                self.latency.record(route, elapsed)
+                await self.write_response(writer, status, payload, keep_alive, elapsed)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host, port):
+        """Warm the workers and serve until cancelled."""
+        await self.warm_up()
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        print(f"✅ Scoring service listening on http://{host}:{port} ({self.workers} workers)")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.pool.shutdown(cancel_futures=True)
+
+def main():
+    parser = argparse.ArgumentParser(description="Local resume scoring service")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind (default: localhost only)")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes")
+    parser.add_argument("--max-pending", type=int, default=None,
+                        help="CPU tasks in flight before returning 503")
+    parser.add_argument("--max-body-mb", type=float, default=DEFAULT_MAX_BODY_BYTES / (1024 * 1024))
+    parser.add_argument("--score-cache-size", type=int, default=DEFAULT_SCORE_CACHE_SIZE,
+                        help="Resume/job score pairs cached per worker (0 disables)")
+    parser.add_argument("--score-cache", default=None, metavar="DB",
+                        help="SQLite file persisting cached scores across restarts")
+    add_limit_arguments(parser)
+    args = parser.parse_args()
+    # Set before the workers are forked so they inherit the limits
+    configure_limits(args)
+
+    service = ScoringService(
+        workers=args.workers,
+        max_pending=args.max_pending,
+        max_body_bytes=int(args.max_body_mb * 1024 * 1024),
+        score_cache_size=args.score_cache_size,
+        score_cache_path=args.score_cache
+    )
+    try:
+        asyncio.run(service.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        print("Scoring service stopped")
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,22 @@
 import re
 import json
+from functools import lru_cache
 from pathlib import Path
+from instrumentation import timed
 
 class SectionSegmenter:
-    def __init__(self, patterns_file="data/section_patterns.json"):
+    def __init__(self, patterns_file="data/section_patterns.json", cache_size=128):
         """
         Initialize the section segmenter with section patterns.
         
         Args:
             patterns_file (str): Path to JSON file containing section patterns
+            cache_size (int): Number of recent documents whose segmentation is kept
         """
         self.section_patterns = self._load_patterns(patterns_file)
         self._compile_patterns()
+        # Segmentation per document text, so repeated get_section calls are free
+        self._segment = lru_cache(maxsize=cache_size)(self._segment_text)
 
     def _load_patterns(self, patterns_file):
         """Load section patterns from JSON file."""
@@ -72,16 +77,38 @@ class SectionSegmenter:
             return default_patterns
 
     def _compile_patterns(self):
-        """Compile regex patterns for section matching."""
-        self.compiled_patterns = {}
-        for section, patterns in self.section_patterns.items():
-            # Create pattern that matches any of the section headers
+        """Compile all section headers into one alternation with a named group per section."""
+        self.section_groups = {}
+        alternatives = []
+        # Later sections come first, so at a shared position they win as they
+        # did when each section was matched on its own and overwrote earlier ones
+        for i, (section, patterns) in reversed(list(enumerate(self.section_patterns.items()))):
+            group = f"s{i}"
+            self.section_groups[group] = section
             pattern = '|'.join(f'(?:{p})' for p in patterns)
             # Case insensitive, matches start of line or after newline
-            self.compiled_patterns[section] = re.compile(
-                f'^(?:{pattern}):?\\s*$',
-                re.IGNORECASE | re.MULTILINE
-            )
+            alternatives.append(f'(?P<{group}>^(?:{pattern}):?\\s*$)')
+        self.combined_pattern = re.compile('|'.join(alternatives), re.IGNORECASE | re.MULTILINE)
+
+    def _segment_text(self, text):
+        """
+        Find all section headers in one pass over the text.
+
+        Returns:
+            dict: Section name -> (header start, header end, section end). A
+                section that appears twice keeps its last occurrence.
+        """
+        headers = [
+            (match.start(), match.end(), self.section_groups[match.lastgroup])
+            for match in self.combined_pattern.finditer(text)
+        ]
+
+        bounds = {}
+        for i, (start, header_end, section) in enumerate(headers):
+            # End is either the start of next section or end of text
+            end = headers[i + 1][0] if i < len(headers) - 1 else len(text)
+            bounds[section] = (start, header_end, end)
+        return bounds
 
     def identify_section_bounds(self, text):
         """
@@ -93,40 +120,32 @@ class SectionSegmenter:
         Returns:
             dict: Dictionary with section names and their start/end positions
         """
-        # Find all section matches
-        sections = {}
-        for section, pattern in self.compiled_patterns.items():
-            for match in pattern.finditer(text):
-                sections[match.start()] = {
-                    'name': section,
-                    'start': match.start(),
-                    'header': match.group()
-                }
-
-        # Sort sections by their starting position
-        sorted_positions = sorted(sections.keys())
-
-        # Determine section boundaries
-        section_bounds = {}
-        for i, pos in enumerate(sorted_positions):
-            section = sections[pos]
-            section_name = section['name']
-            start = pos
-            
-            # End is either the start of next section or end of text
-            if i < len(sorted_positions) - 1:
-                end = sorted_positions[i + 1]
-            else:
-                end = len(text)
+        return {
+            section: {'start': start, 'end': end, 'header': text[start:header_end]}
+            for section, (start, header_end, end) in self._segment(text).items()
+        }
 
-            section_bounds[section_name] = {
-                'start': start,
-                'end': end,
-                'header': section['header']
-            }
+    def section_spans(self, text):
+        """
+        Locate the content of each section without copying it.
 
-        return section_bounds
+        Args:
+            text (str): Resume text to segment
 
+        Returns:
+            dict: Section name -> (start, end) offsets of its content in `text`,
+                excluding the header and surrounding whitespace
+        """
+        spans = {}
+        for section, (_, start, end) in self._segment(text).items():
+            while start < end and text[start].isspace():
+                start += 1
+            while end > start and text[end - 1].isspace():
+                end -= 1
+            spans[section] = (start, end)
+        return spans
+
+    @timed("section_segmenter.extract_sections")
     def extract_sections(self, text):
         """
         Extract sections from resume text.
@@ -137,18 +156,7 @@ class SectionSegmenter:
         Returns:
             dict: Dictionary with section names and their content
         """
-        # Get section boundaries
-        bounds = self.identify_section_bounds(text)
-        
-        # Extract content for each section
-        sections = {}
-        for section, pos in bounds.items():
-            content = text[pos['start']:pos['end']].strip()
-            # Remove the header from the content
-            content = re.sub(f"^{re.escape(pos['header'])}", '', content, flags=re.MULTILINE)
-            sections[section] = content.strip()
-        
-        return sections
+        return {section: text[start:end] for section, (start, end) in self.section_spans(text).items()}
 
     def get_section(self, text, section_name):
         """
@@ -161,8 +169,8 @@ class SectionSegmenter:
         Returns:
             str: Content of the requested section, or None if not found
         """
-        sections = self.extract_sections(text)
-        return sections.get(section_name)
+        span = self.section_spans(text).get(section_name)
+        return text[span[0]:span[1]] if span else None
 
 def main():
     """Example usage of the SectionSegmenter."""
@@ -0,0 +1,324 @@
+# shared_scoring.py
+
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+import pandas as pd
+from skill_table import build_skill_profile
+
+# Same weights as resume_job_matcher.rank_candidates
+MATCH_WEIGHT = 0.7
+SIMILARITY_WEIGHT = 0.3
+
+# ------------ SHARED ARRAYS ----------------
+class SharedArrays:
+    def __init__(self, arrays):
+        """
+        Copy a set of numpy arrays into one shared-memory block.
+
+        Worker processes attach by name (see attach) and get zero-copy views,
+        so the arrays are never pickled.
+
+        Args:
+            arrays (dict): Name -> numpy array
+        """
+        self.layout = {}
+        offset = 0
+        for name, array in arrays.items():
+            array = np.ascontiguousarray(array)
+            self.layout[name] = (offset, array.dtype.str, array.shape)
+            # Keep every array 8-byte aligned
+            offset += -(-array.nbytes // 8) * 8
+        self.shm = shared_memory.SharedMemory(create=True, size=max(offset, 8))
+        for name, array in arrays.items():
+            self.view(name)[...] = array
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def view(self, name):
+        offset, dtype, shape = self.layout[name]
+        return np.ndarray(shape, dtype=dtype, buffer=self.shm.buf, offset=offset)
+
+    def close(self):
+        """Release and remove the shared block (owner only)."""
+        self.shm.close()
+        self.shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+def attach(shm_name, layout):
+    """Attach to a block created by SharedArrays; returns (handle, name -> view)."""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    views = {
+        name: np.ndarray(shape, dtype=dtype, buffer=shm.buf, offset=offset)
+        for name, (offset, dtype, shape) in layout.items()
+    }
+    return shm, views
+
+# ------------ FEATURE MATRIX ----------------
+def _columns(rows_per_doc, vocabulary, with_counts):
+    """Build column-major (feature -> documents) postings from per-document features."""
+    columns = [[] for _ in vocabulary]
+    for doc, features in enumerate(rows_per_doc):
+        for feature, count in features:
+            columns[vocabulary[feature]].append((doc, count))
+    indptr = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum([len(column) for column in columns])
+    rows = np.fromiter((doc for column in columns for doc, _ in column), dtype=np.int64, count=indptr[-1])
+    arrays = {"indptr": indptr, "rows": rows}
+    if with_counts:
+        arrays["data"] = np.fromiter(
+            (count for column in columns for _, count in column), dtype=np.float64, count=indptr[-1]
+        )
+    return arrays
+
+def build_feature_matrix(resume_profiles):
+    """
+    Turn resume skill profiles into column-major postings for shared scoring.
+
+    Each skill and each term keeps the sorted list of resumes containing it,
+    so one job is scored against a range of resumes by walking only the
+    postings of its own skills and terms.
+
+    Args:
+        resume_profiles (list): build_skill_profile outputs, in candidate order
+
+    Returns:
+        tuple: (arrays dict, skill vocabulary, term vocabulary)
+    """
+    skill_vocabulary, term_vocabulary = {}, {}
+    for profile in resume_profiles:
+        for skill in profile['skills']:
+            skill_vocabulary.setdefault(skill, len(skill_vocabulary))
+        for term in profile['terms']:
+            term_vocabulary.setdefault(term, len(term_vocabulary))
+
+    skills = _columns(
+        (((skill, 1) for skill in profile['skills']) for profile in resume_profiles),
+        skill_vocabulary, with_counts=False
+    )
+    terms = _columns(
+        (profile['terms'].items() for profile in resume_profiles), term_vocabulary, with_counts=True
+    )
+    arrays = {
+        "skill_indptr": skills["indptr"], "skill_rows": skills["rows"],
+        "term_indptr": terms["indptr"], "term_rows": terms["rows"], "term_data": terms["data"],
+        "norms": np.array([profile['norm'] for profile in resume_profiles], dtype=np.float64)
+    }
+    return arrays, skill_vocabulary, term_vocabulary
+
+def encode_job(job_index, job_profile, skill_vocabulary, term_vocabulary):
+    """Encode a job profile as feature IDs; features no resume has are dropped."""
+    skill_ids = [skill_vocabulary[s] for s in job_profile['skills'] if s in skill_vocabulary]
+    terms = [(term_vocabulary[t], c) for t, c in job_profile['terms'].items() if t in term_vocabulary]
+    return (
+        job_index,
+        np.array(skill_ids, dtype=np.int64),
+        len(job_profile['skills']),
+        np.array([t for t, _ in terms], dtype=np.int64),
+        np.array([c for _, c in terms], dtype=np.float64),
+        job_profile['norm']
+    )
+
+# ------------ WORKERS ----------------
+_shared = None
+
+def _init_worker(shm_name, layout):
+    global _shared
+    _shared = attach(shm_name, layout)
+
+def _postings(indptr, rows, columns, lo, hi, data=None, weights=None):
+    """Gather the (row - lo, weight) postings of `columns` that fall in [lo, hi)."""
+    parts, part_weights = [], []
+    for position, column in enumerate(columns):
+        start, end = indptr[column], indptr[column + 1]
+        column_rows = rows[start:end]
+        a, b = np.searchsorted(column_rows, (lo, hi))
+        if a == b:
+            continue
+        parts.append(column_rows[a:b] - lo)
+        if data is not None:
+            part_weights.append(data[start + a:start + b] * weights[position])
+    if not parts:
+        return np.zeros(0, dtype=np.int64), None
+    return np.concatenate(parts), np.concatenate(part_weights) if data is not None else None
+
+def top_k_indices(scores, k):
+    """
+    Indices of the k highest scores, best first, ties in index order.
+
+    Matches a stable descending sort truncated to k.
+    """
+    if k is None or k >= len(scores):
+        return np.argsort(-scores, kind="stable")
+    if k <= 0:
+        return np.zeros(0, dtype=np.int64)
+    kth = np.partition(scores, len(scores) - k)[len(scores) - k]
+    above = np.flatnonzero(scores > kth)
+    ties = np.flatnonzero(scores == kth)[:k - len(above)]
+    chosen = np.concatenate([above, ties])
+    return chosen[np.argsort(-scores[chosen], kind="stable")]
+
+def _score_shard(jobs, lo, hi, top_k):
+    """
+    Score a block of jobs against resumes [lo, hi) of the shared matrix.
+
+    Returns:
+        list: (job index, candidate indices, match, similarity, final) per job,
+            holding this shard's top_k candidates
+    """
+    views = _shared[1]
+    n = hi - lo
+    norms = views["norms"][lo:hi]
+    results = []
+    for job_index, skill_ids, skill_count, term_ids, term_counts, job_norm in jobs:
+        hits, _ = _postings(views["skill_indptr"], views["skill_rows"], skill_ids, lo, hi)
+        overlap = np.bincount(hits, minlength=n).astype(np.float64)
+        match = overlap / skill_count if skill_count else np.zeros(n)
+
+        rows, weights = _postings(
+            views["term_indptr"], views["term_rows"], term_ids, lo, hi, views["term_data"], term_counts
+        )
+        dot = np.bincount(rows, weights=weights, minlength=n)
+        similarity = np.zeros(n)
+        if job_norm:
+            np.divide(dot, norms * job_norm, out=similarity, where=norms > 0)
+
+        final = MATCH_WEIGHT * match + SIMILARITY_WEIGHT * similarity
+        best = top_k_indices(final, top_k)
+        results.append((job_index, best + lo, match[best], similarity[best], final[best]))
+    return results
+
+# ------------ RANKING ----------------
+class SharedScorer:
+    def __init__(self, resume_df, workers=None, candidate_shard_size=None, job_block_size=16):
+        """
+        Resume feature matrix in shared memory plus the worker pool scoring it.
+
+        Setup (parsing the resumes, building the matrix, copying it into
+        shared memory and starting the workers) happens once here; rank()
+        can then be called for any number of job tables, e.g. one per
+        checkpoint chunk. Close the scorer (or use it as a context manager)
+        to stop the workers and free the shared block.
+
+        Args:
+            resume_df (pd.DataFrame): DataFrame with resume skills
+            workers (int): Worker processes (defaults to the CPU count)
+            candidate_shard_size (int): Resumes per shard (defaults to an even split per worker)
+            job_block_size (int): Jobs per shard
+        """
+        workers = workers or os.cpu_count() or 1
+        self.candidate_ids = list(resume_df['Candidate_ID'])
+        self.resume_profiles = [build_skill_profile(skills) for skills in resume_df['Skills']]
+        self.size = len(self.resume_profiles)
+        self.job_block_size = job_block_size
+        self.candidate_shard_size = candidate_shard_size or max(1, math.ceil(self.size / workers))
+
+        arrays, self.skill_vocabulary, self.term_vocabulary = build_feature_matrix(self.resume_profiles)
+        self.shared = SharedArrays(arrays)
+        try:
+            self.executor = ProcessPoolExecutor(
+                max_workers=workers, initializer=_init_worker, initargs=(self.shared.name, self.shared.layout)
+            )
+        except Exception:
+            self.shared.close()
+            raise
+
+    def rank(self, job_df, top_k=None):
+        """
+        Rank the candidates for every job in job_df.
+
+        The job x candidate space is cut into (job block, candidate range)
+        shards, each worker returns its shard's top_k per job, and the shards
+        are merged per job.
+
+        Returns:
+            pd.DataFrame: Rankings with the same columns as rank_candidates
+        """
+        n = self.size
+        job_profiles = [build_skill_profile(skills) for skills in job_df['Skills']]
+        job_ids = list(job_df['Job_ID'])
+        jobs = [
+            encode_job(i, profile, self.skill_vocabulary, self.term_vocabulary)
+            for i, profile in enumerate(job_profiles)
+        ]
+        tasks = [
+            (jobs[start:start + self.job_block_size], lo, min(lo + self.candidate_shard_size, n))
+            for start in range(0, len(jobs), self.job_block_size)
+            for lo in range(0, n, self.candidate_shard_size)
+        ]
+
+        shards = {}
+        futures = [self.executor.submit(_score_shard, block, lo, hi, top_k) for block, lo, hi in tasks]
+        for future in futures:
+            for job_index, *result in future.result():
+                shards.setdefault(job_index, []).append(result)
+
+        results = []
+        for job_index, job_id in enumerate(job_ids):
+            parts = shards.get(job_index)
+            if not parts:
+                continue
+            candidates, match, similarity, final = (np.concatenate(column) for column in zip(*parts))
+            # Merge shards: best score first, earlier candidates first on ties
+            order = np.lexsort((candidates, -final))[:top_k]
+            job_skills = job_profiles[job_index]['skills']
+            for rank, i in enumerate(order, 1):
+                resume_skill_set = self.resume_profiles[candidates[i]]['skill_set']
+                results.append({
+                    'Job_ID': job_id,
+                    'Candidate_ID': self.candidate_ids[candidates[i]],
+                    'Match_Score': float(match[i]),
+                    'Similarity_Score': float(similarity[i]),
+                    'Final_Score': float(final[i]),
+                    'Matching_Skills': [s for s in job_skills if s in resume_skill_set],
+                    'Missing_Skills': [s for s in job_skills if s not in resume_skill_set],
+                    'Rank': rank
+                })
+        return pd.DataFrame(results)
+
+    def close(self):
+        """Stop the workers and remove the shared block."""
+        try:
+            self.executor.shutdown()
+        finally:
+            self.shared.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+def rank_candidates_shared(resume_df, job_df, workers=None, top_k=None,
+                           candidate_shard_size=None, job_block_size=16):
+    """
+    Rank candidates for every job across worker processes.
+
+    The resume feature matrix is built once and placed in shared memory
+    (see SharedScorer, which keeps it for further job tables). Scores and
+    order are the same as resume_job_matcher.rank_candidates.
+
+    Args:
+        resume_df (pd.DataFrame): DataFrame with resume skills
+        job_df (pd.DataFrame): DataFrame with job skills
+        workers (int): Worker processes (defaults to the CPU count)
+        top_k (int): Candidates kept per job (all if None)
+        candidate_shard_size (int): Resumes per shard (defaults to an even split per worker)
+        job_block_size (int): Jobs per shard
+
+    Returns:
+        pd.DataFrame: Rankings with the same columns as rank_candidates
+    """
+    with SharedScorer(resume_df, workers, candidate_shard_size, job_block_size) as scorer:
+        return scorer.rank(job_df, top_k)
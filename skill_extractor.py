@@ -1,13 +1,25 @@
 import re
 import spacy
 from pathlib import Path
+from fuzzy_skills import DEFAULT_MAX_DISTANCES, fuzzy_index_for
+from instrumentation import timed
 
 class SkillExtractor:
-    def __init__(self, skills_file="skills.txt"):
-        """Initialize the skill extractor with a skills dictionary."""
+    def __init__(self, skills_file="skills.txt", fuzzy=True, max_distances=DEFAULT_MAX_DISTANCES):
+        """
+        Initialize the skill extractor with a skills dictionary.
+
+        Args:
+            skills_file (str): Skills dictionary, one skill per line
+            fuzzy (bool): Also match misspelled skills ("Javscript",
+                "Kubernets", OCR noise) through a fuzzy_skills deletion index
+            max_distances (tuple): (minimum word length, edits allowed) pairs
+                for fuzzy matching
+        """
         self.nlp = spacy.load("en_core_web_sm")
         self.skills = self._load_skills(skills_file)
         self.skill_patterns = self._compile_skill_patterns()
+        self.fuzzy_index = fuzzy_index_for(tuple(self.skills), tuple(max_distances)) if fuzzy else None
 
     def _load_skills(self, skills_file):
         """Load skills from the skills dictionary file."""
@@ -29,6 +41,7 @@ class SkillExtractor:
             patterns.append((skill, pattern))
         return patterns
 
+    @timed("skill_extractor.extract_skills")
     def extract_skills(self, text):
         """
         Extract skills from the given text.
@@ -43,6 +56,9 @@ class SkillExtractor:
         
         # Convert text to lowercase for better matching
         text_lower = text.lower()
+        if self.fuzzy_index is not None:
+            # Misspelled skill words are rewritten so the exact patterns find them
+            text_lower = self.fuzzy_index.normalize(text_lower)
         
         # Use regex patterns to find skills
         for skill, pattern in self.skill_patterns:
@@ -62,6 +78,7 @@ class SkillExtractor:
         
         return sorted(list(found_skills))
 
+    @timed("skill_extractor.extract_skills_with_context")
     def extract_skills_with_context(self, text, context_words=10):
         """
         Extract skills with surrounding context.
@@ -0,0 +1,294 @@
+# skill_filter.py
+
+import operator
+import re
+from array import array
+import numpy as np
+
+# Fields a filter term can name; bare terms are skills
+FIELD_ALIASES = {
+    "skill": "skill", "skills": "skill",
+    "education": "education", "edu": "education",
+    "experience": "experience_months", "experience_months": "experience_months"
+}
+COMPARISONS = {
+    ">=": operator.ge, ">": operator.gt, "<=": operator.le, "<": operator.lt, "=": operator.eq
+}
+KEYWORDS = {"AND", "OR", "NOT"}
+TOKEN_PATTERN = re.compile(r'\s*(?:(\()|(\))|"([^"]*)"|([<>]=?|=)|([^\s()"<>=]+))')
+
+def normalize_value(field, value):
+    """Normalize a skill or education value the same way for indexing and querying."""
+    value = value.strip().lower()
+    if field == "education":
+        # Same normalization as entity_extractor (dots dropped)
+        value = value.replace(".", "")
+    return value
+
+# ------------ QUERY PARSER ----------------
+def _tokenize(query):
+    tokens, position = [], 0
+    query = query.rstrip()
+    while position < len(query):
+        match = TOKEN_PATTERN.match(query, position)
+        if match is None or match.end() == position:
+            raise ValueError(f"Invalid filter syntax at position {position}: {query[position:]!r}")
+        position = match.end()
+        opening, closing, quoted, comparison, word = match.groups()
+        if opening:
+            tokens.append(("(", None))
+        elif closing:
+            tokens.append((")", None))
+        elif quoted is not None:
+            tokens.append(("word", quoted))
+        elif comparison:
+            tokens.append(("cmp", comparison))
+        elif word.upper() in KEYWORDS:
+            tokens.append((word.upper(), None))
+        else:
+            tokens.append(("word", word))
+    return tokens
+
+class _Parser:
+    def __init__(self, query):
+        self.query = query
+        self.tokens = _tokenize(query)
+        self.position = 0
+
+    def peek(self):
+        return self.tokens[self.position][0] if self.position < len(self.tokens) else None
+
+    def take(self, kind):
+        if self.peek() != kind:
+            found = self.peek() or "end of query"
+            raise ValueError(f"Invalid filter {self.query!r}: expected {kind}, found {found}")
+        token = self.tokens[self.position]
+        self.position += 1
+        return token[1]
+
+    def parse(self):
+        node = self.parse_or()
+        if self.peek() is not None:
+            raise ValueError(f"Invalid filter {self.query!r}: unexpected {self.peek()}")
+        return node
+
+    def parse_or(self):
+        node = self.parse_and()
+        while self.peek() == "OR":
+            self.take("OR")
+            node = ("or", node, self.parse_and())
+        return node
+
+    def parse_and(self):
+        node = self.parse_not()
+        while self.peek() == "AND":
+            self.take("AND")
+            node = ("and", node, self.parse_not())
+        return node
+
+    def parse_not(self):
+        if self.peek() == "NOT":
+            self.take("NOT")
+            return ("not", self.parse_not())
+        if self.peek() == "(":
+            self.take("(")
+            node = self.parse_or()
+            self.take(")")
+            return node
+        return self.parse_term()
+
+    def parse_term(self):
+        # Consecutive words form one multi-word term ("machine learning")
+        words = [self.take("word")]
+        while self.peek() == "word":
+            words.append(self.take("word"))
+        text = " ".join(words)
+
+        field, value = "skill", text
+        prefix, separator, rest = text.partition(":")
+        if separator and prefix.lower() in FIELD_ALIASES:
+            field, value = FIELD_ALIASES[prefix.lower()], rest
+        elif text.lower() in FIELD_ALIASES and self.peek() == "cmp":
+            field, value = FIELD_ALIASES[text.lower()], None
+
+        if field == "experience_months":
+            comparison = self.take("cmp")
+            number = value if value else self.take("word")
+            try:
+                return ("compare", field, comparison, float(number))
+            except ValueError:
+                raise ValueError(f"Invalid filter {self.query!r}: {number!r} is not a number")
+        return ("term", field, normalize_value(field, value))
+
+def parse_filter(query):
+    """
+    Parse a boolean candidate filter.
+
+    Terms are skills unless prefixed with a field ("education:btech");
+    consecutive words form one term and quotes keep keywords literal.
+    `experience >= 24` compares experience in months. AND binds tighter
+    than OR; NOT applies to the term or group that follows.
+
+        python AND (aws OR gcp) AND NOT education:"high school"
+        "machine learning" AND experience >= 24
+
+    Args:
+        query (str): Filter expression
+
+    Returns:
+        tuple: Parsed expression tree
+
+    Raises:
+        ValueError: On a syntax error
+    """
+    return _Parser(query).parse()
+
+# ------------ BITMAP INDEX ----------------
+class CandidateBitmapIndex:
+    def __init__(self):
+        """
+        Per-skill and per-education bitmaps of candidates, for filtering before scoring.
+
+        Candidates are numbered in the order they are added. Each (field,
+        value) keeps the sorted rows that have it; after compress(), sparse
+        values stay as uint32 row arrays and dense ones become packed
+        bitsets, whichever is smaller. A filter is evaluated with whole-array
+        AND/OR/NOT over packed bitsets (one bit per candidate), so its cost
+        depends on the number of terms, not on how many skills each
+        candidate has. Adding candidates after compress() is allowed.
+        """
+        self.size = 0
+        self.rows = {}  # (field, value) -> rows added one by one, not yet compressed
+        self.row_chunks = {}  # (field, value) -> row arrays added in bulk, not yet compressed
+        self.compressed = {}  # (field, value) -> ("array", uint32 rows) or ("bitmap", packed bits)
+        self.experience_months = array("d")
+
+    @classmethod
+    def from_records(cls, records):
+        """Index ResumeRecords (or record dicts) in order."""
+        index = cls()
+        for record in records:
+            if isinstance(record, dict):
+                index.add(record.get("skills"), record.get("education"), record.get("experience_months"))
+            else:
+                index.add(record.skills, record.education, record.experience_months)
+        return index
+
+    @classmethod
+    def from_skill_lists(cls, skill_lists):
+        """Index a sequence of skill lists (e.g. the Skills column of a skill table)."""
+        index = cls()
+        for skills in skill_lists:
+            index.add(skills)
+        return index
+
+    def add(self, skills=None, education=None, experience_months=None):
+        """
+        Add one candidate.
+
+        Returns:
+            int: The candidate's row
+        """
+        row = self.size
+        for field, values in (("skill", skills), ("education", education)):
+            for value in {normalize_value(field, v) for v in values or () if isinstance(v, str)}:
+                self.rows.setdefault((field, value), []).append(row)
+        self.experience_months.append(np.nan if experience_months is None else experience_months)
+        self.size += 1
+        return row
+
+    def add_postings(self, field, value, rows, size):
+        """
+        Bulk-add the rows having one value, growing the index to `size` candidates.
+
+        Args:
+            field (str): "skill" or "education"
+            value (str): Normalized value
+            rows (np.ndarray): Rows having the value
+            size (int): Number of candidates indexed once these rows are added
+        """
+        self.row_chunks.setdefault((field, value), []).append(np.asarray(rows, dtype=np.uint32))
+        self.resize(size)
+
+    def resize(self, size):
+        """Grow the index to `size` candidates; new candidates have no values yet."""
+        if size > self.size:
+            self.experience_months.extend([np.nan] * (size - self.size))
+            self.size = size
+
+    def compress(self):
+        """Move pending rows into compressed arrays or bitsets."""
+        for key in set(self.rows) | set(self.row_chunks):
+            parts = self.row_chunks.get(key, [])
+            if key in self.rows:
+                parts.append(np.array(self.rows[key], dtype=np.uint32))
+            if key in self.compressed:
+                parts.append(self._rows_of(self.compressed[key]))
+            rows = np.unique(np.concatenate(parts))
+            if rows.nbytes <= (self.size + 7) // 8:
+                self.compressed[key] = ("array", rows)
+            else:
+                self.compressed[key] = ("bitmap", self._pack(rows))
+        self.rows, self.row_chunks = {}, {}
+
+    def _rows_of(self, entry):
+        kind, payload = entry
+        if kind == "array":
+            return payload
+        return np.flatnonzero(np.unpackbits(payload, bitorder="little")).astype(np.uint32)
+
+    def _pack(self, rows):
+        if len(rows) * 8 >= self.size:
+            flags = np.zeros(self.size, dtype=bool)
+            flags[rows] = True
+            return np.packbits(flags, bitorder="little")
+        # Sparse rows: set bits directly instead of touching one byte per candidate
+        bits = np.zeros((self.size + 7) // 8, dtype=np.uint8)
+        np.bitwise_or.at(bits, rows >> 3, (1 << (rows & 7)).astype(np.uint8))
+        return bits
+
+    def bitmap(self, field, value):
+        """Packed bitset of the candidates having a value (all zero if none)."""
+        if self.rows or self.row_chunks:
+            self.compress()
+        entry = self.compressed.get((field, value))
+        if entry is None:
+            return np.zeros((self.size + 7) // 8, dtype=np.uint8)
+        kind, payload = entry
+        if kind == "array":
+            return self._pack(payload)
+        # Bitsets written before later adds are shorter than the index
+        return np.pad(payload, (0, (self.size + 7) // 8 - len(payload)))
+
+    def _evaluate(self, node):
+        kind = node[0]
+        if kind == "term":
+            return self.bitmap(node[1], node[2])
+        if kind == "and":
+            return np.bitwise_and(self._evaluate(node[1]), self._evaluate(node[2]))
+        if kind == "or":
+            return np.bitwise_or(self._evaluate(node[1]), self._evaluate(node[2]))
+        if kind == "not":
+            return np.invert(self._evaluate(node[1]))
+        _, _, comparison, number = node
+        months = np.frombuffer(self.experience_months, dtype=np.float64)
+        # Unknown experience (NaN) never satisfies a comparison
+        return np.packbits(COMPARISONS[comparison](months, number), bitorder="little")
+
+    def evaluate(self, query):
+        """
+        Evaluate a filter.
+
+        Args:
+            query (str or tuple): Filter expression or parse_filter output
+
+        Returns:
+            np.ndarray: Boolean mask with one entry per candidate
+        """
+        node = parse_filter(query) if isinstance(query, str) else query
+        # Padding bits past the last candidate are dropped by count
+        return np.unpackbits(self._evaluate(node), count=self.size, bitorder="little").astype(bool)
+
+    def filter(self, query):
+        """Rows of the candidates matching a filter, in order."""
+        return np.flatnonzero(self.evaluate(query))
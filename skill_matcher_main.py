@@ -1,8 +1,9 @@
 # skill_matcher_main.py
 
 import pandas as pd
-from job_skills_extractor import process_job_descriptions, extract_skills_from_job
+from job_skills_extractor import process_job_descriptions, extract_skills_bulk
 from resume_job_matcher import rank_candidates
+from skill_table import write_skill_table
 
 def extract_resume_skills(resume_data):
     """
@@ -12,26 +13,21 @@ def extract_resume_skills(resume_data):
         resume_data (pd.DataFrame): DataFrame with resume data
         
     Returns:
-        pd.DataFrame: DataFrame with candidate IDs and extracted skills
+        pd.DataFrame: DataFrame with candidate IDs and a list-typed Skills column
     """
-    results = []
+    resume_text = resume_data.get('Resume_Text', pd.Series('', index=resume_data.index)).fillna('')
+    candidate_ids = resume_data.get('Candidate_ID', pd.Series(None, index=resume_data.index, dtype=object))
     
-    for _, row in resume_data.iterrows():
-        candidate_id = row.get('Candidate_ID', None)
-        resume_text = row.get('Resume_Text', '')
-        
-        if not resume_text:
-            continue
-            
-        # Reuse the same extraction function for consistency
-        skills = extract_skills_from_job(resume_text)
-        
-        results.append({
-            'Candidate_ID': candidate_id,
-            'Skills': ','.join(skills)
-        })
+    # Skip rows without resume text
+    mask = resume_text.astype(str) != ''
+    
+    # Reuse the same extraction logic for consistency, on the whole column at once
+    skills = extract_skills_bulk(resume_text[mask])
     
-    return pd.DataFrame(results)
+    return pd.DataFrame({
+        'Candidate_ID': candidate_ids[mask].tolist(),
+        'Skills': skills
+    })
 
 def main():
     """
@@ -42,21 +38,21 @@ def main():
     
     # Extract skills from job descriptions
     job_skills_df = process_job_descriptions(job_data)
-    job_skills_df.to_csv("extracted_job_skills.csv", index=False)
-    print("✅ Job skills data saved to extracted_job_skills.csv")
+    write_skill_table(job_skills_df, "extracted_job_skills.parquet")
+    print("✅ Job skills data saved to extracted_job_skills.parquet")
     
     # Load resume data
     resume_data = pd.read_csv("resume_data.csv")
     
     # Extract skills from resumes
     resume_skills_df = extract_resume_skills(resume_data)
-    resume_skills_df.to_csv("extracted_resume_skills.csv", index=False)
-    print("✅ Resume skills data saved to extracted_resume_skills.csv")
+    write_skill_table(resume_skills_df, "extracted_resume_skills.parquet")
+    print("✅ Resume skills data saved to extracted_resume_skills.parquet")
     
     # Rank candidates
     rankings_df = rank_candidates(resume_skills_df, job_skills_df)
-    rankings_df.to_csv("candidate_rankings.csv", index=False)
-    print("✅ Candidate rankings saved to candidate_rankings.csv")
+    write_skill_table(rankings_df, "candidate_rankings.parquet")
+    print("✅ Candidate rankings saved to candidate_rankings.parquet")
     
     # Display top candidates for each job
     for job_id in job_skills_df['Job_ID'].unique():
@@ -64,8 +60,8 @@ def main():
         top_candidates = rankings_df[rankings_df['Job_ID'] == job_id].sort_values('Rank').head(3)
         for _, candidate in top_candidates.iterrows():
             print(f"  Rank {candidate['Rank']}: Candidate {candidate['Candidate_ID']} - Match Score: {candidate['Match_Score']:.2f}, Final Score: {candidate['Final_Score']:.2f}")
-            print(f"    Matching Skills: {candidate['Matching_Skills']}")
-            print(f"    Missing Skills: {candidate['Missing_Skills']}")
+            print(f"    Matching Skills: {', '.join(candidate['Matching_Skills'])}")
+            print(f"    Missing Skills: {', '.join(candidate['Missing_Skills'])}")
 
 if __name__ == "__main__":
     main()
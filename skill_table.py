@@ -0,0 +1,154 @@
+# skill_table.py
+
+import json
+import math
+import numpy as np
+import pandas as pd
+from text_features import term_counts, vector_norm
+
+SKILLS_COLUMN = 'Skills'
+
+def normalize_skills(skills):
+    """
+    Strip, lowercase and de-duplicate skills, keeping first-seen order.
+
+    Args:
+        skills (iterable): Raw skill strings
+
+    Returns:
+        list: Normalized skills
+    """
+    seen = set()
+    normalized = []
+    for skill in skills:
+        if not isinstance(skill, str):
+            continue
+        skill = skill.strip().lower()
+        if skill and skill not in seen:
+            seen.add(skill)
+            normalized.append(skill)
+    return normalized
+
+def parse_skills(value):
+    """
+    Coerce a Skills cell into a list of normalized skills.
+
+    Accepts native lists/arrays (Parquet), JSON-encoded lists (CSV written by
+    write_skill_table) and legacy comma-joined strings.
+
+    Args:
+        value: Cell value
+
+    Returns:
+        list: Normalized skills
+    """
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple, set, frozenset, np.ndarray)):
+        return normalize_skills(value)
+    if isinstance(value, float) and math.isnan(value):
+        return []
+    if isinstance(value, str):
+        text = value.strip()
+        if text.startswith('['):
+            try:
+                return normalize_skills(json.loads(text))
+            except ValueError:
+                pass
+        # Legacy comma-joined format
+        return normalize_skills(text.split(','))
+    return []
+
+def build_skill_profile(skills):
+    """
+    Parse a skill list once into the structures the ranking stage consumes.
+
+    Args:
+        skills: Skills cell value (list, JSON string or comma-joined string)
+
+    Returns:
+        dict: 'skills' (ordered list), 'skill_set' (frozenset),
+              'terms' (token counts) and 'norm' (token vector norm)
+    """
+    skill_list = parse_skills(skills)
+    terms = term_counts(' '.join(skill_list))
+    return {
+        'skills': skill_list,
+        'skill_set': frozenset(skill_list),
+        'terms': terms,
+        'norm': vector_norm(terms)
+    }
+
+def _list_columns(df):
+    """Return names of columns that hold list values."""
+    return [
+        column for column in df.columns
+        if df[column].map(lambda v: isinstance(v, (list, tuple, np.ndarray))).any()
+    ]
+
+def write_skill_table(df, path):
+    """
+    Save a table with list-typed skill columns.
+
+    Parquet keeps native list columns. CSV output stores each list as a JSON
+    array so skills containing commas survive the round trip.
+
+    Args:
+        df (pd.DataFrame): Table to save
+        path (str): Output path (.parquet or .csv)
+    """
+    if str(path).endswith('.parquet'):
+        df.to_parquet(path, index=False)
+        return
+
+    df = df.copy()
+    for column in _list_columns(df):
+        df[column] = df[column].map(lambda v: json.dumps(list(v)))
+    df.to_csv(path, index=False)
+
+def read_skill_table(path, list_columns=(SKILLS_COLUMN,)):
+    """
+    Load a table written by write_skill_table (or a legacy comma-joined CSV).
+
+    Args:
+        path (str): Input path (.parquet or .csv)
+        list_columns (tuple): Columns to convert to Python lists
+
+    Returns:
+        pd.DataFrame: Table with list-typed skill columns
+    """
+    if str(path).endswith('.parquet'):
+        df = pd.read_parquet(path)
+    else:
+        df = pd.read_csv(path)
+
+    for column in list_columns:
+        if column in df.columns:
+            df[column] = df[column].map(parse_skills)
+    return df
+
+def iter_skill_table(path, batch_size=100000, list_columns=(SKILLS_COLUMN,)):
+    """
+    Read a table written by write_skill_table in batches of rows.
+
+    Args:
+        path (str): Input path (.parquet or .csv)
+        batch_size (int): Rows per batch
+        list_columns (tuple): Columns to convert to Python lists
+
+    Yields:
+        pd.DataFrame: Consecutive batches with list-typed skill columns
+    """
+    if str(path).endswith('.parquet'):
+        import pyarrow.parquet as pq
+        batches = (
+            batch.to_pandas() for batch in pq.ParquetFile(path).iter_batches(batch_size=batch_size)
+        )
+    else:
+        batches = pd.read_csv(path, chunksize=batch_size)
+
+    for df in batches:
+        for column in list_columns:
+            if column in df.columns:
+                df[column] = df[column].map(parse_skills)
+        yield df
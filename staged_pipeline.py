@@ -0,0 +1,354 @@
+# staged_pipeline.py
+
+import io
+import os
+import queue
+import threading
+import time
+from instrumentation import METRICS
+
+# Marks the end of a stage's input
+_DONE = object()
+
+class _Stopped(Exception):
+    """Raised inside stage threads once the consumer has gone away."""
+
+class Stage:
+    def __init__(self, name, fn, workers=1, processes=False):
+        """
+        One step of a StagedPipeline.
+
+        Args:
+            name (str): Stage name, used in reports and metrics
+            fn (callable): Function from the previous stage's output to this
+                stage's output; must be picklable when processes is True
+            workers (int): Items processed concurrently
+            processes (bool): Run fn in the pipeline's process pool instead
+                of in this stage's threads
+        """
+        self.name = name
+        self.fn = fn
+        self.workers = workers
+        self.processes = processes
+        self.items = 0
+        self.busy_s = 0.0
+        self.blocked_s = 0.0
+        self.depth_total = 0
+        self.depth_samples = 0
+        self.depth_max = 0
+
+    def sample_depth(self, depth):
+        self.depth_total += depth
+        self.depth_samples += 1
+        self.depth_max = max(self.depth_max, depth)
+
+    def report(self, capacity):
+        """Summary of this stage's work and its input queue."""
+        return {
+            "stage": self.name,
+            "workers": f"{self.workers} {'processes' if self.processes else 'threads'}",
+            "items": self.items,
+            "busy_s": round(self.busy_s, 3),
+            "blocked_s": round(self.blocked_s, 3),
+            "queue_mean": round(self.depth_total / max(self.depth_samples, 1), 1),
+            "queue_max": self.depth_max,
+            "queue_capacity": capacity
+        }
+
+class StagedPipeline:
+    def __init__(self, stages, queue_size=32, process_pool=None, sample_interval=0.05):
+        """
+        Producer/consumer pipeline with a bounded queue in front of every stage.
+
+        Each stage runs its own worker threads. A full queue blocks the stage
+        feeding it, so a slow stage throttles everything upstream instead of
+        letting items pile up in memory; at most queue_size * len(stages)
+        items are between the input and the caller at any time, including
+        results held back to keep input order. Queue depths are sampled while the
+        pipeline runs: a stage whose input queue stays full is the
+        bottleneck and needs more workers, one whose queue stays empty is
+        starved by the stages before it.
+
+        Args:
+            stages (list): Stage objects, in order
+            queue_size (int): Capacity of each stage's input queue
+            process_pool: Started executor (e.g. worker_pool.PreforkPool) used
+                by stages with processes=True
+            sample_interval (float): Seconds between queue depth samples
+        """
+        if any(stage.processes for stage in stages) and process_pool is None:
+            raise ValueError("Stages running in processes need a process_pool")
+        self.stages = stages
+        self.queue_size = queue_size
+        self.process_pool = process_pool
+        self.sample_interval = sample_interval
+        self.queues = [queue.Queue(maxsize=queue_size) for _ in stages]
+        self.output = queue.Queue(maxsize=queue_size)
+        # Items fed but not yet yielded. Results wait in run() until every earlier
+        # item is out, so without this cap one slow item would let the rest of
+        # the input pile up there
+        self.max_in_flight = queue_size * len(stages)
+        self._in_flight = threading.Semaphore(self.max_in_flight)
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    def depths(self):
+        """Current input queue depth of every stage."""
+        return {stage.name: q.qsize() for stage, q in zip(self.stages, self.queues)}
+
+    def _put(self, q, item):
+        while True:
+            try:
+                q.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                if self._stop.is_set():
+                    raise _Stopped()
+
+    def _get(self, q):
+        while True:
+            try:
+                return q.get(timeout=0.1)
+            except queue.Empty:
+                if self._stop.is_set():
+                    raise _Stopped()
+
+    def _acquire_slot(self):
+        while not self._in_flight.acquire(timeout=0.1):
+            if self._stop.is_set():
+                raise _Stopped()
+
+    def _feed(self, items):
+        try:
+            for sequence, item in enumerate(items):
+                # Blocks behind the oldest unfinished item
+                self._acquire_slot()
+                self._put(self.queues[0], (sequence, item, item))
+        except _Stopped:
+            return
+        except Exception as e:
+            # The input itself failed (e.g. a corrupt archive); re-raised by run()
+            self._put(self.output, (None, None, e))
+        for _ in range(self.stages[0].workers):
+            self._put(self.queues[0], _DONE)
+
+    def _work(self, index, remaining):
+        stage = self.stages[index]
+        source = self.queues[index]
+        target = self.queues[index + 1] if index + 1 < len(self.stages) else self.output
+        try:
+            while True:
+                entry = self._get(source)
+                if entry is _DONE:
+                    break
+                sequence, item, value = entry
+                # Failed items skip the remaining stages
+                if not isinstance(value, Exception):
+                    started = time.perf_counter()
+                    try:
+                        if stage.processes:
+                            value = self.process_pool.submit(stage.fn, value).result()
+                        else:
+                            value = stage.fn(value)
+                    except Exception as e:
+                        value = e
+                    elapsed = time.perf_counter() - started
+                    METRICS.observe(f"staged.{stage.name}", elapsed)
+                    with self._lock:
+                        stage.items += 1
+                        stage.busy_s += elapsed
+                blocked = time.perf_counter()
+                self._put(target, (sequence, item, value))
+                with self._lock:
+                    stage.blocked_s += time.perf_counter() - blocked
+
+            # The last worker of a stage to finish closes the next stage's input
+            with self._lock:
+                remaining[index] -= 1
+                last = remaining[index] == 0
+            if last:
+                closers = self.stages[index + 1].workers if index + 1 < len(self.stages) else 1
+                for _ in range(closers):
+                    self._put(target, _DONE)
+        except _Stopped:
+            return
+
+    def _sample(self):
+        while not self._stop.wait(self.sample_interval):
+            for stage, q in zip(self.stages, self.queues):
+                stage.sample_depth(q.qsize())
+
+    def run(self, items):
+        """
+        Push items through every stage.
+
+        Yields:
+            tuple: (input item, final output or the exception raised by the
+                first stage that failed), in input order
+        """
+        remaining = [stage.workers for stage in self.stages]
+        threads = [threading.Thread(target=self._feed, args=(items,), daemon=True)]
+        for index, stage in enumerate(self.stages):
+            threads += [
+                threading.Thread(target=self._work, args=(index, remaining), daemon=True)
+                for _ in range(stage.workers)
+            ]
+        threads.append(threading.Thread(target=self._sample, daemon=True))
+        for thread in threads:
+            thread.start()
+
+        # Stages finish items out of order; hold early ones until their turn
+        pending = {}
+        next_sequence = 0
+        try:
+            while True:
+                entry = self.output.get()
+                if entry is _DONE:
+                    break
+                sequence, item, value = entry
+                if sequence is None:
+                    raise value
+                pending[sequence] = (item, value)
+                while next_sequence in pending:
+                    result = pending.pop(next_sequence)
+                    next_sequence += 1
+                    self._in_flight.release()
+                    yield result
+        finally:
+            self._stop.set()
+
+        for stage in self.stages:
+            METRICS.gauge(f"staged_queue_depth_max_{stage.name}", stage.depth_max)
+
+    def report(self):
+        """Per-stage items, busy and blocked seconds, and input queue depth."""
+        return [stage.report(self.queue_size) for stage in self.stages]
+
+    def print_report(self):
+        """Print the per-stage report as a table."""
+        print(f"{'stage':<10} {'workers':<12} {'items':>7} {'busy s':>8} {'blocked s':>9} "
+              f"{'queue mean':>10} {'queue max':>9}")
+        for row in self.report():
+            print(f"{row['stage']:<10} {row['workers']:<12} {row['items']:>7} {row['busy_s']:>8} "
+                  f"{row['blocked_s']:>9} {row['queue_mean']:>10} {row['queue_max']:>9}")
+
+# ------------ RESUME STAGES ----------------
+def read_stage(path):
+    """Read a resume file's bytes (I/O bound)."""
+    from document_limits import LIMITS
+
+    # Oversized files are rejected before they are loaded into memory
+    LIMITS.check_bytes(path, path)
+    with open(path, "rb") as f:
+        return path, f.read()
+
+def extract_stage(document):
+    """
+    Extract text from (resume ID, bytes).
+
+    PDFs, from disk or from an archive, use the pipeline's PDF reader, as
+    process_resume does; everything else goes through
+    extract_text_from_buffer.
+    """
+    from input_handler import extract_text_from_buffer
+    from resume_ranking_pipeline import extract_text_from_pdf
+
+    doc_id, data = document
+    if doc_id.lower().endswith(".pdf"):
+        return doc_id, extract_text_from_pdf(io.BytesIO(data))
+    return doc_id, extract_text_from_buffer(data, doc_id)
+
+def segment_stage(document):
+    """Split the text into sections and roles and measure experience."""
+    from experience_extractor import experience_months
+
+    doc_id, text = document
+    return doc_id, text, experience_months(text)
+
+def entities_stage(document):
+    """Extract contact, skill and education fields into a ResumeRecord."""
+    from entity_extractor import scan_entities
+    from resume_record import ResumeRecord
+    from score_cache import content_hash
+
+    _, text, months = document
+    return ResumeRecord(
+        **scan_entities(text), experience_months=months, full_text=text,
+        content_hash=content_hash(text)
+    )
+
+class ScoreStage:
+    def __init__(self, job_profile, score_cache):
+        """
+        Stage scoring each record against one job as soon as it is parsed.
+
+        Scores go into `score_cache`, so the final rank_resumes call with
+        the same cache only sorts.
+        """
+        from score_cache import job_score_key
+
+        self.job_profile = job_profile
+        self.job_key = job_score_key(job_profile)
+        self.score_cache = score_cache
+
+    def __call__(self, record):
+        from resume_ranking_pipeline import score_cache_key, score_resume
+
+        cache_key = score_cache_key(record, self.job_key)
+        if cache_key is not None and self.score_cache.get(cache_key) is None:
+            self.score_cache.put(cache_key, score_resume(record, self.job_profile))
+        return record
+
+STAGE_NAMES = ("read", "extract", "segment", "entities", "score")
+
+def resume_stages(job_profile, score_cache, workers=None, from_bytes=False):
+    """
+    The resume pipeline as stages: read, extract, segment, entities, score.
+
+    Args:
+        job_profile (dict): build_job_profile output used by the score stage
+        score_cache (ScoreCache): Cache the score stage fills
+        workers (dict): Stage name -> (workers, processes); missing stages
+            default to one thread, except extract, which defaults to one
+            process per CPU
+        from_bytes (bool): Inputs are already (ID, bytes) pairs, so there is
+            no read stage
+
+    Returns:
+        list: Stage objects
+    """
+    workers = dict(workers or {})
+    workers.setdefault("extract", (os.cpu_count() or 1, True))
+    functions = {
+        "read": read_stage,
+        "extract": extract_stage,
+        "segment": segment_stage,
+        "entities": entities_stage,
+        "score": ScoreStage(job_profile, score_cache)
+    }
+    stages = []
+    for name in STAGE_NAMES:
+        if name == "read" and from_bytes:
+            continue
+        count, processes = workers.get(name, (1, False))
+        if name == "score" and processes:
+            raise ValueError("The score stage fills this process's score cache and cannot use processes")
+        stages.append(Stage(name, functions[name], count, processes))
+    return stages
+
+def parse_stage_workers(specs):
+    """
+    Parse "stage=N" or "stage=N:process" specs.
+
+    Returns:
+        dict: Stage name -> (workers, processes)
+    """
+    workers = {}
+    for spec in specs or ():
+        name, _, value = spec.partition("=")
+        count, _, kind = value.partition(":")
+        if name not in STAGE_NAMES or not count.isdigit() or int(count) < 1 \
+                or kind not in ("", "thread", "process"):
+            raise ValueError(f"Invalid stage spec {spec!r}; expected e.g. extract=4:process")
+        workers[name] = (int(count), kind == "process")
+    return workers
@@ -0,0 +1,297 @@
+# synthetic_corpus.py
+
+import argparse
+import json
+import random
+from pathlib import Path
+from section_segmenter import SectionSegmenter
+
+FIRST_NAMES = [
+    "Aarav", "Priya", "Rohan", "Ananya", "Vikram", "Sneha", "Arjun", "Kavya",
+    "Rahul", "Isha", "Karan", "Meera", "Aditya", "Pooja", "Siddharth", "Neha"
+]
+LAST_NAMES = [
+    "Sharma", "Verma", "Patel", "Iyer", "Reddy", "Gupta", "Singh", "Nair",
+    "Mehta", "Rao", "Joshi", "Kapoor", "Das", "Bose", "Kulkarni", "Chopra"
+]
+COMPANIES = [
+    "Infosys", "TechCorp Industries", "StartupCo", "Wipro", "Acme Analytics",
+    "Globex Solutions", "Initech", "Zoho", "Cloudnine Systems", "DataWorks"
+]
+TITLES = [
+    "Software Engineer", "Senior Software Engineer", "Frontend Developer",
+    "Data Analyst", "Backend Developer", "Software Engineer Intern", "Tech Lead"
+]
+DEGREES = [
+    "B.Tech in Computer Science", "Bachelor of Engineering", "M.Tech in Data Science",
+    "BSc Computer Science", "MCA", "Master of Science", "Senior Secondary"
+]
+MONTHS = ["Jan", "Feb", "March", "April", "May", "June", "July", "Aug", "September", "Oct", "Nov", "December"]
+VERBS = ["Developed", "Led", "Implemented", "Designed", "Optimized", "Maintained", "Built", "Automated"]
+OBJECTS = [
+    "microservices architecture", "REST APIs", "data pipelines", "CI/CD workflows",
+    "dashboards", "recommendation engine", "payment integration", "test automation"
+]
+
+FORMATS = ("txt", "docx", "pdf")
+
+def load_skills(skills_file="skills.txt"):
+    """Load the skills dictionary used for synthetic documents."""
+    with open(skills_file, "r") as f:
+        return [line.strip() for line in f if line.strip()]
+
+def load_section_headers():
+    """Return the section header variants known to SectionSegmenter."""
+    return SectionSegmenter().section_patterns
+
+def _date_range(rng):
+    start_year = rng.randint(2012, 2023)
+    start = f"{rng.choice(MONTHS)} {start_year}"
+    if rng.random() < 0.3:
+        return f"{start} - Present"
+    return f"{start} - {rng.choice(MONTHS)} {rng.randint(start_year, 2024)}"
+
+def generate_resume_text(rng, skills, headers):
+    """
+    Generate one synthetic resume.
+
+    Args:
+        rng (random.Random): Random generator
+        skills (list): Skills dictionary
+        headers (dict): Section name -> header variants
+
+    Returns:
+        str: Resume text
+    """
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    handle = f"{first.lower()}{last.lower()}{rng.randint(1, 999)}"
+
+    def header(section):
+        return rng.choice(headers.get(section) or [section]).upper()
+
+    lines = [
+        f"{first} {last}",
+        f"{handle}@example.com | +91 {rng.randint(6, 9)}{rng.randint(100000000, 999999999)}",
+        f"github.com/{handle} | linkedin.com/in/{handle}",
+        "",
+        header("summary"),
+        f"{rng.choice(TITLES)} with {rng.randint(1, 12)} years of experience in "
+        f"{', '.join(rng.sample(skills, 3))}.",
+        "",
+        header("education"),
+        rng.choice(DEGREES),
+        f"Example University, {rng.randint(2008, 2022)}",
+        "",
+        header("experience"),
+    ]
+
+    for _ in range(rng.randint(1, 4)):
+        lines += [
+            rng.choice(TITLES),
+            rng.choice(COMPANIES),
+            _date_range(rng),
+        ]
+        for _ in range(rng.randint(2, 4)):
+            lines.append(
+                f"- {rng.choice(VERBS)} {rng.choice(OBJECTS)} using {rng.choice(skills)}"
+            )
+        lines.append("")
+
+    lines += [header("skills"), ", ".join(rng.sample(skills, rng.randint(5, 15))), ""]
+
+    lines.append(header("projects"))
+    for _ in range(rng.randint(1, 3)):
+        lines += [
+            f"{rng.choice(OBJECTS).title()} Project",
+            f"- {rng.choice(VERBS)} with {' and '.join(rng.sample(skills, 2))}",
+        ]
+    lines += ["", header("achievements"), f"- {rng.choice(['AWS', 'Google', 'Oracle'])} certification"]
+    return "\n".join(lines)
+
+def generate_job_text(rng, skills):
+    """Generate one synthetic job description."""
+    required = rng.sample(skills, rng.randint(4, 10))
+    preferred = rng.sample(skills, 3)
+    return "\n".join([
+        f"We are looking for a {rng.choice(TITLES)} to join our team.",
+        "",
+        "Requirements:",
+        f"Proficient in {', '.join(required)}.",
+        f"Experience with {rng.choice(OBJECTS)} and {rng.choice(OBJECTS)}.",
+        "",
+        "Preferred:",
+        f"Knowledge of {', '.join(preferred)}.",
+    ])
+
+def generate_skill_tables(candidates, jobs, seed=0, skills_file="skills.txt"):
+    """
+    Generate resume and job skill tables without parsing any documents.
+
+    Skill popularity follows a Zipf distribution over the dictionary, so a
+    few skills are common and most are rare, as in real resumes.
+
+    Args:
+        candidates (int): Resume rows
+        jobs (int): Job rows
+        seed (int): Random seed
+        skills_file (str): Skills dictionary
+
+    Returns:
+        tuple: (resume_df, job_df) with 'Candidate_ID'/'Job_ID' and 'Skills' columns
+    """
+    import pandas as pd
+
+    rng = random.Random(seed)
+    skills = load_skills(skills_file)
+    weights = [1 / (rank + 1) for rank in range(len(skills))]
+
+    def draw(low, high):
+        count = rng.randint(low, min(high, len(skills)))
+        chosen = set()
+        while len(chosen) < count:
+            chosen.update(rng.choices(skills, weights, k=count - len(chosen)))
+        return sorted(chosen)
+
+    resume_df = pd.DataFrame({
+        'Candidate_ID': [f"C{i}" for i in range(candidates)],
+        'Skills': [draw(5, 15) for _ in range(candidates)]
+    })
+    job_df = pd.DataFrame({
+        'Job_ID': [f"J{i}" for i in range(jobs)],
+        'Skills': [draw(4, 10) for _ in range(jobs)]
+    })
+    return resume_df, job_df
+
+def iter_resume_texts(count, seed=0, skills_file="skills.txt"):
+    """Yield `count` synthetic resume texts without touching disk."""
+    rng = random.Random(seed)
+    skills = load_skills(skills_file)
+    headers = load_section_headers()
+    for _ in range(count):
+        yield generate_resume_text(rng, skills, headers)
+
+# ------------ FILE WRITERS ----------------
+def write_txt(path, text):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+def write_docx(path, text):
+    from docx import Document
+
+    doc = Document()
+    for line in text.split("\n"):
+        doc.add_paragraph(line)
+    doc.save(path)
+
+def _pdf_escape(line):
+    line = line.encode("latin-1", "replace").decode("latin-1")
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+def write_pdf(path, text, lines_per_page=60):
+    """Write a plain text-only PDF (Helvetica, one line per text row)."""
+    lines = text.split("\n")
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+
+    # Object 1: catalog, 2: page tree, 3: font, then a page and content object per page
+    objects = [b"", b"", b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_ids = []
+    for page_lines in pages:
+        stream = "BT /F1 10 Tf 12 TL 50 790 Td " + " ".join(
+            f"({_pdf_escape(line)}) Tj T*" for line in page_lines
+        ) + " ET"
+        stream = stream.encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id
+        )
+        page_ids.append(len(objects))
+
+    objects[0] = b"<< /Type /Catalog /Pages 2 0 R >>"
+    kids = b" ".join(b"%d 0 R" % page_id for page_id in page_ids)
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_ids))
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref_offset = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1, xref_offset
+    )
+    with open(path, "wb") as f:
+        f.write(out)
+
+WRITERS = {"txt": write_txt, "docx": write_docx, "pdf": write_pdf}
+
+def generate_corpus(output_dir, count, formats=FORMATS, jobs=10, seed=0,
+                    skills_file="skills.txt", files_per_dir=1000):
+    """
+    Write a synthetic corpus of resumes and job descriptions to disk.
+
+    Resumes are spread over sub-directories of `files_per_dir` files and
+    formats are assigned round-robin, so large corpora stay browsable.
+
+    Args:
+        output_dir (str): Target directory
+        count (int): Number of resumes
+        formats (tuple): Any of "txt", "docx", "pdf"
+        jobs (int): Number of job descriptions
+        seed (int): Random seed
+        skills_file (str): Skills dictionary
+        files_per_dir (int): Resumes per sub-directory
+
+    Returns:
+        dict: Manifest with generation settings and job file paths
+    """
+    rng = random.Random(seed)
+    skills = load_skills(skills_file)
+    headers = load_section_headers()
+    output_dir = Path(output_dir)
+    (output_dir / "jobs").mkdir(parents=True, exist_ok=True)
+
+    for i in range(count):
+        fmt = formats[i % len(formats)]
+        shard_dir = output_dir / "resumes" / f"{i // files_per_dir:05d}"
+        shard_dir.mkdir(parents=True, exist_ok=True)
+        path = shard_dir / f"resume_{i:07d}.{fmt}"
+        WRITERS[fmt](path, generate_resume_text(rng, skills, headers))
+
+    job_files = []
+    for i in range(jobs):
+        path = output_dir / "jobs" / f"job_{i:04d}.txt"
+        write_txt(path, generate_job_text(rng, skills))
+        job_files.append(str(path))
+
+    manifest = {"seed": seed, "count": count, "formats": list(formats),
+                "files_per_dir": files_per_dir, "jobs": job_files}
+    with open(output_dir / "manifest.json", "w") as f:
+        json.dump(manifest, f)
+    return manifest
+
+def iter_resume_files(corpus_dir):
+    """Yield resume file paths of a generated corpus in generation order."""
+    resumes_dir = Path(corpus_dir) / "resumes"
+    for shard_dir in sorted(resumes_dir.iterdir()):
+        for path in sorted(shard_dir.iterdir()):
+            yield str(path)
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic resume corpus")
+    parser.add_argument("--output-dir", default="synthetic_corpus")
+    parser.add_argument("--count", type=int, default=100, help="Number of resumes (10 to 1,000,000)")
+    parser.add_argument("--formats", nargs="+", choices=FORMATS, default=list(FORMATS))
+    parser.add_argument("--jobs", type=int, default=10, help="Number of job descriptions")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    manifest = generate_corpus(args.output_dir, args.count, tuple(args.formats), args.jobs, args.seed)
+    print(f"✅ Generated {manifest['count']} resumes and {len(manifest['jobs'])} jobs in {args.output_dir}")
+
+if __name__ == "__main__":
+    main()
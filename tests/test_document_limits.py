@@ -0,0 +1,59 @@
+# test_document_limits.py
+
+import io
+import time
+import pytest
+from document_limits import DocumentLimits, DocumentRejected
+
+def test_oversized_buffer_is_rejected():
+    limits = DocumentLimits(max_bytes=10)
+    with pytest.raises(DocumentRejected) as caught:
+        limits.check_bytes(io.BytesIO(b"x" * 11), "big.pdf")
+    assert caught.value.reason == "bytes"
+    assert "big.pdf" in str(caught.value)
+
+def test_oversized_file_is_rejected(tmp_path):
+    path = tmp_path / "big.txt"
+    path.write_bytes(b"x" * 11)
+    with pytest.raises(DocumentRejected) as caught:
+        DocumentLimits(max_bytes=10).check_bytes(str(path))
+    assert caught.value.reason == "bytes"
+
+def test_size_check_rewinds_and_can_be_disabled():
+    buffer = io.BytesIO(b"x" * 11)
+    DocumentLimits(max_bytes=11).check_bytes(buffer)
+    assert buffer.tell() == 0
+    DocumentLimits(max_bytes=0).check_bytes(io.BytesIO(b"x" * 100))
+
+def test_deadline_interrupts_code_that_swallows_exceptions():
+    limits = DocumentLimits(max_seconds=0.2)
+    started = time.monotonic()
+    with pytest.raises(DocumentRejected) as caught:
+        with limits.deadline("slow.pdf"):
+            while True:
+                try:
+                    time.sleep(0.01)
+                except Exception:
+                    pass
+    assert caught.value.reason == "timeout"
+    assert time.monotonic() - started < 2
+
+def test_nested_deadlines_share_the_outer_one():
+    limits = DocumentLimits(max_seconds=5)
+    with limits.deadline("outer"):
+        outer = limits.remaining_seconds()
+        with limits.deadline("inner"):
+            assert limits.remaining_seconds() <= outer
+    assert limits.remaining_seconds() is None
+
+def test_rejection_survives_pickling():
+    import pickle
+    error = pickle.loads(pickle.dumps(DocumentRejected("timeout", "slow")))
+    assert (error.reason, error.message) == ("timeout", "slow")
+
+def test_pages_and_chars_are_truncated_not_rejected():
+    limits = DocumentLimits(max_pages=3, max_chars=5)
+    assert limits.page_limit(10) == 3
+    assert limits.page_limit(2) == 2
+    assert limits.truncate("abcdefgh") == "abcde"
+    assert DocumentLimits(max_pages=0).page_limit(10) == 10
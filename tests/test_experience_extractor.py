@@ -0,0 +1,29 @@
+# test_experience_extractor.py
+
+from datetime import datetime
+import pytest
+from experience_extractor import role_duration
+
+TODAY = datetime(2021, 12, 15)
+
+@pytest.mark.parametrize("text, start", [
+    ("Jan 2020 - Present", (2020, 1)),
+    ("Jan 2020 till date", (2020, 1)),
+    ("Jan 2020 to date", (2020, 1)),
+    ("May 2020 until ongoing", (2020, 5)),
+    ("Sept. 2019 - now", (2019, 9)),
+])
+def test_open_ended_ranges_run_to_today(text, start):
+    year, month = start
+    start_index = year * 12 + month - 1
+    end_index = TODAY.year * 12 + TODAY.month - 1
+    assert role_duration(text, today=TODAY) == (start_index, end_index, end_index - start_index + 1)
+
+def test_closed_range_is_inclusive():
+    assert role_duration("Jan 2020 - Dec 2020", today=TODAY)[2] == 12
+
+def test_year_only_end_counts_the_whole_year():
+    assert role_duration("2018 to 2020", today=TODAY)[2] == 36
+
+def test_date_label_is_not_a_range():
+    assert role_duration("Date of joining: Jan 2020 - Mar 2021", today=TODAY)[2] == 15
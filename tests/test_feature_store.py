@@ -0,0 +1,68 @@
+# test_feature_store.py
+
+import random
+import pandas as pd
+import pytest
+from feature_store import FeatureStore, rank_candidates_from_store
+from resume_job_matcher import rank_candidates
+
+SKILLS = [
+    "machine learning", "machine vision", "deep learning", "data analysis",
+    "data visualization", "cloud computing", "python", "java", "sql", "aws"
+]
+COLUMNS = ["Job_ID", "Candidate_ID", "Rank", "Match_Score", "Similarity_Score", "Final_Score",
+           "Matching_Skills", "Missing_Skills"]
+
+def random_tables(rng, candidates, jobs):
+    resume_df = pd.DataFrame({
+        "Candidate_ID": [f"C{i}" for i in range(candidates)],
+        "Skills": [rng.sample(SKILLS, rng.randint(0, 4)) for _ in range(candidates)]
+    })
+    job_df = pd.DataFrame({
+        "Job_ID": [f"J{i}" for i in range(jobs)],
+        "Skills": [rng.sample(SKILLS, rng.randint(1, 4)) for _ in range(jobs)]
+    })
+    return resume_df, job_df
+
+def build_store(directory, resume_df, shard_sizes):
+    store = FeatureStore(directory)
+    start = 0
+    for size in shard_sizes:
+        store.append(resume_df.iloc[start:start + size].reset_index(drop=True))
+        start += size
+    return store
+
+@pytest.mark.parametrize("seed", range(20))
+def test_store_ranking_matches_rank_candidates(tmp_path, seed):
+    rng = random.Random(seed)
+    shard_sizes = [rng.randint(1, 15) for _ in range(rng.randint(2, 5))]
+    resume_df, job_df = random_tables(rng, sum(shard_sizes), rng.randint(1, 3))
+    top_k = rng.choice([1, 3, 10, 100])
+    store = build_store(tmp_path / "store", resume_df, shard_sizes)
+
+    expected = rank_candidates(resume_df, job_df, top_k=top_k)
+    ranked = rank_candidates_from_store(store, job_df, top_k=top_k)
+
+    assert len(store) == len(resume_df)
+    assert ranked[COLUMNS].to_dict("records") == expected[COLUMNS].to_dict("records")
+
+def test_reopened_store_keeps_shards(tmp_path):
+    resume_df, job_df = random_tables(random.Random(1), 20, 2)
+    build_store(tmp_path / "store", resume_df, [7, 6, 7])
+
+    store = FeatureStore(tmp_path / "store")
+    assert len(list(store.shards())) == 3
+    assert store.locate("C8") == (list(store.shards())[1].name, 1)
+    expected = rank_candidates(resume_df, job_df, top_k=5)
+    assert rank_candidates_from_store(store, job_df, top_k=5)[COLUMNS].to_dict("records") == \
+        expected[COLUMNS].to_dict("records")
+
+def test_row_mask_from_bitmap_index(tmp_path):
+    resume_df, job_df = random_tables(random.Random(2), 30, 2)
+    store = build_store(tmp_path / "store", resume_df, [10, 10, 10])
+    mask = store.bitmap_index().evaluate("python")
+
+    selected = resume_df[[("python" in skills) for skills in resume_df["Skills"]]].reset_index(drop=True)
+    expected = rank_candidates(selected, job_df, top_k=5)
+    ranked = rank_candidates_from_store(store, job_df, top_k=5, row_mask=mask)
+    assert ranked[COLUMNS].to_dict("records") == expected[COLUMNS].to_dict("records")
@@ -0,0 +1,54 @@
+# test_fuzzy_skills.py
+
+import pytest
+from entity_extractor import extract_skills
+from fuzzy_skills import FuzzySkillIndex, osa_distance
+
+SKILLS = ["python", "javascript", "kubernetes", "machine learning", "nodejs", "reactjs", "react", "scala", "spark"]
+
+@pytest.fixture(scope="module")
+def index():
+    return FuzzySkillIndex(SKILLS)
+
+@pytest.mark.parametrize("token, expected", [
+    ("pyhton", "python"),         # adjacent transposition is one edit
+    ("Javscript", "javascript"),
+    ("kubernets", "kubernetes"),
+    ("kuberentes", "kubernetes"),
+    ("machne", "machine"),
+    ("reactjss", "reactjs"),
+    ("python", "python"),
+])
+def test_corrections(index, token, expected):
+    assert index.correct(token) == expected
+
+@pytest.mark.parametrize("token", [
+    "nodes",    # five letters: never corrected into the six-letter "nodejs"
+    "reacts",   # common word, excluded
+    "reach",    # short dictionary words only match exactly
+    "scale",
+    "spare",
+    "pythonista",
+    "query",
+])
+def test_non_corrections(index, token):
+    assert index.correct(token) is None
+
+def test_normalize_keeps_other_text(index):
+    assert index.normalize("Built Pyhton tools, managed nodes.") == "Built python tools, managed nodes."
+
+@pytest.mark.parametrize("text", [
+    "managed cluster nodes and pods",
+    "graph nodes and edges",
+    "i like reacts",
+])
+def test_resume_text_gains_no_skills(text):
+    assert "nodejs" not in extract_skills(text)
+    assert "reactjs" not in extract_skills(text)
+
+def test_resume_misspellings_are_matched():
+    assert {"python", "javascript", "mongodb"} <= set(extract_skills("Pyhton, Javscript and MongDB"))
+
+def test_osa_distance_limit():
+    assert osa_distance("kitten", "sitting", 3) == 3
+    assert osa_distance("kitten", "sitting", 2) is None
@@ -0,0 +1,33 @@
+# test_profiling.py
+
+import threading
+import pytest
+from profiling import StageProfiler
+
+def test_other_threads_are_ignored(tmp_path):
+    profiler = StageProfiler(tmp_path, mode="cprofile")
+
+    def work():
+        profiler.stage_started("extract")
+        profiler.stage_finished("extract")
+        profiler.document_finished("doc", {"total": 1.0})
+
+    thread = threading.Thread(target=work)
+    thread.start()
+    thread.join()
+    assert profiler.profiles == {}
+    assert profiler.slowest == []
+
+    profiler.stage_started("extract")
+    profiler.stage_finished("extract")
+    profiler.document_finished("doc", {"total": 1.0, "extract": 1.0})
+    assert list(profiler.profiles) == ["extract"]
+    assert profiler.slowest_documents()[0]["document"] == "doc"
+
+def test_start_requires_main_thread(tmp_path):
+    profiler = StageProfiler(tmp_path, mode="cprofile")
+    errors = []
+    thread = threading.Thread(target=lambda: errors.append(pytest.raises(RuntimeError, profiler.start)))
+    thread.start()
+    thread.join()
+    assert len(errors) == 1
@@ -0,0 +1,29 @@
+# test_resume_record.py
+
+import threading
+from resume_record import SkillVocabulary
+
+def test_intern_is_case_aware():
+    vocabulary = SkillVocabulary()
+    ids = vocabulary.encode(["Python", "python", "SQL"])
+    assert vocabulary.decode(ids) == ["Python", "python", "SQL"]
+    assert vocabulary.lower_set(ids[:2]) == {vocabulary.intern("python")}
+
+def test_concurrent_intern_gives_distinct_ids():
+    vocabulary = SkillVocabulary()
+    skills = [f"Skill{i}" for i in range(2000)]
+
+    def work(offset):
+        for skill in skills[offset:] + skills[:offset]:
+            vocabulary.intern(skill)
+
+    threads = [threading.Thread(target=work, args=(i * 250,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Each mixed-case skill plus its lowercased form
+    assert len(vocabulary.skills) == 2 * len(skills)
+    assert all(vocabulary.skills[vocabulary.ids[skill]] == skill for skill in skills)
+    assert all(vocabulary.skills[vocabulary.lower_ids[vocabulary.ids[skill]]] == skill.lower() for skill in skills)
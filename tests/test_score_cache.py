@@ -0,0 +1,64 @@
+# test_score_cache.py
+
+import sqlite3
+from score_cache import ScoreCache, job_score_key
+
+def test_lru_evicts_least_recently_used():
+    cache = ScoreCache(max_entries=2)
+    cache.put(("a", "job", "1"), (0.1, 0.2))
+    cache.put(("b", "job", "1"), (0.3, 0.4))
+    # Touching "a" makes "b" the least recently used
+    assert cache.get(("a", "job", "1")) == (0.1, 0.2)
+    cache.put(("c", "job", "1"), (0.5, 0.6))
+
+    assert len(cache) == 2
+    assert cache.get(("b", "job", "1")) is None
+    assert cache.get(("a", "job", "1")) == (0.1, 0.2)
+    assert cache.get(("c", "job", "1")) == (0.5, 0.6)
+    assert (cache.hits, cache.misses) == (3, 1)
+
+def test_disk_tier_serves_evicted_and_restarted(tmp_path):
+    path = str(tmp_path / "scores.db")
+    cache = ScoreCache(max_entries=1, path=path)
+    cache.put(("a", "job", "1"), (0.1, 0.2))
+    cache.put(("b", "job", "1"), (0.3, 0.4))
+    cache.flush()
+    # Evicted from memory, read back from SQLite
+    assert cache.get(("a", "job", "1")) == (0.1, 0.2)
+    cache.close()
+
+    reopened = ScoreCache(max_entries=10, path=path)
+    assert reopened.get(("b", "job", "1")) == (0.3, 0.4)
+    assert reopened.get(("b", "job", "2")) is None
+    reopened.close()
+
+def test_nothing_reaches_disk_before_flush(tmp_path):
+    path = str(tmp_path / "scores.db")
+    cache = ScoreCache(path=path)
+    cache.put(("a", "job", "1"), (0.1, 0.2))
+    assert ScoreCache(path=path).get(("a", "job", "1")) is None
+    cache.close()
+    assert ScoreCache(path=path).get(("a", "job", "1")) == (0.1, 0.2)
+
+def test_locked_file_does_not_fail_flush(tmp_path):
+    path = str(tmp_path / "scores.db")
+    cache = ScoreCache(path=path)
+    cache.disk.close()
+    cache.disk = sqlite3.connect(path, timeout=0.05, check_same_thread=False)
+    lock = sqlite3.connect(path)
+    lock.execute("BEGIN EXCLUSIVE")
+
+    cache.put(("a", "job", "1"), (0.1, 0.2))
+    cache.flush()
+    assert cache.get(("z", "job", "1")) is None
+
+    lock.rollback()
+    lock.close()
+    cache.close()
+    assert ScoreCache(path=path).get(("a", "job", "1")) == (0.1, 0.2)
+
+def test_job_key_ignores_term_and_skill_order():
+    first = {"skills": ["python", "sql"], "terms": {"python": 1, "sql": 2}}
+    second = {"skills": ["sql", "python"], "terms": {"sql": 2, "python": 1}}
+    assert job_score_key(first) == job_score_key(second)
+    assert job_score_key(first) != job_score_key({**first, "skills": ["python"]})
@@ -0,0 +1,111 @@
+# test_skill_filter.py
+
+import random
+import numpy as np
+import pytest
+from skill_filter import CandidateBitmapIndex, parse_filter
+
+# ------------ PARSER ----------------
+def test_and_binds_tighter_than_or():
+    assert parse_filter("python OR java AND sql") == (
+        "or", ("term", "skill", "python"), ("and", ("term", "skill", "java"), ("term", "skill", "sql"))
+    )
+
+def test_parentheses_and_not():
+    assert parse_filter("NOT (aws OR gcp) AND python") == (
+        "and",
+        ("not", ("or", ("term", "skill", "aws"), ("term", "skill", "gcp"))),
+        ("term", "skill", "python")
+    )
+
+def test_consecutive_words_form_one_term():
+    assert parse_filter("Machine Learning AND sql") == (
+        "and", ("term", "skill", "machine learning"), ("term", "skill", "sql")
+    )
+
+def test_quotes_keep_keywords_literal():
+    assert parse_filter('"and" OR "not"') == ("or", ("term", "skill", "and"), ("term", "skill", "not"))
+
+def test_quoted_field_value():
+    assert parse_filter('NOT education:"B.Tech"') == ("not", ("term", "education", "btech"))
+    assert parse_filter('edu:"high school"') == ("term", "education", "high school")
+
+@pytest.mark.parametrize("query, expected", [
+    ("experience >= 24", ("compare", "experience_months", ">=", 24.0)),
+    ("experience>24", ("compare", "experience_months", ">", 24.0)),
+    ("experience_months < 6.5", ("compare", "experience_months", "<", 6.5)),
+    ("experience = 0", ("compare", "experience_months", "=", 0.0)),
+])
+def test_experience_comparisons(query, expected):
+    assert parse_filter(query) == expected
+
+@pytest.mark.parametrize("query", [
+    "python AND", "(python OR java", "python )", "AND python", "NOT", "experience >= many",
+    'python "unclosed', "python >= 3", ""
+])
+def test_syntax_errors(query):
+    with pytest.raises(ValueError):
+        parse_filter(query)
+
+# ------------ BITMAP INDEX ----------------
+def test_evaluate_terms_and_not():
+    index = CandidateBitmapIndex()
+    index.add(["Python", "SQL"], ["B.Tech"], 30)
+    index.add(["Java"], None, 12)
+    index.add(["python", "AWS"], ["MCA"], None)
+
+    assert index.evaluate("python").tolist() == [True, False, True]
+    assert index.evaluate("NOT python").tolist() == [False, True, False]
+    assert index.evaluate("python AND NOT edu:btech").tolist() == [False, False, True]
+    assert index.evaluate("java OR aws").tolist() == [False, True, True]
+    assert index.evaluate("unknown").tolist() == [False, False, False]
+    assert index.evaluate("NOT unknown").tolist() == [True, True, True]
+    # Unknown experience never satisfies a comparison
+    assert index.evaluate("experience >= 12").tolist() == [True, True, False]
+    assert index.evaluate("NOT experience >= 12").tolist() == [False, False, True]
+    assert index.filter("python OR java").tolist() == [0, 1, 2]
+
+def _evaluate_by_hand(node, row):
+    kind = node[0]
+    if kind == "term":
+        return node[2] in row[node[1]]
+    if kind == "and":
+        return _evaluate_by_hand(node[1], row) and _evaluate_by_hand(node[2], row)
+    if kind == "or":
+        return _evaluate_by_hand(node[1], row) or _evaluate_by_hand(node[2], row)
+    if kind == "not":
+        return not _evaluate_by_hand(node[1], row)
+    months = row["experience_months"]
+    return months is not None and {">=": months >= node[3], "<": months < node[3]}[node[2]]
+
+SKILLS = ["python", "java", "sql", "aws", "gcp"]
+QUERIES = [
+    "python AND NOT java", "sql OR (aws AND gcp)", "NOT (python OR sql)",
+    "python AND experience >= 24", "NOT gcp OR experience < 12"
+]
+
+@pytest.mark.parametrize("seed", range(20))
+def test_adding_after_compress_resizes_bitmaps(seed):
+    rng = random.Random(seed)
+    index, rows = CandidateBitmapIndex(), []
+    # Several rounds of adds, each followed by a compress, so bitmaps written
+    # for fewer candidates are padded to the grown index
+    for _ in range(rng.randint(2, 4)):
+        for _ in range(rng.randint(1, 30)):
+            skills = rng.sample(SKILLS, rng.randint(0, 3))
+            months = rng.choice([None, rng.randint(0, 60)])
+            index.add(skills, None, months)
+            rows.append({"skill": set(skills), "education": set(), "experience_months": months})
+        index.compress()
+
+    for query in QUERIES:
+        expected = [_evaluate_by_hand(parse_filter(query), row) for row in rows]
+        assert index.evaluate(query).tolist() == expected
+
+def test_add_postings_grows_index():
+    index = CandidateBitmapIndex.from_skill_lists([["python"], ["java"]])
+    index.compress()
+    index.add_postings("skill", "python", np.array([3, 9]), 10)
+    assert index.size == 10
+    assert index.filter("python").tolist() == [0, 3, 9]
+    assert index.filter("NOT python AND NOT java").tolist() == [2, 4, 5, 6, 7, 8]
@@ -0,0 +1,54 @@
+# test_top_k_pruning.py
+
+import random
+import pandas as pd
+import pytest
+from resume_job_matcher import rank_candidates
+
+# Multi-word skills sharing words, so candidates without any of a job's
+# skills can still score through the similarity term
+SKILLS = [
+    "machine learning", "machine vision", "deep learning", "data analysis",
+    "data visualization", "cloud computing", "edge computing", "python", "java", "sql"
+]
+
+def random_tables(rng, candidates, jobs):
+    resume_df = pd.DataFrame({
+        "Candidate_ID": [f"C{i}" for i in range(candidates)],
+        "Skills": [rng.sample(SKILLS, rng.randint(0, 4)) for _ in range(candidates)]
+    })
+    job_df = pd.DataFrame({
+        "Job_ID": [f"J{i}" for i in range(jobs)],
+        "Skills": [rng.sample(SKILLS, rng.randint(1, 4)) for _ in range(jobs)]
+    })
+    return resume_df, job_df
+
+@pytest.mark.parametrize("seed", range(200))
+def test_pruned_ranking_matches_exhaustive(seed):
+    rng = random.Random(seed)
+    resume_df, job_df = random_tables(rng, rng.randint(1, 40), rng.randint(1, 3))
+    top_k = rng.choice([1, 3, 5, 10, 50])
+
+    expected = rank_candidates(resume_df, job_df, top_k=top_k)
+    pruned = rank_candidates(resume_df, job_df, top_k=top_k, prune=True)
+
+    assert len(pruned) == len(job_df) * min(top_k, len(resume_df))
+    columns = ["Job_ID", "Candidate_ID", "Rank", "Match_Score", "Similarity_Score", "Final_Score",
+               "Matching_Skills", "Missing_Skills"]
+    assert pruned[columns].to_dict("records") == expected[columns].to_dict("records")
+
+def test_candidates_without_job_skills_are_ranked():
+    # Only shared terms ("machine") connect the job to these candidates
+    resume_df = pd.DataFrame({
+        "Candidate_ID": ["C0", "C1", "C2"],
+        "Skills": [["machine vision"], ["java"], ["machine learning"]]
+    })
+    job_df = pd.DataFrame({"Job_ID": ["J0"], "Skills": [["machine learning"]]})
+
+    pruned = rank_candidates(resume_df, job_df, top_k=3, prune=True)
+    assert list(pruned["Candidate_ID"]) == ["C2", "C0", "C1"]
+
+def test_prune_requires_top_k():
+    resume_df, job_df = random_tables(random.Random(0), 5, 1)
+    with pytest.raises(ValueError):
+        rank_candidates(resume_df, job_df, prune=True)
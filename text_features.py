@@ -0,0 +1,50 @@
+# text_features.py
+
+import math
+import re
+from collections import Counter
+
+# Same token rule as sklearn's CountVectorizer default, so scores computed
+# from these counts match the vectorizer-based cosine similarity exactly.
+TOKEN_PATTERN = re.compile(r"(?u)\b\w\w+\b")
+
+def term_counts(text, stop_words=None):
+    """
+    Count lowercased word tokens in a text.
+
+    Args:
+        text (str): Input text
+        stop_words (set): Optional set of tokens to drop
+
+    Returns:
+        Counter: Token counts
+    """
+    tokens = TOKEN_PATTERN.findall(text.lower()) if text else []
+    if stop_words:
+        tokens = [token for token in tokens if token not in stop_words]
+    return Counter(tokens)
+
+def vector_norm(counts):
+    """Return the Euclidean norm of a term-count mapping."""
+    return math.sqrt(sum(value * value for value in counts.values()))
+
+def cosine_from_counts(counts_a, norm_a, counts_b, norm_b):
+    """
+    Cosine similarity between two term-count mappings.
+
+    Args:
+        counts_a (dict): Term counts of the first document
+        norm_a (float): Precomputed norm of counts_a
+        counts_b (dict): Term counts of the second document
+        norm_b (float): Precomputed norm of counts_b
+
+    Returns:
+        float: Similarity (0-1)
+    """
+    if not norm_a or not norm_b:
+        return 0.0
+    # Iterate over the smaller mapping
+    if len(counts_a) > len(counts_b):
+        counts_a, counts_b = counts_b, counts_a
+    dot = sum(value * counts_b.get(term, 0) for term, value in counts_a.items())
+    return dot / (norm_a * norm_b)
@@ -0,0 +1,420 @@
+# top_k_pruning.py
+
+import argparse
+import json
+import time
+import numpy as np
+import pandas as pd
+from shared_scoring import MATCH_WEIGHT, SIMILARITY_WEIGHT, build_feature_matrix, encode_job, top_k_indices
+from skill_table import build_skill_profile
+
+# Bounds are summed in a different order than exact scores; the margin keeps
+# float rounding from ever pruning a candidate that ties the k-th score
+BOUND_SLACK = 1e-9
+# The first threshold comes from the rarest skills' lists, read until they
+# hold SEED_POSTINGS * k entries; at most SEED_ROWS * k of their candidates are scored
+SEED_POSTINGS = 200
+SEED_ROWS = 20
+
+class PrunedTopKIndex:
+    def __init__(self, resume_profiles, batch_size=1024):
+        """
+        Candidate index answering top-k queries without scoring every candidate.
+
+        A final score is MATCH_WEIGHT * (job skills the candidate has) /
+        (job skills) plus SIMILARITY_WEIGHT * cosine. Each job skill's
+        posting list can therefore add at most MATCH_WEIGHT / (job skills),
+        and the cosine of a resume with norm |r| is at most
+        min(1, sum over job terms of count * (largest resume count of the
+        term) / (|job| * |r|)). A query works like MaxScore/WAND:
+
+        1. Candidates of the job's rarest skills are scored exactly to get a
+           first k-th score (the threshold).
+        2. The most common job skills, whose bounds plus the similarity
+           bound sum below the threshold, are "non-essential": a candidate
+           with none of the other skills cannot reach the top k, so their
+           (long) posting lists are never walked.
+        3. Candidates of the essential skills are bounded by the skills
+           counted so far plus the bounds still open. Each non-essential
+           skill is then looked up only for the candidates whose bound still
+           reaches the threshold. While shared terms alone can still reach
+           the threshold (or fewer than k candidates set it), candidates
+           with none of the job's skills are bounded the same way.
+        4. The survivors are scored exactly in batches, best bound first.
+           The threshold rises as better candidates are found, and the scan
+           stops as soon as the next bound falls below it.
+
+        Frequent skills also get a packed membership bitset (whenever it is
+        smaller than their posting list) for those lookups, and postings
+        are kept row-major as well to score the few candidates that are
+        kept. Results (scores, order and ties) are identical to exhaustive
+        scoring.
+
+        Args:
+            resume_profiles (list): build_skill_profile outputs, in candidate order
+            batch_size (int): Candidates scored exactly per step
+        """
+        arrays, self.skill_vocabulary, self.term_vocabulary = build_feature_matrix(resume_profiles)
+        self.size = len(resume_profiles)
+        self.batch_size = batch_size
+        self.skill_indptr = arrays["skill_indptr"]
+        self.skill_rows = arrays["skill_rows"]
+        self.term_indptr = arrays["term_indptr"]
+        self.term_rows = arrays["term_rows"]
+        self.term_data = arrays["term_data"]
+        self.norms = arrays["norms"]
+        self.row_skill_indptr, self.row_skills, _ = _transpose(self.skill_indptr, self.skill_rows, self.size)
+        self.row_term_indptr, self.row_terms, self.row_term_data = _transpose(
+            self.term_indptr, self.term_rows, self.size, self.term_data
+        )
+        # Largest count of each term in any resume, and the smallest non-zero resume norm
+        self.term_max_count = np.zeros(len(self.term_vocabulary))
+        if len(self.term_rows):
+            self.term_max_count = np.maximum.reduceat(self.term_data, self.term_indptr[:-1])
+        self.min_norm = self.norms[self.norms > 0].min() if (self.norms > 0).any() else 0.0
+        self.inverse_norms = np.zeros(self.size)
+        np.divide(1.0, self.norms, out=self.inverse_norms, where=self.norms > 0)
+        self.skill_bitsets = {}
+        for skill in range(len(self.skill_vocabulary)):
+            rows = self._skill_postings(skill)
+            if rows.nbytes > (self.size + 7) // 8:
+                flags = np.zeros(self.size, dtype=bool)
+                flags[rows] = True
+                self.skill_bitsets[skill] = np.packbits(flags, bitorder="little")
+
+    def encode_job(self, job_profile):
+        return encode_job(0, job_profile, self.skill_vocabulary, self.term_vocabulary)
+
+    def _skill_postings(self, skill):
+        return self.skill_rows[self.skill_indptr[skill]:self.skill_indptr[skill + 1]]
+
+    def _has_skill(self, skill, rows):
+        """Whether each candidate row has a skill."""
+        bits = self.skill_bitsets.get(skill)
+        if bits is None:
+            return _member(self._skill_postings(skill), rows)
+        return ((bits[rows >> 3] >> (rows & 7).astype(np.uint8)) & 1).astype(bool)
+
+    def _similarity_scale(self, job):
+        """A with cosine <= min(1, A / |r|) for every resume r (see the class docstring)."""
+        _, _, _, term_ids, term_counts, job_norm = job
+        if not job_norm or not len(term_ids):
+            return 0.0
+        return float(term_counts @ self.term_max_count[term_ids]) / job_norm
+
+    def _similarity_bounds(self, scale, rows):
+        """Per-candidate upper bound of SIMILARITY_WEIGHT * cosine."""
+        return SIMILARITY_WEIGHT * np.minimum(scale * self.inverse_norms[rows], 1.0)
+
+    def _skill_overlap(self, skill_mask, rows):
+        """Number of job skills each candidate row has."""
+        owners, positions = _gather(self.row_skill_indptr, rows)
+        return np.bincount(owners[skill_mask[self.row_skills[positions]]], minlength=len(rows))
+
+    def score_rows(self, job, rows, skill_mask=None):
+        """
+        Exact match, similarity and final scores of candidate rows.
+
+        Each candidate's term contributions are added in job term order, as
+        shared_scoring does, so the scores are bit-for-bit those of
+        exhaustive scoring.
+        """
+        _, skill_ids, skill_count, term_ids, term_counts, job_norm = job
+        n = len(rows)
+        if skill_mask is None:
+            skill_mask = _mask(skill_ids, len(self.skill_vocabulary))
+        overlap = self._skill_overlap(skill_mask, rows).astype(np.float64)
+        match = overlap / skill_count if skill_count else np.zeros(n)
+
+        # Position of each vocabulary term in the job (-1 if absent)
+        job_positions = np.full(len(self.term_vocabulary), -1)
+        job_positions[term_ids] = np.arange(len(term_ids))
+        owners, positions = _gather(self.row_term_indptr, rows)
+        entry_positions = job_positions[self.row_terms[positions]]
+        shared = entry_positions >= 0
+        owners, positions, entry_positions = owners[shared], positions[shared], entry_positions[shared]
+        order = np.argsort(entry_positions, kind="stable")
+        weights = self.row_term_data[positions] * term_counts[entry_positions]
+        dot = np.bincount(owners[order], weights=weights[order], minlength=n)
+
+        similarity = np.zeros(n)
+        norms = self.norms[rows]
+        if job_norm:
+            np.divide(dot, norms * job_norm, out=similarity, where=norms > 0)
+        return match, similarity, MATCH_WEIGHT * match + SIMILARITY_WEIGHT * similarity
+
+    def score_all(self, job):
+        """Exhaustive scores of every candidate (the baseline the pruned query is checked against)."""
+        _, skill_ids, skill_count, term_ids, term_counts, job_norm = job
+        n = self.size
+        hits = [self._skill_postings(skill) for skill in skill_ids]
+        overlap = np.bincount(np.concatenate(hits) if hits else np.zeros(0, dtype=np.int64), minlength=n)
+        match = overlap.astype(np.float64) / skill_count if skill_count else np.zeros(n)
+
+        rows, weights = [], []
+        for term, count in zip(term_ids, term_counts):
+            start, end = self.term_indptr[term], self.term_indptr[term + 1]
+            rows.append(self.term_rows[start:end])
+            weights.append(self.term_data[start:end] * count)
+        dot = np.bincount(
+            np.concatenate(rows) if rows else np.zeros(0, dtype=np.int64),
+            weights=np.concatenate(weights) if weights else None, minlength=n
+        )
+        similarity = np.zeros(n)
+        if job_norm:
+            np.divide(dot, self.norms * job_norm, out=similarity, where=self.norms > 0)
+        return match, similarity, MATCH_WEIGHT * match + SIMILARITY_WEIGHT * similarity
+
+    def top_k(self, job, k):
+        """
+        Best k candidates of one encoded job.
+
+        Returns:
+            tuple: (rows, match, similarity, final) arrays, best first with
+                ties in row order, and a stats dict ('scored': candidates
+                scored exactly, 'postings': posting entries read)
+        """
+        _, skill_ids, skill_count, _, _, _ = job
+        if k >= self.size or not len(skill_ids):
+            # Without known skills every candidate is bounded only by the similarity
+            match, similarity, final = self.score_all(job)
+            top = top_k_indices(final, k)
+            postings = int(self.skill_indptr[skill_ids + 1].sum() - self.skill_indptr[skill_ids].sum())
+            return (top, match[top], similarity[top], final[top]), {"scored": self.size, "postings": postings}
+
+        skill_mask = _mask(skill_ids, len(self.skill_vocabulary))
+        skill_bound = MATCH_WEIGHT / skill_count
+        scale = self._similarity_scale(job)
+        similarity_bound = SIMILARITY_WEIGHT * min(1.0, scale / self.min_norm) if self.min_norm else 0.0
+        # Rarest skills first
+        skills = sorted(skill_ids, key=lambda skill: len(self._skill_postings(skill)))
+
+        # 1. First threshold from the candidates of the rarest skills
+        seed_count = 0
+        for used, skill in enumerate(skills, 1):
+            seed_count += len(self._skill_postings(skill))
+            if seed_count >= SEED_POSTINGS * k:
+                break
+        seeds, seed_hits = np.unique(
+            np.concatenate([self._skill_postings(skill) for skill in skills[:used]]), return_counts=True
+        )
+        if len(seeds) > SEED_ROWS * k:
+            # Candidates with several of the rarest skills are the likeliest to rank high
+            seeds = np.sort(seeds[np.argsort(-seed_hits, kind="stable")[:SEED_ROWS * k]])
+        scored = [(seeds, *self.score_rows(job, seeds, skill_mask))]
+        threshold = _kth_score(scored, k)
+
+        # 2. The most common skills are non-essential while all they can add stays below the threshold
+        non_essential = 0
+        while (non_essential < len(skills) - 1
+               and (non_essential + 1) * skill_bound + similarity_bound + BOUND_SLACK < threshold):
+            non_essential += 1
+        essential, probed = skills[:len(skills) - non_essential], skills[len(skills) - non_essential:]
+
+        # 3. Bound the candidates of the essential skills, looking up the others only while it matters
+        postings = sum(len(self._skill_postings(skill)) for skill in essential)
+        hits = np.bincount(
+            np.concatenate([self._skill_postings(skill) for skill in essential]), minlength=self.size
+        )
+        # Seeds are already scored
+        hits[seeds] = -1
+        remaining = len(probed)
+        if threshold <= similarity_bound + remaining * skill_bound + BOUND_SLACK:
+            # Shared terms alone can reach the threshold (or fewer than k seeds set it),
+            # so candidates without any of the job's skills stay in
+            needed = 0
+        else:
+            # Cheap cut with the job-wide similarity bound first (as a number of skills),
+            # then the per-candidate one
+            needed = max(np.floor((threshold - similarity_bound - BOUND_SLACK) / skill_bound) - remaining, 1)
+        candidates = np.flatnonzero(hits >= needed)
+        # Skills each candidate still lacks to reach the threshold; it stays in reach while
+        # that is at most the number of skills not looked up yet
+        gap = (threshold - BOUND_SLACK - self._similarity_bounds(scale, candidates)) / skill_bound - hits[candidates]
+        for skill in probed:
+            reachable = gap <= remaining
+            candidates, gap = candidates[reachable], gap[reachable]
+            gap -= self._has_skill(skill, candidates)
+            remaining -= 1
+        upper = threshold - gap * skill_bound
+
+        # 4. Exact scores, best bound first, until no bound reaches the threshold
+        by_bound = np.argsort(-upper, kind="stable")
+        for start in range(0, len(by_bound), self.batch_size):
+            batch = by_bound[start:start + self.batch_size]
+            batch = batch[upper[batch] >= threshold]
+            if not len(batch):
+                break
+            batch_rows = candidates[batch]
+            scored.append((batch_rows, *self.score_rows(job, batch_rows, skill_mask)))
+            threshold = _kth_score(scored, k)
+
+        rows, match, similarity, final = (np.concatenate(column) for column in zip(*scored))
+        # Best score first, earlier candidates first on ties (as top_k_indices)
+        best = np.lexsort((rows, -final))[:k]
+        stats = {"scored": len(rows), "postings": postings + seed_count}
+        return (rows[best], match[best], similarity[best], final[best]), stats
+
+def _mask(ids, size):
+    mask = np.zeros(size, dtype=bool)
+    mask[ids] = True
+    return mask
+
+def _transpose(indptr, rows, n, data=None):
+    """Turn column-major postings into row-major (indptr, feature IDs, data) arrays."""
+    features = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+    order = np.argsort(rows, kind="stable")
+    row_indptr = np.zeros(n + 1, dtype=np.int64)
+    row_indptr[1:] = np.cumsum(np.bincount(rows, minlength=n))
+    return row_indptr, features[order], data[order] if data is not None else None
+
+def _gather(indptr, rows):
+    """(index into rows, entry position) of every stored entry of the given CSR rows."""
+    starts = indptr[rows]
+    lengths = indptr[rows + 1] - starts
+    owners = np.repeat(np.arange(len(rows)), lengths)
+    offsets = np.arange(len(owners)) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    return owners, np.repeat(starts, lengths) + offsets
+
+def _member(postings, rows):
+    """Whether each row is in a sorted posting list."""
+    if not len(postings):
+        return np.zeros(len(rows), dtype=bool)
+    positions = np.minimum(np.searchsorted(postings, rows), len(postings) - 1)
+    return postings[positions] == rows
+
+def _kth_score(scored, k):
+    """k-th best final score among the candidates scored so far (0 if fewer)."""
+    finals = np.concatenate([batch[3] for batch in scored])
+    if len(finals) < k:
+        return 0.0
+    return float(np.partition(finals, len(finals) - k)[len(finals) - k])
+
+def rank_candidates_pruned(resume_df, job_df, top_k, index=None):
+    """
+    Rank the top_k candidates per job, skipping candidates that cannot make the cut.
+
+    Scores and order are the same as resume_job_matcher.rank_candidates
+    with the same top_k, but only candidates whose score upper bound can
+    reach the current k-th best score are scored (see PrunedTopKIndex).
+
+    Args:
+        resume_df (pd.DataFrame): DataFrame with resume skills
+        job_df (pd.DataFrame): DataFrame with job skills
+        top_k (int): Candidates kept per job
+        index (PrunedTopKIndex): Prebuilt index over resume_df (built if omitted)
+
+    Returns:
+        pd.DataFrame: Rankings with the same columns as rank_candidates
+    """
+    candidate_ids = list(resume_df['Candidate_ID'])
+    resume_skills = list(resume_df['Skills'])
+    if index is None:
+        index = PrunedTopKIndex([build_skill_profile(skills) for skills in resume_skills])
+
+    results = []
+    for job_id, skills in zip(job_df['Job_ID'], job_df['Skills']):
+        job_profile = build_skill_profile(skills)
+        (rows, match, similarity, final), _ = index.top_k(index.encode_job(job_profile), top_k)
+        job_skills = job_profile['skills']
+        for rank, (row, row_match, row_similarity, row_final) in enumerate(
+                zip(rows, match, similarity, final), 1):
+            # Only the kept candidates' skills are parsed again
+            resume_skill_set = build_skill_profile(resume_skills[row])['skill_set']
+            results.append({
+                'Job_ID': job_id,
+                'Candidate_ID': candidate_ids[row],
+                'Match_Score': float(row_match),
+                'Similarity_Score': float(row_similarity),
+                'Final_Score': float(row_final),
+                'Matching_Skills': [s for s in job_skills if s in resume_skill_set],
+                'Missing_Skills': [s for s in job_skills if s not in resume_skill_set],
+                'Rank': rank
+            })
+    return pd.DataFrame(results)
+
+# ------------ BENCHMARK ----------------
+def benchmark(resume_df, job_df, top_k=50, batch_size=1024):
+    """
+    Time pruned top-k queries against exhaustive scoring on the same index.
+
+    Both sides use precomputed postings; the exhaustive side scores every
+    candidate with vectorized bincounts and keeps the top k. Every pruned
+    result is checked to be identical to the exhaustive one.
+
+    Returns:
+        dict: Latency summaries of both modes, speedup, and the fraction
+            of candidates the pruned mode scored exactly
+    """
+    from benchmark_suite import summarize_latencies
+
+    started = time.perf_counter()
+    index = PrunedTopKIndex([build_skill_profile(skills) for skills in resume_df['Skills']], batch_size)
+    build_s = time.perf_counter() - started
+
+    exhaustive_latencies, pruned_latencies, scored = [], [], []
+    for skills in job_df['Skills']:
+        job = index.encode_job(build_skill_profile(skills))
+
+        started = time.perf_counter()
+        match, similarity, final = index.score_all(job)
+        top = top_k_indices(final, top_k)
+        exhaustive_latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        (rows, _, _, pruned_final), stats = index.top_k(job, top_k)
+        pruned_latencies.append(time.perf_counter() - started)
+
+        if not (np.array_equal(rows, top) and np.array_equal(pruned_final, final[top])):
+            raise AssertionError("Pruned top-k differs from exhaustive scoring")
+        scored.append(stats["scored"] / index.size)
+
+    exhaustive = summarize_latencies(exhaustive_latencies)
+    pruned = summarize_latencies(pruned_latencies)
+    return {
+        "candidates": index.size,
+        "jobs": len(job_df),
+        "top_k": top_k,
+        "index_build_s": round(build_s, 3),
+        "exhaustive": exhaustive,
+        "pruned": pruned,
+        "speedup": round(exhaustive["total_s"] / pruned["total_s"], 2) if pruned["total_s"] else None,
+        "scored_fraction_mean": round(float(np.mean(scored)), 4),
+        "scored_fraction_max": round(float(np.max(scored)), 4)
+    }
+
+def main():
+    from resume_job_matcher import load_data
+    from synthetic_corpus import generate_skill_tables
+
+    parser = argparse.ArgumentParser(description="Benchmark pruned top-k ranking against exhaustive scoring")
+    parser.add_argument("--resume-skills", default=None, help="Resume skills table (synthetic if omitted)")
+    parser.add_argument("--job-skills", default=None, help="Job skills table (synthetic if omitted)")
+    parser.add_argument("--count", type=int, default=200000, help="Synthetic candidates")
+    parser.add_argument("--jobs", type=int, default=20, help="Synthetic jobs")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--top-k", type=int, default=50)
+    parser.add_argument("--batch-size", type=int, default=1024, help="Candidates scored exactly per step")
+    parser.add_argument("--output", default=None, help="Optional results JSON")
+    args = parser.parse_args()
+
+    if args.resume_skills and args.job_skills:
+        resume_df, job_df = load_data(args.resume_skills, args.job_skills)
+    else:
+        print(f"Generating {args.count} synthetic candidates and {args.jobs} jobs...")
+        resume_df, job_df = generate_skill_tables(args.count, args.jobs, args.seed)
+
+    results = benchmark(resume_df, job_df, args.top_k, args.batch_size)
+    for mode in ("exhaustive", "pruned"):
+        stats = results[mode]
+        print(f"{mode:<12}p50 {stats['p50_ms']:.2f} ms  p99 {stats['p99_ms']:.2f} ms  "
+              f"{stats['throughput_per_s']:.1f} queries/s")
+    print(f"Speedup {results['speedup']}x; scored {results['scored_fraction_mean']:.2%} of "
+          f"candidates on average ({results['scored_fraction_max']:.2%} at most)")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"✅ Benchmark results saved to {args.output}")
+
+if __name__ == "__main__":
+    main()
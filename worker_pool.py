@@ -0,0 +1,199 @@
+# worker_pool.py
+
+import gc
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from instrumentation import METRICS, peak_rss_mb
+
+# Parsed once before forking so every lazily built model, pattern and
+# segmenter already exists when the workers are created
+WARM_UP_TEXT = (
+    "John Smith\njohn.smith@example.com\n9876543210\n"
+    "Skills\nPython, SQL, Machine Learning\n"
+    "Experience\nData Engineer, Jan 2020 - Mar 2022\n"
+    "Education\nB.Tech Computer Science\n"
+)
+
+def preload_models():
+    """
+    Load the spaCy models and compile the skill and section patterns in this process.
+
+    The warm-up document is parsed with metrics disabled and no listeners,
+    so it never shows up in stage histograms, profiles or document counts.
+
+    Returns:
+        float: Seconds taken
+    """
+    started = time.perf_counter()
+    from resume_ranking_pipeline import process_resume_text
+
+    enabled, listeners = METRICS.enabled, METRICS.listeners
+    METRICS.disable()
+    METRICS.listeners = []
+    try:
+        process_resume_text(WARM_UP_TEXT)
+    finally:
+        METRICS.enabled, METRICS.listeners = enabled, listeners
+    return time.perf_counter() - started
+
+def memory_usage_mb():
+    """
+    Memory of this process in MB.
+
+    On Linux, "pss_mb" charges shared pages proportionally to each process
+    sharing them and "private_mb" counts pages only this process holds, so
+    copy-on-write sharing between forked workers is visible. Elsewhere only
+    the peak RSS is known.
+
+    Returns:
+        dict: rss_mb, and pss_mb/private_mb when available
+    """
+    try:
+        with open("/proc/self/smaps_rollup", "r") as f:
+            fields = {}
+            for line in f:
+                name, _, value = line.partition(":")
+                value = value.split()
+                if len(value) == 2 and value[1] == "kB":
+                    fields[name] = int(value[0])
+    except OSError:
+        return {"rss_mb": peak_rss_mb()}
+    private = fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0)
+    return {
+        "rss_mb": round(fields.get("Rss", 0) / 1024, 1),
+        "pss_mb": round(fields.get("Pss", 0) / 1024, 1),
+        "private_mb": round(private / 1024, 1)
+    }
+
+# ------------ WORKER PROCESS ----------------
+_worker_state = {}
+
+def _init_worker(started_at, preloaded, barrier, initializer, initargs):
+    """Record how long this worker took to become ready to process documents."""
+    if not preloaded:
+        # Without fork every worker has to load its own copy of the models
+        preload_models()
+    _worker_state["startup_s"] = time.monotonic() - started_at
+    _worker_state["barrier"] = barrier
+    if initializer is not None:
+        initializer(*initargs)
+
+def _worker_report():
+    """Report this worker's startup time and memory once every worker is up."""
+    # Each worker blocks here after taking one report task, so every worker gets exactly one
+    _worker_state["barrier"].wait(timeout=300)
+    return {
+        "pid": os.getpid(),
+        "startup_s": round(_worker_state["startup_s"], 3),
+        **memory_usage_mb()
+    }
+
+class PreforkPool:
+    def __init__(self, workers=None, initializer=None, initargs=()):
+        """
+        Process pool whose workers are forked from a parent that already
+        loaded the models.
+
+        The parent loads spaCy and compiles the skill and section patterns
+        once, then freezes its objects out of the garbage collector so the
+        children do not write to (and copy) the shared pages. Forked workers
+        start processing immediately and share the model memory
+        copy-on-write. Where fork is not available, workers fall back to
+        loading the models themselves.
+
+        Args:
+            workers (int): Worker processes (defaults to the CPU count)
+            initializer (callable): Optional extra per-worker initializer
+            initargs (tuple): Arguments for `initializer`
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.initializer = initializer
+        self.initargs = initargs
+        self.executor = None
+        self.preload_s = None
+        self.reports = []
+
+    def start(self):
+        """
+        Preload the models, fork the workers and wait until all are ready.
+
+        Returns:
+            list: Per-worker dicts with pid, startup_s and memory (see memory_usage_mb)
+        """
+        preloaded = "fork" in multiprocessing.get_all_start_methods()
+        if preloaded:
+            context = multiprocessing.get_context("fork")
+            self.preload_s = preload_models()
+            gc.freeze()
+        else:
+            context = multiprocessing.get_context()
+
+        barrier = context.Barrier(self.workers)
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.workers, mp_context=context, initializer=_init_worker,
+            initargs=(time.monotonic(), preloaded, barrier, self.initializer, self.initargs)
+        )
+        futures = [self.executor.submit(_worker_report) for _ in range(self.workers)]
+        self.reports = sorted((future.result() for future in futures), key=lambda r: r["pid"])
+
+        METRICS.gauge("worker_startup_seconds_max", max(r["startup_s"] for r in self.reports))
+        METRICS.gauge("worker_rss_mb_max", max(r["rss_mb"] or 0 for r in self.reports))
+        if "pss_mb" in self.reports[0]:
+            METRICS.gauge("worker_pss_mb_total", round(sum(r["pss_mb"] for r in self.reports), 1))
+        return self.reports
+
+    def print_report(self):
+        """Print the preload time and each worker's startup time and memory."""
+        if self.preload_s is not None:
+            print(f"Models preloaded in {self.preload_s:.2f}s; forked {self.workers} workers")
+        for report in self.reports:
+            memory = ", ".join(
+                f"{key[:-3].upper()} {report[key]} MB" for key in ("rss_mb", "pss_mb", "private_mb")
+                if report.get(key) is not None
+            )
+            print(f"  worker {report['pid']}: ready in {report['startup_s'] * 1000:.1f} ms, {memory}")
+
+    def submit(self, fn, *args):
+        return self.executor.submit(fn, *args)
+
+    def imap(self, fn, arg_tuples, max_in_flight=None):
+        """
+        Call fn(*args) in the workers for each args tuple, yielding results in input order.
+
+        At most `max_in_flight` calls are submitted ahead of the consumer.
+
+        Yields:
+            tuple: (args, result or the exception raised)
+        """
+        max_in_flight = max_in_flight or self.workers * 4
+        pending = deque()
+
+        def result(args, future):
+            try:
+                return args, future.result()
+            except Exception as e:
+                return args, e
+
+        for args in arg_tuples:
+            pending.append((args, self.executor.submit(fn, *args)))
+            while len(pending) >= max_in_flight:
+                yield result(*pending.popleft())
+        while pending:
+            yield result(*pending.popleft())
+
+    def shutdown(self, cancel_futures=False):
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=cancel_futures)
+            self.executor = None
+
+    def __enter__(self):
+        if self.executor is None:
+            self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        return False